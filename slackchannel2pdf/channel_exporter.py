@@ -4,6 +4,7 @@ import datetime as dt
 import logging
 import logging.config
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -15,13 +16,22 @@ from . import __version__, settings
 from .fpdf_extension import MyFPDF
 from .helpers import transform_encoding, write_array_to_json_file
 from .locales import LocaleHelper
+from .message_store import MessageStore
 from .message_transformer import MessageTransformer
+from .message_writer import MessageWriter
+from .profiling import Profiler
 from .slack_service import SlackService
+from .stats import RunStats
 
-logging.config.dictConfig(settings.DEFAULT_LOGGING)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _configure_logging() -> None:
+    """Configure logging once, when the first exporter is created."""
+    logging.config.dictConfig(settings.DEFAULT_LOGGING)
+
+
 class SlackChannelExporter:
     """Class for exporting slack channels to PDF files
 
@@ -59,11 +69,14 @@ class SlackChannelExporter:
             add_debug_info: wether to add debug info to message output
 
         """
+        _configure_logging()
         self._bot_names = {}
         if slack_token is None:
             raise ValueError("slack_token can not be null")
 
         self._slack_service = SlackService(slack_token)
+        # stats for fetching the directories are reported with the next export
+        self._pending_stats = self._slack_service.stats
 
         # set locale & timezone
         author_info = self._slack_service.author_info()
@@ -83,507 +96,26 @@ class SlackChannelExporter:
         # validate add_debug_info
         if not isinstance(add_debug_info, bool):
             raise ValueError("add_debug_info must be bool")
-        self._add_debug_info = add_debug_info
         if add_debug_info:
             logger.info("Adding DEBUG info to PDF")
+        self._writer = MessageWriter(
+            slack_service=self._slack_service,
+            locale_helper=self._locale_helper,
+            transformer=self._transformer,
+            add_debug_info=add_debug_info,
+        )
 
         if logfile_path:
             pass
 
-    def _parse_message_and_write_to_pdf(
-        self,
-        document: MyFPDF,
-        msg: dict,
-        margin_left: int,
-        last_user_id: Optional[str],
-        full_date: bool = False,
-    ) -> Optional[str]:
-        """parse a message and write it to the PDF"""
-
-        user_id, is_bot, user_name = self._identify_user(msg)
-
-        if user_name is not None:
-            # start again on the left border
-            document.set_left_margin(margin_left)
-            document.set_x(margin_left)
-
-            if last_user_id != user_id:
-                # write user name and date only when user switches
-                self._write_user_name_and_date(
-                    document, msg, full_date, is_bot, user_name
-                )
-
-            if "text" in msg and len(msg["text"]) > 0:
-                self._write_text(document, msg)
-
-            if "reactions" in msg:
-                self._write_reactions(document, msg, margin_left)
-
-            if "files" in msg:
-                self._write_files(document, msg, margin_left)
-
-            if "attachments" in msg:
-                self._write_attachments(document, msg, margin_left)
-
-            if "blocks" in msg:
-                self._write_blocks(document, msg, margin_left)
-
-                document.ln(settings.LINE_HEIGHT_SMALL)
-
-        else:
-            user_id = None
-            logger.warning("Can not process message with ts %s", msg["ts"])
-            document.write(
-                settings.LINE_HEIGHT_DEFAULT, "[Can not process this message]"
-            )
-            document.ln()
-
-        return user_id
-
-    def _write_user_name_and_date(self, document, msg, full_date, is_bot, user_name):
-        document.ln(settings.LINE_HEIGHT_SMALL)
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_NORMAL,
-            style="B",
-        )
-        document.write(settings.LINE_HEIGHT_DEFAULT, user_name + " ")
-        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_SMALL)
-        if is_bot:
-            document.set_text_color(100, 100, 100)
-            document.write(settings.LINE_HEIGHT_DEFAULT, "App ")
-            document.set_text_color(0)
-
-        datetime_str = (
-            self._locale_helper.get_datetime_formatted_str(msg["ts"])
-            if full_date
-            else self._locale_helper.get_time_formatted_str(msg["ts"])
-        )
-        document.write(settings.LINE_HEIGHT_DEFAULT, datetime_str)
-        document.ln(settings.LINE_HEIGHT_DEFAULT)
-
-    def _write_text(self, document, msg):
-        text = msg["text"]
-        if self._add_debug_info:
-            debug_text = (
-                f' [<s fontfamily="'
-                f'{settings.FONT_FAMILY_MONO_DEFAULT}" size="8">'
-                f'{msg["ts"]}]</s>'
-            )
-        else:
-            debug_text = ""
-
-        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL)
-        text_html = self._transformer.transform_text(
-            text, msg["mrkdwn"] if "mrkdwn" in msg else True
-        )
-        document.write_html(settings.LINE_HEIGHT_DEFAULT, text_html + debug_text)
-        document.ln(settings.LINE_HEIGHT_DEFAULT)
-
-    def _write_reactions(self, document, msg, margin_left):
-        for reaction in msg["reactions"]:
-            document.set_left_margin(margin_left + settings.TAB_WIDTH)
-            document.set_x(margin_left + settings.TAB_WIDTH)
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
-            )
-            document.write_html(
-                settings.LINE_HEIGHT_DEFAULT,
-                ("[" + reaction["name"] + "] (" + str(reaction["count"]) + "):"),
-            )
-            document.ln()
-
-            # convert user IDs to names
-            users_with_names = []
-            for user in reaction["users"]:
-                if user in self._slack_service.user_names():
-                    user_name = self._slack_service.user_names()[user]
-                else:
-                    user_name = "unknown_user_" + user
-
-                users_with_names.append("<b>" + user_name + "</b>")
-
-            document.set_left_margin(
-                margin_left + settings.TAB_WIDTH + settings.TAB_WIDTH
-            )
-            document.set_x(margin_left + settings.TAB_WIDTH + settings.TAB_WIDTH)
-            document.write_html(
-                settings.LINE_HEIGHT_DEFAULT, ", ".join(users_with_names)
-            )
-            document.ln()
-
-        document.ln(settings.LINE_HEIGHT_SMALL)
-
-    def _write_files(self, document, msg, margin_left):
-        document.set_left_margin(margin_left + settings.TAB_WIDTH)
-        document.set_x(margin_left + settings.TAB_WIDTH)
-
-        for file in msg["files"]:
-            file_type = file.get("pretty_type", "")
-            file_name = file.get("name", "")
-            text = "[" + file_type + " file: <b>" + file_name + "</b>" + "]"
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
-            )
-            document.write_html(settings.LINE_HEIGHT_DEFAULT, text)
-            document.ln()
-
-            if "preview" in file:
-                text = file["preview"]
-                # remove document tag if any
-                match = re.match(r"<document>(.+)<\/document>", text)
-                if match is not None:
-                    text = match.group(1)
-                    # replace <p> with <br>
-                text = re.sub(r"<p>(.+)<\/p>", r"\1<br>", text)
-                # replace \r\n with <br>
-                text = re.sub(r"\n|\r\n", r"<br>", text)
-                # output
-                document.set_font(
-                    settings.FONT_FAMILY_DEFAULT,
-                    size=settings.FONT_SIZE_NORMAL,
-                )
-                document.write_html(settings.LINE_HEIGHT_DEFAULT, text)
-                document.ln()
-
-    def _write_attachments(self, document, msg, margin_left):
-        document.set_left_margin(margin_left + settings.TAB_WIDTH)
-        document.set_x(margin_left + settings.TAB_WIDTH)
-
-        # draw normal text attachments
-        for attach in msg["attachments"]:
-            if "mrkdwn_in" in attach:
-                mrkdwn_in = attach["mrkdwn_in"]
-            else:
-                mrkdwn_in = []
-
-            if "pretext" in attach:
-                self._write_attachments_pretext(
-                    document, margin_left, attach, mrkdwn_in
-                )
-
-            document.ln(settings.LINE_HEIGHT_SMALL)
-
-            if "author_name" in attach:
-                self._write_attachments_author_name(document, attach)
-
-            if "title" in attach:
-                self._write_attachments_title(document, attach, mrkdwn_in)
-
-            if "text" in attach:
-                self._write_attachments_text(document, attach, mrkdwn_in)
-
-            if "fields" in attach:
-                self._write_attachments_fields(document, attach, mrkdwn_in)
-
-            if "footer" in attach:
-                self._write_attachments_footer(document, attach)
-
-            if "image_url" in attach:
-                self._write_attachments_image_url(document, attach)
-
-                # action attachments
-            if "actions" in attach:
-                self._write_attachments_actions(document, attach)
-
-        document.ln(settings.LINE_HEIGHT_SMALL)
-
-    def _write_attachments_pretext(self, document, margin_left, attach, mrkdwn_in):
-        document.set_left_margin(margin_left)
-        document.set_x(margin_left)
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_NORMAL,
-        )
-        document.write_html(
-            settings.LINE_HEIGHT_DEFAULT,
-            self._transformer.transform_text(attach["pretext"], "pretext" in mrkdwn_in),
-        )
-        document.set_left_margin(margin_left + settings.TAB_WIDTH)
-        document.set_x(margin_left + settings.TAB_WIDTH)
-        document.ln()
-
-    def _write_attachments_author_name(self, document, attach):
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_LARGE,
-            style="B",
-        )
-        document.write(
-            settings.LINE_HEIGHT_DEFAULT,
-            self._transformer.transform_text(attach["author_name"]),
-        )
-        document.ln()
-
-    def _write_attachments_title(self, document, attach, mrkdwn_in):
-        title_text = self._transformer.transform_text(
-            attach["title"], "title" in mrkdwn_in
-        )
-
-        # add link to title if defined
-        if "title_link" in attach:
-            title_text = '<a href="' + attach["title_link"] + '">' + title_text + "</a>"
-
-            # add bold formatting to title
-        title_text = "<b>" + title_text + "</b>"
-
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_NORMAL,
-        )
-        document.write_html(settings.LINE_HEIGHT_DEFAULT, title_text)
-        document.ln()
-
-    def _write_attachments_text(self, document, attach, mrkdwn_in):
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_NORMAL,
-        )
-        document.write_html(
-            settings.LINE_HEIGHT_DEFAULT,
-            self._transformer.transform_text(attach["text"], "text" in mrkdwn_in),
-        )
-        document.ln()
-
-    def _write_attachments_fields(self, document, attach, mrkdwn_in):
-        for field in attach["fields"]:
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT,
-                size=settings.FONT_SIZE_NORMAL,
-                style="B",
-            )
-            document.write(
-                settings.LINE_HEIGHT_DEFAULT,
-                self._transformer.transform_text(field["title"]),
-            )
-            document.ln()
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT,
-                size=settings.FONT_SIZE_NORMAL,
-            )
-            document.write_html(
-                settings.LINE_HEIGHT_DEFAULT,
-                self._transformer.transform_text(field["value"], "fields" in mrkdwn_in),
-            )
-            document.ln()
-
-    def _write_attachments_footer(self, document, attach):
-        if "ts" in attach:
-            text = (
-                self._transformer.transform_text(attach["footer"])
-                + "|"
-                + self._locale_helper.get_datetime_formatted_str(attach["ts"])
-            )
-        else:
-            text = self._transformer.transform_text(attach["footer"])
-
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_SMALL,
-        )
-        document.write(settings.LINE_HEIGHT_DEFAULT, text)
-        document.ln()
-
-    def _write_attachments_image_url(self, document, attach):
-        image_url_html = '<a href="' + attach["image_url"] + '">[Image]</a>'
-        document.set_font(
-            settings.FONT_FAMILY_DEFAULT,
-            size=settings.FONT_SIZE_NORMAL,
-        )
-        document.write_html(settings.LINE_HEIGHT_DEFAULT, image_url_html)
-        document.ln()
-
-    def _write_attachments_actions(self, document, attach):
-        for action in attach["actions"]:
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT,
-                size=settings.FONT_SIZE_SMALL,
-            )
-            document.write_html(
-                settings.LINE_HEIGHT_DEFAULT,
-                ("[" + self._transformer.transform_text(action["text"]) + "] "),
-            )
-
-        document.ln()
-
-    def _write_blocks(self, document, msg, margin_left):
-        document.set_left_margin(margin_left + settings.TAB_WIDTH)
-        document.set_x(margin_left + settings.TAB_WIDTH)
-
-        for layout_block in msg["blocks"]:
-            block_type = layout_block["type"]
-            document.ln(settings.LINE_HEIGHT_SMALL)
-
-            # section layout blocks
-            if block_type == "section":
-                document.set_font(
-                    settings.FONT_FAMILY_DEFAULT,
-                    size=settings.FONT_SIZE_NORMAL,
-                )
-                document.write_html(
-                    settings.LINE_HEIGHT_DEFAULT,
-                    self._transformer.transform_text(
-                        layout_block["text"]["text"],
-                        layout_block["text"]["type"] == "mrkdwn",
-                    ),
-                )
-                document.ln()
-
-                if "fields" in layout_block:
-                    for field in layout_block["fields"]:
-                        document.set_font(
-                            settings.FONT_FAMILY_DEFAULT,
-                            size=settings.FONT_SIZE_NORMAL,
-                        )
-                        document.write_html(
-                            settings.LINE_HEIGHT_DEFAULT,
-                            self._transformer.transform_text(
-                                field["text"], field["type"] == "mrkdwn"
-                            ),
-                        )
-                        document.ln()
-
-    def _identify_user(self, msg):
-        if "user" in msg:
-            user_id = msg["user"]
-            is_bot = False
-            if user_id in self._slack_service.user_names():
-                user_name = self._slack_service.user_names()[user_id]
-            else:
-                user_name = f"unknown_user_{user_id}"
-            return user_id, is_bot, user_name
-
-        if "bot_id" in msg:
-            user_id = msg["bot_id"]
-            is_bot = True
-            if "username" in msg:
-                user_name = transform_encoding(msg["username"])
-            elif user_id in self._bot_names:
-                user_name = self._bot_names[user_id]
-            else:
-                user_name = f"unknown_bot_{user_id}"
-            return user_id, is_bot, user_name
-
-        if "subtype" in msg and msg["subtype"] == "file_comment":
-            is_bot = False
-            if "user" in msg["comment"]:
-                user_id = msg["comment"]["user"]
-                if user_id in self._slack_service.user_names():
-                    user_name = self._slack_service.user_names()[user_id]
-                else:
-                    user_name = f"unknown_user_{user_id}"
-            else:
-                user_id = None
-                user_name = None
-            return user_id, is_bot, user_name
-
-        return None, False, None
-
-    def _write_messages_to_pdf(
-        self, document: MyFPDF, messages: List[dict], threads: dict
-    ) -> None:
-        """writes messages with their threads to the PDF document"""
-        last_user_id = None
-        last_dt = None
-        last_page = None
-
-        if len(messages) > 0:
-            messages = sorted(messages, key=lambda k: k["ts"])
-            for msg in messages:
-                msg_dt = self._locale_helper.get_datetime_from_ts(msg["ts"])
-
-                # repeat user name for if last post from same user is older
-                if last_dt is not None:
-                    dt_delta = msg_dt - last_dt
-                    minutes_delta = dt_delta / dt.timedelta(minutes=1)
-                    if minutes_delta > settings.MINUTES_UNTIL_USERNAME_REPEATS:
-                        last_user_id = None
-
-                # write day separator if needed
-                if last_dt is None or msg_dt.date() != last_dt.date():
-                    self._write_day_separator(document, msg_dt)
-                    last_user_id = None  # repeat user name for new day
-
-                # repeat user name for new page
-                if last_page != document.page_no():
-                    last_user_id = None
-                    last_page = document.page_no()
-
-                last_user_id = self._parse_message_and_write_to_pdf(
-                    document, msg, settings.MARGIN_LEFT, last_user_id
-                )
-                if "thread_ts" in msg and msg["thread_ts"] == msg["ts"]:
-                    msg_dt = self._write_messages_threads(
-                        document, threads, msg, msg_dt
-                    )
-
-                last_dt = msg_dt
-        else:
-            document.set_font(
-                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
-            )
-            document.ln()
-            document.write(settings.LINE_HEIGHT_DEFAULT, "This channel is empty", "I")
-
-    def _write_day_separator(self, document, msg_dt):
-        document.ln(settings.LINE_HEIGHT_SMALL)
-        document.ln(settings.LINE_HEIGHT_SMALL)
-        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL)
-
-        # draw divider line for next day
-        page_width = document.fw - 2 * settings.MARGIN_LEFT
-        x1 = settings.MARGIN_LEFT
-        x2 = x1 + page_width
-        y1 = document.get_y() + 3
-        document.line(x1, y1, x2, y1)
-
-        # stamp date on divider
-        date_text = self._locale_helper.format_date_full_str(msg_dt)
-        text_width = document.get_string_width(date_text)
-        x3 = (x2 - x1) / 2 + x1
-        x4 = x3 - (text_width / 2)
-        border_x = 3
-        document.set_fill_color(255, 255, 255)
-        document.set_x(x4 - border_x)
-        document.cell(
-            text_width + 2 * border_x,
-            settings.LINE_HEIGHT_DEFAULT,
-            date_text,
-            0,
-            0,
-            "C",
-            True,
-        )
-        document.ln()
-
-    def _write_messages_threads(self, document, threads, msg, msg_dt):
-        thread_ts = msg["thread_ts"]
-
-        if thread_ts in threads:
-            thread_messages = threads[thread_ts]
-            last_user_id = None
-            last_dt = None
-            thread_messages = sorted(thread_messages, key=lambda k: k["ts"])
-            for thread_msg in thread_messages:
-                if thread_msg["ts"] != thread_msg["thread_ts"]:
-                    # repeat user name for if last post from same user is older
-                    msg_dt = self._locale_helper.get_datetime_from_ts(thread_msg["ts"])
-                    if last_dt is not None:
-                        dt_delta = msg_dt - last_dt
-                        minutes_delta = dt_delta / dt.timedelta(minutes=1)
-                        if minutes_delta > settings.MINUTES_UNTIL_USERNAME_REPEATS:
-                            last_user_id = None
-                    last_dt = msg_dt
-                    last_user_id = self._parse_message_and_write_to_pdf(
-                        document,
-                        thread_msg,
-                        settings.MARGIN_LEFT + settings.TAB_WIDTH,
-                        last_user_id,
-                        full_date=True,
-                    )
-
-        last_user_id = None
-        return msg_dt
+    def refresh_directories(self) -> None:
+        """Reload users, channels and usergroups, e.g. for an exporter kept warm."""
+        stats = RunStats()
+        self._slack_service.stats = stats
+        self._slack_service.refresh_directories()
+        if self._pending_stats:
+            stats.merge(self._pending_stats)
+        self._pending_stats = stats
 
     # pylint: disable = too-many-locals
     def run(
@@ -596,6 +128,8 @@ class SlackChannelExporter:
         page_format: str = "a4",
         max_messages: Optional[int] = None,
         write_raw_data: bool = False,
+        write_stats: bool = False,
+        profilers: Optional[List[Profiler]] = None,
     ) -> dict:
         """Exports all message from a channel and stores them in a PDF
 
@@ -608,9 +142,13 @@ class SlackChannelExporter:
         - page_format: format of pages, see as defined in FPDF class
         - max_messages: maximum number of messages to retrieve
         - write_raw_data: will safe data received from API to files if true
+        - write_stats: will write performance stats of this export to a file if true
+        - profilers: will be called for each channel and each phase of this export,
+        e.g. to write cProfile output for each channel to dest_path
 
         Returns:
-        - info about export result
+        - info about export result incl. performance stats for each channel
+        and in total
         """
         dest_path, oldest, latest, max_messages = self._validate_parameters(
             channel_inputs,
@@ -621,17 +159,24 @@ class SlackChannelExporter:
             page_format,
             max_messages,
             write_raw_data,
+            write_stats,
         )
+        if profilers is None:
+            profilers = []
 
         # prepare to process channels
         team_name = self._slack_service.team
+        filename_base = re.sub(r"[^\w\-_\.]", "_", team_name)
         response = {"ok": False, "channels": {}, "team_name": team_name}
         channel_count = 0
         success = True
+        run_stats = RunStats()
+        if self._pending_stats:
+            run_stats.merge(self._pending_stats)
+            self._pending_stats = None
 
         # process each channel
         for channel_input in channel_inputs:
-            success_channel = False
             channel_count += 1
             if channel_input.upper() in self._slack_service.channel_names():
                 channel_id = channel_input.upper()
@@ -652,11 +197,70 @@ class SlackChannelExporter:
 
                 channel_id = channel_names_ids[channel_input.lower()]
 
-            channel_name = self._slack_service.channel_names()[channel_id]
-            filename_base = re.sub(r"[^\w\-_\.]", "_", team_name)
-            filename_base_channel = filename_base + "_" + channel_name
+            stats = RunStats(profilers)
+            response["channels"][channel_id] = self._export_channel(
+                stats,
+                profilers,
+                channel_id,
+                channel_inputs,
+                channel_count,
+                dest_path,
+                filename_base,
+                oldest,
+                latest,
+                page_orientation,
+                page_format,
+                max_messages,
+                write_raw_data,
+            )
+            success = success and response["channels"][channel_id]["ok"]
+            run_stats.merge(stats)
+
+        response["ok"] = success
+        response["stats"] = run_stats.to_dict()
+        if write_stats:
+            write_array_to_json_file(
+                {
+                    "total": response["stats"],
+                    "channels": {
+                        channel_id: channel["stats"]
+                        for channel_id, channel in response["channels"].items()
+                    },
+                },
+                dest_path / (filename_base + "_stats"),
+            )
+        return response
+
+    def _export_channel(
+        self,
+        stats,
+        profilers,
+        channel_id,
+        channel_inputs,
+        channel_count,
+        dest_path,
+        filename_base,
+        oldest,
+        latest,
+        page_orientation,
+        page_format,
+        max_messages,
+        write_raw_data,
+    ) -> dict:
+        """exports a channel to a PDF file and returns info about the result"""
+        channel_name = self._slack_service.channel_names()[channel_id]
+        filename_base_channel = filename_base + "_" + channel_name
+
+        filename_base_profiling = dest_path / filename_base_channel
+        for profiler in profilers:
+            profiler.channel_started(channel_id, filename_base_profiling)
 
-            messages, threads = self._fetch_messages(
+        store = None
+        try:
+            self._slack_service.stats = stats
+            self._transformer.stats = stats
+            store = self._fetch_messages(
+                stats,
                 channel_inputs,
                 oldest,
                 latest,
@@ -665,18 +269,18 @@ class SlackChannelExporter:
                 channel_id,
                 channel_name,
             )
+            messages, threads = store.messages, store.threads
 
             if write_raw_data:
                 self._write_raw_data(
-                    dest_path, filename_base, filename_base_channel, messages, threads
+                    dest_path,
+                    filename_base,
+                    filename_base_channel,
+                    messages,
+                    threads,
                 )
 
-            # create PDF
-            document = MyFPDF(
-                page_orientation, settings.PAGE_UNITS_DEFAULT, page_format
-            )
-
-            self._add_fonts_to_support_unicode(document)
+            store.apply(self._normalize_message)
 
             # compile all values
             creation_date = dt.datetime.now(tz=self._locale_helper.timezone)
@@ -694,19 +298,13 @@ class SlackChannelExporter:
             ) = self._find_start_and_end_dates(messages, message_count)
 
             # set variables for title, header, footer
-            title = team_name + " / " + channel_name
+            title = self._slack_service.team + " / " + channel_name
             sub_title = "Slack channel export"
-            page_title = title
-
-            self._set_properties_for_document_info(
-                document, title, sub_title, page_title
-            )
-            self._write_title_on_first_page(document, title, sub_title)
 
-            # write info block after title
+            # compile info block after title
             thread_count = len(threads.keys()) if len(threads) > 0 else 0
             export_infos = {
-                "Slack workspace": team_name,
+                "Slack workspace": self._slack_service.team,
                 "Channel": channel_name,
                 "Exported at": creation_datetime_str,
                 "Exported by": self._slack_service.author,
@@ -722,41 +320,51 @@ class SlackChannelExporter:
                 ),
                 "Pages": "{nb}",
             }
-            document.write_info_table(export_infos)
-            document.add_page()
-
-            # write messages to PDF
-            self._write_messages_to_pdf(document, messages, threads)
-
-            success_channel, filename_pdf = self._store_pdf(
-                dest_path, filename_base_channel, document
-            )
 
-            # compile response dict
-            response["channels"][channel_id] = {
-                "ok": success_channel,
-                "channel_id": channel_id,
-                "channel_name": channel_name,
-                "filename_pdf": str(filename_pdf),
-                "filename_base_channel": str(dest_path / filename_base_channel),
-                "dest_path": str(dest_path),
-                "page_format": page_format,
-                "page_orientation": page_orientation,
-                "max_messages": max_messages,
-                "messages_total": max_messages,
-                "export_infos": export_infos,
-                "message_count": message_count,
-                "thread_count": thread_count,
-                "creation_date": creation_date,
-                "start_date": start_date,
-                "end_date": end_date,
-                "timezone": self._locale_helper.timezone,
-                "locale": self._locale_helper.locale,
-            }
-            success = success and success_channel
+            # create PDF
+            with stats.phase("layout"):
+                document = self._create_document(page_orientation, page_format)
+                self._write_document(
+                    document, title, sub_title, export_infos, messages, threads
+                )
 
-        response["ok"] = success
-        return response
+            document.stats = stats
+            with stats.phase("write"):
+                success_channel, filename_pdf = self._store_pdf(
+                    dest_path, filename_base_channel, document
+                )
+            stats.count("pdf_pages", document.page_no())
+            if success_channel:
+                # the buffer holds the PDF as latin-1, i.e. one char per byte
+                stats.count("pdf_bytes_written", document.buffer_length)
+        finally:
+            if store is not None:
+                store.close()
+            for profiler in profilers:
+                profiler.channel_finished(channel_id, filename_base_profiling)
+
+        # compile response dict
+        return {
+            "ok": success_channel,
+            "channel_id": channel_id,
+            "channel_name": channel_name,
+            "filename_pdf": str(filename_pdf),
+            "filename_base_channel": str(dest_path / filename_base_channel),
+            "dest_path": str(dest_path),
+            "page_format": page_format,
+            "page_orientation": page_orientation,
+            "max_messages": max_messages,
+            "messages_total": max_messages,
+            "export_infos": export_infos,
+            "message_count": message_count,
+            "thread_count": thread_count,
+            "creation_date": creation_date,
+            "start_date": start_date,
+            "end_date": end_date,
+            "timezone": self._locale_helper.timezone,
+            "locale": self._locale_helper.locale,
+            "stats": stats.to_dict(),
+        }
 
     # pylint: disable = too-many-branches
     def _validate_parameters(
@@ -769,6 +377,7 @@ class SlackChannelExporter:
         page_format,
         max_messages,
         write_raw_data,
+        write_stats,
     ):
         if max_messages is not None:
             if not isinstance(max_messages, int):
@@ -829,8 +438,20 @@ class SlackChannelExporter:
 
         if write_raw_data is not None and not isinstance(write_raw_data, bool):
             raise TypeError("write_raw_data must be of type bool")
+
+        if not isinstance(write_stats, bool):
+            raise TypeError("write_stats must be of type bool")
         return dest_path, oldest, latest, max_messages
 
+    @staticmethod
+    def _normalize_message(msg):
+        """normalizes the encoding of the user name of a message once
+
+        Message texts are normalized by the message transformer instead.
+        """
+        if "username" in msg:
+            msg["username"] = transform_encoding(msg["username"])
+
     def _count_all_messages(self, messages, threads):
         message_count = len(messages)
         if len(threads) > 0:
@@ -856,6 +477,22 @@ class SlackChannelExporter:
             end_date_str = ""
         return start_date, start_date_str, end_date, end_date_str
 
+    def _create_document(self, page_orientation, page_format) -> MyFPDF:
+        document = MyFPDF(page_orientation, settings.PAGE_UNITS_DEFAULT, page_format)
+        document.set_compression(1, settings.COMPRESSION_LEVEL)
+        self._add_fonts_to_support_unicode(document)
+        return document
+
+    def _write_document(
+        self, document, title, sub_title, export_infos, messages, threads
+    ):
+        """writes all content incl. title and info block to the PDF document"""
+        self._set_properties_for_document_info(document, title, sub_title, title)
+        self._write_title_on_first_page(document, title, sub_title)
+        document.write_info_table(export_infos)
+        document.add_page()
+        self._writer.write_messages(document, messages, threads)
+
     def _set_properties_for_document_info(self, document, title, sub_title, page_title):
         document.set_author(self._slack_service.author)
         document.set_creator(f"Channel Export v{__version__}")
@@ -950,15 +587,16 @@ class SlackChannelExporter:
             dest_path / (filename_base + "_usergroups"),
         )
         write_array_to_json_file(
-            messages, dest_path / (filename_base_channel + "_messages")
+            list(messages), dest_path / (filename_base_channel + "_messages")
         )
         if len(threads) > 0:
             write_array_to_json_file(
-                threads, dest_path / (filename_base_channel + "_threads")
+                dict(threads), dest_path / (filename_base_channel + "_threads")
             )
 
     def _fetch_messages(
         self,
+        stats,
         channel_inputs,
         oldest,
         latest,
@@ -966,21 +604,38 @@ class SlackChannelExporter:
         channel_count,
         channel_id,
         channel_name,
-    ):
+    ) -> MessageStore:
+        """fetches messages and threads of a channel into a message store"""
         progress_str = (
             f"({channel_count}/{len(channel_inputs)})"
             if len(channel_inputs) > 1
             else ""
         )
         logger.info("Current channel %s: %s", progress_str, channel_name)
-        messages = self._slack_service.fetch_messages_from_channel(
-            channel_id, max_messages, oldest, latest
-        )
-        threads = self._slack_service.fetch_threads_from_messages(
-            channel_id, messages, max_messages, oldest, latest
-        )
-        self._bot_names = self._slack_service.fetch_bot_names_for_messages(
-            messages, threads
-        )
-
-        return messages, threads
+        store = MessageStore(int(settings.MEMORY_BUDGET_MB * 1024 * 1024))
+        try:
+            with stats.phase("history"):
+                for messages in self._slack_service.iter_message_pages_from_channel(
+                    channel_id, max_messages, oldest, latest
+                ):
+                    store.add_messages(messages)
+            with stats.phase("threads"):
+                for (
+                    thread_ts,
+                    thread_messages,
+                ) in self._slack_service.iter_threads_from_messages(
+                    channel_id, store.messages, max_messages, oldest, latest
+                ):
+                    store.add_thread(thread_ts, thread_messages)
+            with stats.phase("bots"):
+                self._bot_names = self._slack_service.fetch_bot_names_for_messages(
+                    store.messages, store.threads
+                )
+                self._writer.bot_names = self._bot_names
+        except BaseException:
+            store.close()
+            raise
+
+        if store.is_spilled:
+            stats.count("messages_spilled", len(store.messages))
+        return store
@@ -1,23 +1,27 @@
-"""Command line interface."""
+"""Command line interface.
+
+Heavy dependencies are imported only when they are needed,
+so that e.g. --version and --help start quickly.
+"""
+
+# pylint: disable = import-outside-toplevel
 
 import argparse
 import os
 import sys
 from pathlib import Path
 
-import pytz
-from babel import Locale, UnknownLocaleError
-from dateutil import parser
-from slack_sdk.errors import SlackApiError
-
 from . import __version__, settings
-from .channel_exporter import SlackChannelExporter
 
 
 def main():
     """Implements the arg parser and starts the channel exporter with its input"""
 
     args = _parse_args(sys.argv[1:])
+    if args.manifest:
+        _run_manifest(args)
+        return
+
     slack_token = _parse_slack_token(args)
     my_tz = _parse_local_timezone(args)
     my_locale = _parse_locale(args)
@@ -27,6 +31,11 @@ def main():
     if not args.quiet:
         channel_postfix = "s" if args.channel and len(args.channel) > 1 else ""
         print(f"Exporting channel{channel_postfix} from Slack...")
+
+    from slack_sdk.errors import SlackApiError
+
+    from .channel_exporter import SlackChannelExporter
+
     try:
         exporter = SlackChannelExporter(
             slack_token=slack_token,
@@ -38,6 +47,7 @@ def main():
         print(f"ERROR: {ex}")
         sys.exit(1)
 
+    profilers = _create_profilers(args)
     result = exporter.run(
         channel_inputs=args.channel,
         dest_path=Path(args.destination) if args.destination else None,
@@ -47,6 +57,8 @@ def main():
         page_format=args.page_format,
         max_messages=args.max_messages,
         write_raw_data=(args.write_raw_data is True),
+        write_stats=(args.write_stats is True),
+        profilers=profilers,
     )
     for channel in result["channels"].values():
         if not args.quiet:
@@ -55,8 +67,92 @@ def main():
             )
 
 
+def _run_manifest(args):
+    """Run all jobs from a manifest and report each job when it has finished."""
+    from .jobs import ExporterPool, load_manifest
+
+    if args.channel:
+        print("ERROR: channels can not be combined with a manifest")
+        sys.exit(1)
+
+    profilers = _create_profilers(args)
+    if profilers and args.workers > 1:
+        print("ERROR: profiling a manifest is only possible with --workers 1")
+        sys.exit(1)
+
+    try:
+        jobs = load_manifest(Path(args.manifest), defaults=_manifest_defaults(args))
+    except ValueError as ex:
+        print(f"ERROR: {ex}")
+        sys.exit(1)
+
+    slack_token = args.token or os.environ.get("SLACK_TOKEN")
+    if not slack_token and not all(job.slack_token for job in jobs):
+        print("ERROR: No slack token provided")
+        sys.exit(1)
+
+    if not args.quiet:
+        print(f"Exporting {len(jobs)} jobs from Slack...")
+
+    pool = ExporterPool(slack_token)
+    failed = 0
+    for job_result in pool.run_batch(jobs, workers=args.workers, profilers=profilers):
+        job_name = f"job {job_result.index + 1} ({', '.join(job_result.job.channels)})"
+        if job_result.error:
+            print(f"ERROR: {job_name} failed: {job_result.error}")
+        elif not args.quiet:
+            for channel in job_result.result["channels"].values():
+                print(
+                    f"{job_name} {'written' if channel['ok'] else 'failed'}: "
+                    f"{channel['filename_pdf']}"
+                )
+        if not job_result.ok:
+            failed += 1
+
+    if not args.quiet:
+        print(f"Finished {len(jobs) - failed} of {len(jobs)} jobs successfully")
+    if failed:
+        sys.exit(1)
+
+
+def _manifest_defaults(args) -> dict:
+    """Return job defaults from the command line arguments for a manifest.
+
+    Defaults from the manifest and fields of each job take precedence.
+    """
+    defaults = {
+        "dest_path": args.destination,
+        "oldest": args.oldest,
+        "latest": args.latest,
+        "page_orientation": args.page_orientation,
+        "page_format": args.page_format,
+        "max_messages": args.max_messages,
+        "timezone": args.timezone,
+        "locale": args.locale,
+        "add_debug_info": args.add_debug_info,
+        "write_raw_data": args.write_raw_data,
+        "write_stats": args.write_stats,
+    }
+    return {key: value for key, value in defaults.items() if value is not None}
+
+
+def add_version_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --version argument to a parser."""
+    parser.add_argument(
+        "--version",
+        help="show the program version and sys.exit",
+        action="version",
+        version=__version__,
+    )
+
+
 def _parse_args(args: list) -> argparse.Namespace:
     """defines the argument parser and returns parsed result from given argument"""
+    # show the version before the configuration files are read for the defaults
+    version_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    add_version_argument(version_parser)
+    version_parser.parse_known_args(args)
+
     my_arg_parser = argparse.ArgumentParser(
         description="This program exports the text of a Slack channel to a PDF file",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -64,7 +160,7 @@ def _parse_args(args: list) -> argparse.Namespace:
 
     # main arguments
     my_arg_parser.add_argument(
-        "channel", help="One or several: name or ID of channel to export.", nargs="+"
+        "channel", help="One or several: name or ID of channel to export.", nargs="*"
     )
     my_arg_parser.add_argument("--token", help="Slack OAuth token")
     my_arg_parser.add_argument("--oldest", help="don't load messages older than a date")
@@ -109,14 +205,24 @@ def _parse_args(args: list) -> argparse.Namespace:
         ),
     )
 
-    # standards
+    # batch mode
     my_arg_parser.add_argument(
-        "--version",
-        help="show the program version and sys.exit",
-        action="version",
-        version=__version__,
+        "--manifest",
+        help=(
+            "run all export jobs from a JSON manifest file instead of "
+            "exporting the given channels"
+        ),
+    )
+    my_arg_parser.add_argument(
+        "--workers",
+        help="number of manifest jobs running at the same time",
+        type=int,
+        default=settings.BATCH_WORKERS,
     )
 
+    # standards
+    add_version_argument(my_arg_parser)
+
     # exporter config
     my_arg_parser.add_argument(
         "--max-messages",
@@ -135,6 +241,33 @@ def _parse_args(args: list) -> argparse.Namespace:
         action="store_const",
         const=True,
     )
+    my_arg_parser.add_argument(
+        "--write-stats",
+        help=(
+            "will also write performance stats of the export to a file, "
+            "e.g. time spent in each phase and number of API calls"
+        ),
+        action="store_const",
+        const=True,
+    )
+    my_arg_parser.add_argument(
+        "--profile",
+        help=(
+            "will also write cProfile output for each channel and each phase "
+            "of the export to the destination path"
+        ),
+        action="store_const",
+        const=True,
+    )
+    my_arg_parser.add_argument(
+        "--profile-memory",
+        help=(
+            "will also write tracemalloc snapshots for each channel "
+            "and each phase of the export to the destination path"
+        ),
+        action="store_const",
+        const=True,
+    )
     my_arg_parser.add_argument(
         "--add-debug-info",
         help="wether to add debug info to PDF",
@@ -154,7 +287,22 @@ def _parse_args(args: list) -> argparse.Namespace:
             "log levels instead)"
         ),
     )
-    return my_arg_parser.parse_args(args)
+    parsed_args = my_arg_parser.parse_args(args)
+    if not parsed_args.channel and not parsed_args.manifest:
+        my_arg_parser.error("at least one channel or a manifest is required")
+    return parsed_args
+
+
+def _create_profilers(args) -> list:
+    """Create the profilers requested by arguments."""
+    from .profiling import CProfileProfiler, TracemallocProfiler
+
+    profilers = []
+    if args.profile:
+        profilers.append(CProfileProfiler())
+    if args.profile_memory:
+        profilers.append(TracemallocProfiler())
+    return profilers
 
 
 def _parse_slack_token(args):
@@ -172,6 +320,8 @@ def _parse_slack_token(args):
 
 def _parse_local_timezone(args):
     if args.timezone is not None:
+        import pytz
+
         try:
             my_tz = pytz.timezone(args.timezone)
         except pytz.UnknownTimeZoneError:
@@ -184,6 +334,8 @@ def _parse_local_timezone(args):
 
 def _parse_locale(args):
     if args.locale is not None:
+        from babel import Locale, UnknownLocaleError
+
         try:
             my_locale = Locale.parse(args.locale, sep="-")
         except UnknownLocaleError:
@@ -196,6 +348,8 @@ def _parse_locale(args):
 
 def _parse_oldest(args):
     if args.oldest is not None:
+        from dateutil import parser
+
         try:
             oldest = parser.parse(args.oldest)
         except ValueError:
@@ -208,6 +362,8 @@ def _parse_oldest(args):
 
 def _parse_latest(args):
     if args.latest is not None:
+        from dateutil import parser
+
         try:
             latest = parser.parse(args.latest)
         except ValueError:
@@ -2,18 +2,16 @@
 
 import logging
 import os
-import re
 
 from . import fpdf_mod, settings
+from .rich_text import Marker, TextRun, from_html
 
 logger = logging.getLogger(__name__)
 
 fpdf_mod.set_global("FPDF_CACHE_MODE", 1)
 fpdf_mod.set_global("SYSTEM_TTFONTS", os.path.join(os.path.dirname(__file__), "fonts"))
 
-
-class HtmlConversionError(Exception):
-    """A HTML conversion error."""
+_PLAIN_RUN = TextRun("")
 
 
 class FPDFext(fpdf_mod.FPDF):
@@ -49,114 +47,67 @@ class FPDFext(fpdf_mod.FPDF):
         self._tags["I"] = 0
         self._tags["U"] = 0
         self._tags["BLOCKQUOTE"] = 0
-        self._href = ""
+        self._font_override = None
         self._last_font = None
 
     def write_html(self, height, html):
         """write() with support for rudimentary formatting with HTML tags"""
-        html = html.replace("\n", " ")
-
-        # split html into parts to identify all HTML tags
-        # even numbered parts will contain text
-        # odd numbered parts will contain tags
-        parts = re.split(r"<([^>]*)>", html)
-
-        # run through all parts one by one
-        try:
-            for i, part in dict(enumerate(parts)).items():
-                if i % 2 == 0:
-                    self._process_text(height, part)
-
+        self.write_rich_text(height, from_html(html))
+
+    def write_rich_text(self, height, rich_text):
+        """write() for rich text, i.e. formatted text runs and markers"""
+        for item in rich_text:
+            if isinstance(item, TextRun):
+                self._apply_run_style(item)
+                if item.href:
+                    self._put_link(item.href, height, item.text)
                 else:
-                    self._process_tag(part)
-
-        except HtmlConversionError:
-            logger.error("Failed to convert HTML to PDF: %s", html)
-
-    def _process_text(self, height, part):
-        if len(self._href) > 0:
-            self._put_link(self._href, height, part)
-        else:
-            self.write(height, part)
-
-    def _process_tag(self, part):
-        if part[0] == "/":
-            self._close_tag(part[1 : len(part)].upper())
-        else:
-            # extract all attributes from the current tag if any
-            tag_parts = part.split(" ")
-            tag = tag_parts.pop(0).upper()
-            attributes = {}
-            for tag_part in tag_parts:
-                match_obj = re.search(r'([^=]*)=["\']?([^"\']*)', tag_part)
-                if match_obj is not None and len(match_obj.groups()) == 2:
-                    attributes[match_obj.group(1).upper()] = match_obj.group(2)
-
-            self._open_tag(tag, attributes)
-
-    def _open_tag(self, tag, attributes):
-        """set style for opening tags and singular tags"""
-
-        if tag in ["B", "I", "U"]:
-            self._set_style(tag, True)
-
-        if tag == "BLOCKQUOTE":
-            self._set_ident_plus()
-
-        if tag == "A":
-            self._href = attributes["HREF"]
-
-        if tag == "BR":
-            self.ln(5)
+                    self.write(height, item.text)
 
-        if tag == "S":
-            if self._last_font is not None:
-                raise HtmlConversionError("<s> tags can not be nested")
-
-            self._last_font = {
-                "font_family": self.font_family,
-                "size": self.font_size_pt,
-                "style": self.font_style,
-            }
-
-            if "FONTFAMILY" in attributes:
-                font_family = attributes["FONTFAMILY"]
-            else:
-                font_family = self.font_family
-
-            if "SIZE" in attributes:
-                size = int(attributes["SIZE"])
-            else:
-                size = self.font_size_pt
-
-            if "STYLE" in attributes:
-                style = attributes["STYLE"]
-            else:
-                style = self.font_style
-
-            self.set_font(font_family, size=size, style=style)
-
-    def _close_tag(self, tag):
-        """set style for closing tags"""
+            elif item is Marker.LINE_BREAK:
+                self.ln(5)
 
-        if tag in ["B", "I", "U"]:
-            self._set_style(tag, False)
+            elif item is Marker.BLOCKQUOTE_START:
+                self._set_ident_plus()
 
-        if tag == "BLOCKQUOTE":
-            self._set_ident_minus()
+            elif item is Marker.BLOCKQUOTE_END:
+                self._set_ident_minus()
 
-        if tag == "A":
-            self._href = ""
+        self._apply_run_style(_PLAIN_RUN)
 
-        if tag == "S":
+    def _apply_run_style(self, run):
+        """set font and style for the given text run"""
+        font_override = (
+            (run.font_family, run.font_size)
+            if run.font_family is not None or run.font_size is not None
+            else None
+        )
+        if font_override != self._font_override:
             if self._last_font is not None:
                 self.set_font(
                     self._last_font["font_family"],
                     size=self._last_font["size"],
-                    style=self._last_font["style"],
+                    style=self.font_style,
                 )
                 self._last_font = None
 
+            if font_override is not None:
+                self._last_font = {
+                    "font_family": self.font_family,
+                    "size": self.font_size_pt,
+                }
+                self.set_font(
+                    run.font_family or self.font_family,
+                    size=run.font_size or self.font_size_pt,
+                    style=self.font_style,
+                )
+
+            self._font_override = font_override
+
+        for tag, enable in (("B", run.bold), ("I", run.italic), ("U", run.underline)):
+            if enable != (self._tags[tag] > 0):
+                self._set_style(tag, enable)
+
     def _set_style(self, tag, enable):
         """set the actual font style based on input"""
         self._tags[tag] += 1 if enable else -1
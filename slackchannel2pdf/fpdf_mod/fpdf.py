@@ -16,17 +16,24 @@
 from __future__ import division, with_statement
 
 import errno
+import hashlib
 import math
 import os
 import re
 import struct
 import sys
 import tempfile
+import threading
 import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+from itertools import accumulate, chain
 
-from .fonts import fpdf_charwidths
+from .fonts import fpdf_charwidths, get_core_widths
 from .php import UTF8StringToArray, UTF8ToUTF16BE, print_r, sprintf, substr
 from .py3k import (
     PY3K,
@@ -48,6 +55,10 @@ FPDF_FONT_DIR = os.path.join(os.path.dirname(__file__), "font")
 FPDF_CACHE_MODE = 0  # 0 - in same folder, 1 - none, 2 - hash
 FPDF_CACHE_DIR = None
 SYSTEM_TTFONTS = None
+STRING_WIDTH_CACHE_SIZE = 4096  # max number of measured words kept per process
+WORD_WIDTH_MAX_LENGTH = 32  # longer words are measured without the cache
+COMPRESSION_WORKERS = None  # threads for zlib compression, None = executor default
+SUBSET_CACHE_SIZE = 32  # max number of compressed TTF subsets kept per process
 
 PAGE_FORMATS = {
     "a3": (841.89, 1190.55),
@@ -62,6 +73,30 @@ def set_global(var, val):
     globals()[var] = val
 
 
+class CharWidths(dict):
+    """Lazily filled mapping of characters to their widths in a font
+
+    Widths are given in 1/1000 of the font size and without font stretching,
+    so a whole text can be mapped to widths in bulk with map().
+    """
+
+    def __init__(self, font):
+        super(CharWidths, self).__init__()
+        self.cw = font["cw"]
+        self.is_ttf = font["type"] == "TTF"
+        if self.is_ttf:
+            self.missing_width = font["desc"]["MissingWidth"] or 500
+
+    def __missing__(self, char):
+        if self.is_ttf:
+            code = ord(char)
+            width = self.cw[code] if len(self.cw) > code else self.missing_width
+        else:
+            width = self.cw.get(char, 0)
+        self[char] = width
+        return width
+
+
 def load_cache(filename):
     """Return unpickled object, or None if cache unavailable"""
     if not filename:
@@ -73,6 +108,92 @@ def load_cache(filename):
         return None
 
 
+# Compressed TTF subsets shared by all documents of this process.
+# Keyed by (font file hash, sorted code points, compression level)
+_subset_cache = OrderedDict()
+_subset_cache_lock = threading.Lock()
+_font_file_hashes = {}
+
+
+def font_file_hash(filename):
+    """Return hash of a font file's content, memoized by path, size and mtime"""
+    st = os.stat(filename)
+    key = (filename, st.st_size, st.st_mtime_ns)
+    digest = _font_file_hashes.get(key)
+    if digest is None:
+        with open(filename, "rb") as fh:
+            digest = hashlib.sha1(fh.read()).hexdigest()
+        _font_file_hashes[key] = digest
+    return digest
+
+
+def get_cached_subset(key):
+    """Return cached subset for key or None"""
+    with _subset_cache_lock:
+        entry = _subset_cache.get(key)
+        if entry is not None:
+            _subset_cache.move_to_end(key)
+        return entry
+
+
+def put_cached_subset(key, entry):
+    """Store subset in the cache, dropping the least recently used one if full"""
+    with _subset_cache_lock:
+        _subset_cache[key] = entry
+        _subset_cache.move_to_end(key)
+        while len(_subset_cache) > SUBSET_CACHE_SIZE:
+            _subset_cache.popitem(last=False)
+
+
+def clear_subset_cache():
+    """Remove all cached subsets"""
+    with _subset_cache_lock:
+        _subset_cache.clear()
+
+
+# Character widths shared by all documents of this process.
+# Keyed by the font file for TTF fonts and by the font name otherwise
+_char_widths = {}
+
+
+def _font_id(font):
+    "Return an id of a font, which is the same in all documents"
+    return font.get("ttffile") or font["name"]
+
+
+@lru_cache(maxsize=STRING_WIDTH_CACHE_SIZE)
+def _word_width(font_id, word):
+    "Measure width of a word in 1/1000 of the font size without stretching"
+    return sum(map(_char_widths[font_id].__getitem__, word))
+
+
+def _string_width(font_id, size, stretching, s):
+    "Measure width of a string, use FPDF.get_string_width() for the current font"
+    # texts are measured word by word, so that the cache keeps the
+    # short and repeated words, e.g. names and dates, instead of whole texts
+    char_widths = _char_widths[font_id]
+    words = s.split(" ")
+    w = char_widths[" "] * (len(words) - 1) if len(words) > 1 else 0
+    for word in words:
+        if len(word) <= WORD_WIDTH_MAX_LENGTH:
+            w += _word_width(font_id, word)
+        else:
+            w += sum(map(char_widths.__getitem__, word))
+    if stretching != 100:
+        w = w * stretching / 100.0
+    return w * size / 1000.0
+
+
+def string_width_cache_info():
+    """Return hits, misses, maxsize and currsize of the word width cache"""
+    return _word_width.cache_info()
+
+
+def clear_string_width_cache():
+    """Remove all cached word widths"""
+    _word_width.cache_clear()
+
+
 class FPDF(object):
     "PDF Generation class"
 
@@ -83,7 +204,8 @@ class FPDF(object):
         self.offsets = {}  # array of object offsets
         self.page = 0  # current page number
         self.n = 2  # current object number
-        self.buffer = ""  # buffer holding in-memory PDF
+        self.buffer_chunks = []  # chunks of the in-memory PDF
+        self.buffer_length = 0  # total length of all chunks
         self.pages = {}  # array containing pages and metadata
         self.state = 0  # current document state
         self.fonts = {}  # array of used fonts
@@ -106,6 +228,7 @@ class FPDF(object):
         self.color_flag = 0  # indicates whether fill and text colors are different
         self.ws = 0  # word spacing
         self.angle = 0
+        self.stats = None  # optional RunStats, which measures output phases
         # Standard fonts
         self.core_fonts = {
             "courier": "Courier",
@@ -250,9 +373,10 @@ class FPDF(object):
         else:
             self.error("Incorrect layout display mode: " + layout)
 
-    def set_compression(self, compress):
-        "Set page compression"
+    def set_compression(self, compress, level=-1):
+        "Set page compression and zlib level (1 = fast ... 9 = small, -1 = default)"
         self.compress = compress
+        self.compress_level = level
 
     def set_title(self, title):
         "Title of document"
@@ -344,11 +468,9 @@ class FPDF(object):
             self.set_font(family, style, size)
         # Set colors
         self.draw_color = dc
-        if dc != "0 G":
-            self._out(dc)
+        self._out_color(dc)
         self.fill_color = fc
-        if fc != "0 g":
-            self._out(fc)
+        self._out_color(fc)
         self.text_color = tc
         self.color_flag = cf
         # Page header
@@ -361,12 +483,10 @@ class FPDF(object):
         if family:
             self.set_font(family, style, size)
         # Restore colors
-        if self.draw_color != dc:
-            self.draw_color = dc
-            self._out(dc)
-        if self.fill_color != fc:
-            self.fill_color = fc
-            self._out(fc)
+        self.draw_color = dc
+        self._out_color(dc)
+        self.fill_color = fc
+        self._out_color(fc)
         self.text_color = tc
         self.color_flag = cf
         # Restore stretching
@@ -394,7 +514,7 @@ class FPDF(object):
                 "%.3f %.3f %.3f RG", r / 255.0, g / 255.0, b / 255.0
             )
         if self.page > 0:
-            self._out(self.draw_color)
+            self._out_color(self.draw_color)
 
     def set_fill_color(self, r, g=-1, b=-1):
         "Set color for all filling operations"
@@ -406,7 +526,7 @@ class FPDF(object):
             )
         self.color_flag = self.fill_color != self.text_color
         if self.page > 0:
-            self._out(self.fill_color)
+            self._out_color(self.fill_color)
 
     def set_text_color(self, r, g=-1, b=-1):
         "Set color for text"
@@ -422,26 +542,27 @@ class FPDF(object):
         "Get width of a string in the current font"
         # normalized is parameter for internal use
         s = s if normalized else self.normalize_text(s)
-        cw = self.current_font["cw"]
-        w = 0
-        l = len(s)
-        if self.unifontsubset:
-            for char in s:
-                char = ord(char)
-                if len(cw) > char:
-                    w += cw[char]  # ord(cw[2*char])<<8 + ord(cw[2*char+1])
-                # elif (char>0 and char<128 and isset($cw[chr($char)])) { $w += $cw[chr($char)]; }
-                elif self.current_font["desc"]["MissingWidth"]:
-                    w += self.current_font["desc"]["MissingWidth"]
-                # elif (isset($this->CurrentFont['MissingWidth'])) { $w += $this->CurrentFont['MissingWidth']; }
-                else:
-                    w += 500
-        else:
-            for i in range(0, l):
-                w += cw.get(s[i], 0)
-        if self.font_stretching != 100:
-            w = w * self.font_stretching / 100.0
-        return w * self.font_size / 1000.0
+        return self._get_string_width(s, self.font_stretching)
+
+    def _get_string_width(self, s, stretching):
+        "Get width of a normalized string in the current font with given stretching"
+        font = self.current_font
+        if "char_widths" not in font:
+            self._get_char_widths()
+        return _string_width(font["font_id"], self.font_size, stretching, s)
+
+    def _get_char_widths(self):
+        "Return the character width map of the current font"
+        font = self.current_font
+        char_widths = font.get("char_widths")
+        if char_widths is None:
+            font_id = _font_id(font)
+            char_widths = _char_widths.get(font_id)
+            if char_widths is None:
+                char_widths = _char_widths.setdefault(font_id, CharWidths(font))
+            font["font_id"] = font_id
+            font["char_widths"] = char_widths
+        return char_widths
 
     def set_line_width(self, width):
         "Set line width"
@@ -638,9 +759,9 @@ class FPDF(object):
                             raise  # Not a permission error.
                 del ttf
             if hasattr(self, "str_alias_nb_pages"):
-                sbarr = list(range(0, 57))  # include numbers in the subset!
+                sbarr = set(range(0, 57))  # include numbers in the subset!
             else:
-                sbarr = list(range(0, 32))
+                sbarr = set(range(0, 32))
             self.fonts[fontkey] = {
                 "i": len(self.fonts) + 1,
                 "type": font_dict["type"],
@@ -720,7 +841,7 @@ class FPDF(object):
         if fontkey not in self.fonts:
             # Check if one of the standard fonts
             if fontkey in self.core_fonts:
-                if fontkey not in fpdf_charwidths:
+                if get_core_widths(fontkey) is None:
                     # Load metric file
                     name = os.path.join(FPDF_FONT_DIR, family)
                     if family == "times" or family == "helvetica":
@@ -747,10 +868,6 @@ class FPDF(object):
         self.font_size = size / self.k
         self.current_font = self.fonts[fontkey]
         self.unifontsubset = self.fonts[fontkey]["type"] == "TTF"
-        if self.page > 0:
-            self._out(
-                sprintf("BT /F%d %.2f Tf ET", self.current_font["i"], self.font_size_pt)
-            )
 
     def set_font_size(self, size):
         "Set font size in points"
@@ -758,10 +875,26 @@ class FPDF(object):
             return
         self.font_size_pt = size
         self.font_size = size / self.k
-        if self.page > 0:
-            self._out(
-                sprintf("BT /F%d %.2f Tf ET", self.current_font["i"], self.font_size_pt)
-            )
+
+    def _apply_font(self):
+        "Output the current font, unless it is already in effect on the page"
+        op = sprintf("BT /F%d %.2f Tf ET", self.current_font["i"], self.font_size_pt)
+        if self._page_font != op:
+            self._page_font = op
+            self.current_font["used"] = True
+            self._out(op)
+
+    def _out_color(self, color):
+        "Output a draw or fill color, unless it is already in effect on the page"
+        if color[-1] == "G":
+            if self._page_draw_color == color:
+                return
+            self._page_draw_color = color
+        else:
+            if self._page_fill_color == color:
+                return
+            self._page_fill_color = color
+        self._out(color)
 
     def set_stretching(self, factor):
         "Set from stretch factor percents (default: 100.0)"
@@ -799,8 +932,7 @@ class FPDF(object):
         txt = self.normalize_text(txt)
         if self.unifontsubset:
             txt2 = self._escape(UTF8ToUTF16BE(txt, False))
-            for uni in UTF8StringToArray(txt):
-                self.current_font["subset"].append(uni)
+            self.current_font["subset"].update(UTF8StringToArray(txt))
         else:
             txt2 = self._escape(txt)
         s = sprintf(
@@ -810,6 +942,7 @@ class FPDF(object):
             s += " " + self._dounderline(x, y, txt)
         if self.color_flag:
             s = "q " + self.text_color + " " + s + " Q"
+        self._apply_font()
         self._out(s)
 
     @check_page
@@ -820,6 +953,8 @@ class FPDF(object):
             y = self.y
         if self.angle != 0:
             self._out("Q")
+            # graphics state was restored to what it was before the rotation
+            self._page_font = self._page_draw_color = self._page_fill_color = None
         self.angle = angle
         if angle != 0:
             angle *= math.pi / 180
@@ -920,6 +1055,7 @@ class FPDF(object):
                     (self.h - (y + h)) * k,
                 )
         if txt != "":
+            self._apply_font()
             if align == "R":
                 dx = w - self.c_margin - self.get_string_width(txt, True)
             elif align == "C":
@@ -931,8 +1067,7 @@ class FPDF(object):
 
             # If multibyte, Tw has no effect - do word spacing using an adjustment before each space
             if self.ws and self.unifontsubset:
-                for uni in UTF8StringToArray(txt):
-                    self.current_font["subset"].append(uni)
+                self.current_font["subset"].update(UTF8StringToArray(txt))
                 space = self._escape(UTF8ToUTF16BE(" ", False))
                 s += sprintf(
                     "BT 0 Tw %.2F %.2F Td [",
@@ -953,8 +1088,7 @@ class FPDF(object):
             else:
                 if self.unifontsubset:
                     txt2 = self._escape(UTF8ToUTF16BE(txt, False))
-                    for uni in UTF8StringToArray(txt):
-                        self.current_font["subset"].append(uni)
+                    self.current_font["subset"].update(UTF8StringToArray(txt))
                 else:
                     txt2 = self._escape(txt)
                 s += sprintf(
@@ -979,7 +1113,15 @@ class FPDF(object):
                     link,
                 )
         if s:
-            self._out(s)
+            alias = getattr(self, "str_alias_nb_pages", None)
+            if alias and alias in txt and self.state == 2:
+                # remember where the alias is, so it can be replaced in place
+                page = self.pages[self.page]
+                start = len(page["content"])
+                self._out(s)
+                page.setdefault("nb_aliases", []).append((start, len(page["content"])))
+            else:
+                self._out(s)
         self.lasth = h
         if ln > 0:
             # Go to next line
@@ -1107,69 +1249,77 @@ class FPDF(object):
     def write(self, h, txt="", link=""):
         "Output text in flowing mode"
         txt = self.normalize_text(txt)
-        cw = self.current_font["cw"]
         w = self.w - self.r_margin - self.x
         wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
         s = txt.replace("\r", "")
         nb = len(s)
-        sep = -1
+        # stretching is only taken into account for unicode fonts
+        if self.unifontsubset:
+            font_stretching = self.font_stretching
+        else:
+            font_stretching = 100
+        if "\n" not in s:
+            # most texts fit into the current line and can be measured as a whole
+            l = self._get_string_width(s, font_stretching)
+            if l * 1000.0 / self.font_size <= wmax:
+                if nb:
+                    self.cell(l, h, s, 0, 0, "", 0, link)
+                return
+        # cumulative widths of all characters: the width of s[j:i] is cum[i] - cum[j]
+        char_widths = self._get_char_widths()
+        cum = list(accumulate(map(char_widths.__getitem__, s), initial=0))
+        stretching = font_stretching / 100.0
         i = 0
         j = 0
-        l = 0
         nl = 1
         while i < nb:
-            # Get next character
-            c = s[i]
-            if c == "\n":
+            eol = s.find("\n", i)
+            if eol == -1:
+                eol = nb
+            # first character from i on that makes the current line overflow
+            limit = cum[j] + wmax / stretching
+            i = bisect_right(cum, limit, i + 1, eol + 1) - 1
+            if i == eol:
+                if eol == nb:
+                    break
                 # Explicit line break
                 self.cell(w, h, substr(s, j, i - j), 0, 2, "", 0, link)
                 i += 1
-                sep = -1
                 j = i
-                l = 0
                 if nl == 1:
                     self.x = self.l_margin
                     w = self.w - self.r_margin - self.x
                     wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
                 nl += 1
                 continue
-            if c == " ":
-                sep = i
-            if self.unifontsubset:
-                l += self.get_string_width(c, True) / self.font_size * 1000.0
-            else:
-                l += cw.get(c, 0)
-            if l > wmax:
-                # Automatic line break
-                if sep == -1:
-                    if self.x > self.l_margin:
-                        # Move to next line
-                        self.x = self.l_margin
-                        self.y += h
-                        w = self.w - self.r_margin - self.x
-                        wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
-                        i += 1
-                        nl += 1
-                        continue
-                    if i == j:
-                        i += 1
-                    self.cell(w, h, substr(s, j, i - j), 0, 2, "", 0, link)
-                else:
-                    self.cell(w, h, substr(s, j, sep - j), 0, 2, "", 0, link)
-                    i = sep + 1
-                sep = -1
-                j = i
-                l = 0
-                if nl == 1:
+            # Automatic line break
+            sep = s.rfind(" ", j, i + 1)
+            if sep == -1:
+                if self.x > self.l_margin:
+                    # Move to next line
                     self.x = self.l_margin
+                    self.y += h
                     w = self.w - self.r_margin - self.x
                     wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
-                nl += 1
+                    i += 1
+                    nl += 1
+                    continue
+                if i == j:
+                    i += 1
+                self.cell(w, h, substr(s, j, i - j), 0, 2, "", 0, link)
             else:
-                i += 1
+                self.cell(w, h, substr(s, j, sep - j), 0, 2, "", 0, link)
+                i = sep + 1
+            j = i
+            if nl == 1:
+                self.x = self.l_margin
+                w = self.w - self.r_margin - self.x
+                wmax = (w - 2 * self.c_margin) * 1000.0 / self.font_size
+            nl += 1
         # Last chunk
-        if i != j:
-            self.cell(l / 1000.0 * self.font_size, h, substr(s, j), 0, 0, "", 0, link)
+        if nb != j:
+            l = self._get_string_width(substr(s, j), font_stretching)
+            self.cell(l, h, substr(s, j), 0, 0, "", 0, link)
 
     @check_page
     def image(
@@ -1325,6 +1475,13 @@ class FPDF(object):
                 dest = "I"
             else:
                 dest = "F"
+        if dest == "F":
+            # Save to local file chunk by chunk, without joining the whole PDF
+            with open(name, "wb") as f:
+                for chunk in self.buffer_chunks:
+                    # manage binary data as latin1 until PEP461 or similar is implemented
+                    f.write(chunk.encode("latin-1") if PY3K else chunk)
+            return
         if PY3K:
             # manage binary data as latin1 until PEP461 or similar is implemented
             buffer = self.buffer.encode("latin-1")
@@ -1334,10 +1491,6 @@ class FPDF(object):
             # Python < 3 writes byte data transparently without "buffer"
             stdout = getattr(sys.stdout, "buffer", sys.stdout)
             stdout.write(buffer)
-        elif dest == "F":
-            # Save to local file
-            with open(name, "wb") as f:
-                f.write(buffer)
         elif dest == "S":
             # Return as a byte string
             return buffer
@@ -1374,16 +1527,30 @@ class FPDF(object):
     def _putpages(self):
         nb = self.page
         if hasattr(self, "str_alias_nb_pages"):
-            # Replace number of pages in fonts using subsets (unicode)
-            alias = UTF8ToUTF16BE(self.str_alias_nb_pages, False)
-            r = UTF8ToUTF16BE(str(nb), False)
-            for n in range(1, nb + 1):
-                self.pages[n]["content"] = self.pages[n]["content"].replace(alias, r)
-            # Now repeat for no pages in non-subset fonts
+            # Replace number of pages only in the cells, which contain the alias,
+            # instead of scanning the whole content of every page
+            alias = self.str_alias_nb_pages
+            alias_utf16 = UTF8ToUTF16BE(alias, False)
+            r = str(nb)
+            r_utf16 = UTF8ToUTF16BE(r, False)
             for n in range(1, nb + 1):
-                self.pages[n]["content"] = self.pages[n]["content"].replace(
-                    self.str_alias_nb_pages, str(nb)
-                )
+                ranges = self.pages[n].pop("nb_aliases", None)
+                if not ranges:
+                    continue
+                content = self.pages[n]["content"]
+                parts = []
+                last = 0
+                for start, end in ranges:
+                    parts.append(content[last:start])
+                    # unicode fonts using subsets first, then all others
+                    parts.append(
+                        content[start:end]
+                        .replace(alias_utf16, r_utf16)
+                        .replace(alias, r)
+                    )
+                    last = end
+                parts.append(content[last:])
+                self.pages[n]["content"] = "".join(parts)
         if self.def_orientation == "P":
             dw_pt = self.dw_pt
             dh_pt = self.dh_pt
@@ -1392,8 +1559,21 @@ class FPDF(object):
             dh_pt = self.dw_pt
         if self.compress:
             filter = "/Filter /FlateDecode "
+            # manage binary data as latin1 until PEP461 or similar is implemented
+            streams = self._compress_streams(
+                [
+                    self.pages[n]["content"].encode("latin1")
+                    if PY3K
+                    else self.pages[n]["content"]
+                    for n in range(1, nb + 1)
+                ]
+            )
         else:
             filter = ""
+            streams = [self.pages[n]["content"] for n in range(1, nb + 1)]
+        # page contents are only needed as streams from now on
+        for n in range(1, nb + 1):
+            self.pages[n]["content"] = ""
         for n in range(1, nb + 1):
             # Page
             self._newobj()
@@ -1441,19 +1621,13 @@ class FPDF(object):
             self._out("/Contents " + str(self.n + 1) + " 0 R>>")
             self._out("endobj")
             # Page content
-            content = self.pages[n]["content"]
-            if self.compress:
-                # manage binary data as latin1 until PEP461 or similar is implemented
-                p = content.encode("latin1") if PY3K else content
-                p = zlib.compress(p)
-            else:
-                p = content
+            p = streams[n - 1]
             self._newobj()
             self._out("<<" + filter + "/Length " + str(len(p)) + ">>")
             self._putstream(p)
             self._out("endobj")
         # Pages root
-        self.offsets[1] = len(self.buffer)
+        self.offsets[1] = self.buffer_length
         self._out("1 0 obj")
         self._out("<</Type /Pages")
         kids = "/Kids ["
@@ -1476,8 +1650,11 @@ class FPDF(object):
                 + "]>>"
             )
             self._out("endobj")
+        # Only embed fonts that were selected on at least one page
+        used_fonts = [font for font in self.fonts.values() if font.get("used")]
+        used_files = {font.get("file", font.get("filename")) for font in used_fonts}
         for name, info in self.font_files.items():
-            if "type" in info and info["type"] != "TTF":
+            if "type" in info and info["type"] != "TTF" and name in used_files:
                 # Font file embedding
                 self._newobj()
                 self.font_files[name]["n"] = self.n
@@ -1503,8 +1680,41 @@ class FPDF(object):
                 self._out(">>")
                 self._putstream(font)
                 self._out("endobj")
-        flist = [(x[1]["i"], x[0], x[1]) for x in self.fonts.items()]
+        flist = [
+            (x[1]["i"], x[0], x[1]) for x in self.fonts.items() if x[1].get("used")
+        ]
         flist.sort()
+        # Subset all TTF fonts first, so their streams can be compressed in parallel.
+        # Subsets already built for the same font file and glyphs are reused.
+        ttf_subsets = {}
+        new_subsets = []
+        for idx, k, font in flist:
+            if font["type"] == "TTF":
+                subset = font["subset"]
+                subset.discard(0)
+                subset = sorted(subset)
+                key = (
+                    font_file_hash(font["ttffile"]),
+                    tuple(subset),
+                    self.compress_level,
+                )
+                ttf_subsets[k] = get_cached_subset(key)
+                if ttf_subsets[k] is None:
+                    ttf = TTFontFile()
+                    ttfontstream = ttf.makeSubset(font["ttffile"], subset)
+                    new_subsets.append((k, key, ttf, ttfontstream))
+        streams = self._compress_streams(
+            [x[3] for x in new_subsets]
+            + [self._cidtogidmap(x[2].codeToGlyph) for x in new_subsets]
+        )
+        for num, (k, key, ttf, ttfontstream) in enumerate(new_subsets):
+            ttf_subsets[k] = {
+                "originalsize": len(ttfontstream),
+                "fontstream": streams[num],
+                "cidtogidmap": streams[len(new_subsets) + num],
+                "maxUni": ttf.maxUni,
+            }
+            put_cached_subset(key, ttf_subsets[k])
         for idx, k, font in flist:
             # Font objects
             self.fonts[k]["n"] = self.n + 1
@@ -1569,15 +1779,10 @@ class FPDF(object):
                 self._out("endobj")
             elif type == "TTF":
                 self.fonts[k]["n"] = self.n + 1
-                ttf = TTFontFile()
                 fontname = "MPDFAA" + "+" + font["name"]
-                subset = font["subset"]
-                del subset[0]
-                ttfontstream = ttf.makeSubset(font["ttffile"], subset)
-                ttfontsize = len(ttfontstream)
-                fontstream = zlib.compress(ttfontstream)
-                codeToGlyph = ttf.codeToGlyph
-                ##del codeToGlyph[0]
+                ttf_subset = ttf_subsets[k]
+                ttfontsize = ttf_subset["originalsize"]
+                fontstream = ttf_subset["fontstream"]
                 # Type0 Font
                 # A composite font - a font composed of other fonts, organized hierarchically
                 self._newobj()
@@ -1600,7 +1805,7 @@ class FPDF(object):
                 self._out("/FontDescriptor " + str(self.n + 3) + " 0 R")
                 if font["desc"].get("MissingWidth"):
                     self._out("/DW %d" % font["desc"]["MissingWidth"])
-                self._putTTfontwidths(font, ttf.maxUni)
+                self._putTTfontwidths(font, ttf_subset["maxUni"])
                 self._out("/CIDToGIDMap " + str(self.n + 4) + " 0 R")
                 self._out(">>")
                 self._out("endobj")
@@ -1667,16 +1872,7 @@ class FPDF(object):
 
                 # Embed CIDToGIDMap
                 # A specification of the mapping from CIDs to glyph indices
-                cidtogidmap = ""
-                cidtogidmap = ["\x00"] * 256 * 256 * 2
-                for cc, glyph in codeToGlyph.items():
-                    cidtogidmap[cc * 2] = chr(glyph >> 8)
-                    cidtogidmap[cc * 2 + 1] = chr(glyph & 0xFF)
-                cidtogidmap = "".join(cidtogidmap)
-                if PY3K:
-                    # manage binary data as latin1 until PEP461-like function is implemented
-                    cidtogidmap = cidtogidmap.encode("latin1")
-                cidtogidmap = zlib.compress(cidtogidmap)
+                cidtogidmap = ttf_subset["cidtogidmap"]
                 self._newobj()
                 self._out("<</Length " + str(len(cidtogidmap)) + "")
                 self._out("/Filter /FlateDecode")
@@ -1692,7 +1888,6 @@ class FPDF(object):
                 self._out(">>")
                 self._putstream(fontstream)
                 self._out("endobj")
-                del ttf
             else:
                 # Allow for additional types
                 mtd = "_put" + type.lower()
@@ -1700,6 +1895,15 @@ class FPDF(object):
                     self.error("Unsupported font type: " + type)
                 self.mtd(font)
 
+    @staticmethod
+    def _cidtogidmap(codeToGlyph):
+        "Return CIDToGIDMap for the BMP with 2 bytes per CID (glyph index, big endian)"
+        cidtogidmap = bytearray(256 * 256 * 2)
+        for cc, glyph in codeToGlyph.items():
+            if cc < 0x10000:
+                struct.pack_into(">H", cidtogidmap, cc * 2, glyph)
+        return bytes(cidtogidmap)
+
     def _putTTfontwidths(self, font, maxUni):
         if font["unifilename"]:
             cw127fname = os.path.splitext(font["unifilename"])[0] + ".cw127.pkl"
@@ -1724,9 +1928,12 @@ class FPDF(object):
             startcid = 128
         cwlen = maxUni + 1
 
-        # for each character
-        subset = set(font["subset"])
-        for cid in range(startcid, cwlen):
+        # for each character below 256 and each character of the subset above
+        cids = chain(
+            range(startcid, min(cwlen, 256)),
+            sorted(cid for cid in font["subset"] if 255 < cid < cwlen),
+        )
+        for cid in cids:
             if cid == 128 and cw127fname and not os.path.exists(cw127fname):
                 try:
                     with open(cw127fname, "wb") as fh:
@@ -1741,8 +1948,6 @@ class FPDF(object):
                 except IOError:
                     if not exception().errno == errno.EACCES:
                         raise  # Not a permission error.
-            if cid > 255 and (cid not in subset):  #
-                continue
 
             # start patch Kalkoken
             try:
@@ -1895,7 +2100,7 @@ class FPDF(object):
     def _putresourcedict(self):
         self._out("/ProcSet [/PDF /Text /ImageB /ImageC /ImageI]")
         self._out("/Font <<")
-        f = [(x["i"], x["n"]) for x in self.fonts.values()]
+        f = [(x["i"], x["n"]) for x in self.fonts.values() if x.get("used")]
         f.sort()
         for idx, n in f:
             self._out("/F" + str(idx) + " " + str(n) + " 0 R")
@@ -1905,10 +2110,11 @@ class FPDF(object):
         self._out(">>")
 
     def _putresources(self):
-        self._putfonts()
+        with self._stats_phase("font_embedding"):
+            self._putfonts()
         self._putimages()
         # Resource dictionary
-        self.offsets[2] = len(self.buffer)
+        self.offsets[2] = self.buffer_length
         self._out("2 0 obj")
         self._out("<<")
         self._putresourcedict()
@@ -1982,7 +2188,7 @@ class FPDF(object):
         self._out(">>")
         self._out("endobj")
         # Cross-ref
-        o = len(self.buffer)
+        o = self.buffer_length
         self._out("xref")
         self._out("0 " + (str(self.n + 1)))
         self._out("0000000000 65535 f ")
@@ -2002,6 +2208,10 @@ class FPDF(object):
         self.page += 1
         self.pages[self.page] = {"content": ""}
         self.state = 2
+        # graphics state in effect on the new page, to skip redundant operators
+        self._page_font = None
+        self._page_draw_color = "0 G"
+        self._page_fill_color = "0 g"
         self.x = self.l_margin
         self.y = self.t_margin
         self.font_family = ""
@@ -2043,7 +2253,7 @@ class FPDF(object):
     def _newobj(self):
         # Begin a new object
         self.n += 1
-        self.offsets[self.n] = len(self.buffer)
+        self.offsets[self.n] = self.buffer_length
         self._out(str(self.n) + " 0 obj")
 
     def _dounderline(self, x, y, txt):
@@ -2300,6 +2510,19 @@ class FPDF(object):
             .replace("\r", "\\r")
         )
 
+    def _compress_streams(self, streams):
+        "Compress streams with zlib, using a thread pool when there are several"
+        level = self.compress_level
+        with self._stats_phase("compression"):
+            if len(streams) < 2:
+                return [zlib.compress(s, level) for s in streams]
+            with ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS) as executor:
+                return list(executor.map(lambda s: zlib.compress(s, level), streams))
+
+    def _stats_phase(self, name):
+        "Measure a phase if stats are enabled"
+        return self.stats.phase(name) if self.stats is not None else nullcontext()
+
     def _putstream(self, s):
         self._out("stream")
         self._out(s)
@@ -2317,7 +2540,14 @@ class FPDF(object):
         if self.state == 2:
             self.pages[self.page]["content"] += s + "\n"
         else:
-            self.buffer += s + "\n"
+            self.buffer_chunks.append(s)
+            self.buffer_chunks.append("\n")
+            self.buffer_length += len(s) + 1
+
+    @property
+    def buffer(self):
+        "In-memory PDF as one string"
+        return "".join(self.buffer_chunks)
 
     @check_page
     def interleaved2of5(self, txt, x, y, w=1.0, h=10.0):
@@ -18,8 +18,10 @@
 
 from __future__ import with_statement
 
+import mmap
 import re
 import warnings
+from contextlib import contextmanager
 from struct import pack, unpack, unpack_from
 
 from .php import count, die, str_pad, str_repeat, strlen, substr
@@ -60,24 +62,25 @@ def sub32(x, y):
 def calcChecksum(data):
     if strlen(data) % 4:
         data += str_repeat(b("\0"), (4 - (len(data) % 4)))
-    hi = 0x0000
-    lo = 0x0000
-    for i in range(0, len(data), 4):
-        hi += (ord(data[i]) << 8) + ord(data[i + 1])
-        lo += (ord(data[i + 2]) << 8) + ord(data[i + 3])
-        hi += lo >> 16
-        lo = lo & 0xFFFF
-        hi = hi & 0xFFFF
-    return (hi, lo)
+    # sum of all big endian uint32 words modulo 2^32, returned as (hi, lo) words
+    total = sum(unpack(">%dL" % (len(data) // 4), data)) & 0xFFFFFFFF
+    return (total >> 16, total & 0xFFFF)
 
 
 class TTFontFile:
     def __init__(self):
         self.maxStrLenRead = 200000  # Maximum size of glyf table to read in as string (otherwise reads each glyph from file)
 
+    @contextmanager
+    def _mapped(self, file):
+        "Memory-map the font file as self.fh, which is then read with unpack_from"
+        with open(file, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as self.fh:
+                yield self.fh
+
     def getMetrics(self, file):
         self.filename = file
-        with open(file, "rb") as self.fh:
+        with self._mapped(file):
             self._pos = 0
             self.charWidths = []
             self.glyphPos = {}
@@ -120,29 +123,22 @@ class TTFontFile:
 
     def seek(self, pos):
         self._pos = pos
-        self.fh.seek(self._pos)
 
     def skip(self, delta):
         self._pos = self._pos + delta
-        self.fh.seek(self._pos)
 
     def seek_table(self, tag, offset_in_table=0):
         tpos = self.get_table_pos(tag)
         self._pos = tpos[0] + offset_in_table
-        self.fh.seek(self._pos)
         return self._pos
 
     def read_tag(self):
         self._pos += 4
-        return self.fh.read(4).decode("latin1")
+        return self.fh[self._pos - 4 : self._pos].decode("latin1")
 
     def read_short(self):
         self._pos += 2
-        s = self.fh.read(2)
-        a = (ord(s[0]) << 8) + ord(s[1])
-        if a & (1 << 15):
-            a = a - (1 << 16)
-        return a
+        return unpack_from(">h", self.fh, self._pos - 2)[0]
 
     def unpack_short(self, s):
         a = (ord(s[0]) << 8) + ord(s[1])
@@ -152,29 +148,17 @@ class TTFontFile:
 
     def read_ushort(self):
         self._pos += 2
-        s = self.fh.read(2)
-        return (ord(s[0]) << 8) + ord(s[1])
+        return unpack_from(">H", self.fh, self._pos - 2)[0]
 
     def read_ulong(self):
         self._pos += 4
-        s = self.fh.read(4)
-        # if large uInt32 as an integer, PHP converts it to -ve
-        return (
-            (ord(s[0]) * 16777216) + (ord(s[1]) << 16) + (ord(s[2]) << 8) + ord(s[3])
-        )  #     16777216  = 1<<24
+        return unpack_from(">L", self.fh, self._pos - 4)[0]
 
     def get_ushort(self, pos):
-        self.fh.seek(pos)
-        s = self.fh.read(2)
-        return (ord(s[0]) << 8) + ord(s[1])
+        return unpack_from(">H", self.fh, pos)[0]
 
     def get_ulong(self, pos):
-        self.fh.seek(pos)
-        s = self.fh.read(4)
-        # iF large uInt32 as an integer, PHP converts it to -ve
-        return (
-            (ord(s[0]) * 16777216) + (ord(s[1]) << 16) + (ord(s[2]) << 8) + ord(s[3])
-        )  #     16777216  = 1<<24
+        return unpack_from(">L", self.fh, pos)[0]
 
     def pack_short(self, val):
         if val < 0:
@@ -201,17 +185,15 @@ class TTFontFile:
         return self.splice(stream, offset, up)
 
     def get_chunk(self, pos, length):
-        self.fh.seek(pos)
         if length < 1:
             return ""
-        return self.fh.read(length)
+        return self.fh[pos : pos + length]
 
     def get_table(self, tag):
         (pos, length) = self.get_table_pos(tag)
         if length == 0:
             die("Truetype font (" + self.filename + "): error reading table: " + tag)
-        self.fh.seek(pos)
-        return self.fh.read(length)
+        return self.fh[pos : pos + length]
 
     def add(self, tag, data):
         if tag == "head":
@@ -363,7 +345,7 @@ class TTFontFile:
             self.sFamilyClass = sF >> 8
             self.sFamilySubClass = sF & 0xFF
             self._pos += 10  # PANOSE = 10 byte length
-            panose = self.fh.read(10)
+            panose = self.fh[self._pos - 10 : self._pos]
             self.skip(26)
             sTypoAscender = self.read_short()
             sTypoDescender = self.read_short()
@@ -481,7 +463,7 @@ class TTFontFile:
 
     def makeSubset(self, file, subset):
         self.filename = file
-        with open(file, "rb") as self.fh:
+        with self._mapped(file):
             self._pos = 0
             self.charWidths = []
             self.glyphPos = {}
@@ -575,9 +557,11 @@ class TTFontFile:
 
             subsetglyphs = [(0, 0)]  # special "sorted dict"!
             subsetCharToGlyph = {}
+            seen = set(subsetglyphs)
             for code in subset:
                 if code in self.charToGlyph:
-                    if (self.charToGlyph[code], code) not in subsetglyphs:
+                    if (self.charToGlyph[code], code) not in seen:
+                        seen.add((self.charToGlyph[code], code))
                         subsetglyphs.append(
                             (self.charToGlyph[code], code)
                         )  # Old Glyph ID => Unicode
@@ -907,7 +891,7 @@ class TTFontFile:
                     )  # old glyphID to new glyphID
                     nonlocals["subsetglyphs"].append((glyphIdx, 1))
 
-                savepos = self.fh.tell()
+                savepos = self._pos
                 self.getGlyphs(glyphIdx, nonlocals)
                 self.seek(savepos)
                 if flags & GF_WORDS:
@@ -995,12 +979,12 @@ class TTFontFile:
         start = self.seek_table("hmtx")
         if gid < numberOfHMetrics:
             self.seek(start + (gid * 4))
-            hm = self.fh.read(4)
+            hm = self.fh[self._pos : self._pos + 4]
         else:
             self.seek(start + ((numberOfHMetrics - 1) * 4))
-            hm = self.fh.read(2)
+            hm = self.fh[self._pos : self._pos + 2]
             self.seek(start + (numberOfHMetrics * 2) + (gid * 2))
-            hm += self.fh.read(2)
+            hm += self.fh[self._pos : self._pos + 2]
         return hm
 
     def getLOCA(self, indexToLocFormat, numGlyphs):
@@ -9,11 +9,18 @@ logger = logging.getLogger(__name__)
 
 
 def transform_encoding(text: str) -> str:
-    """adjust encoding to latin-1 and transform HTML entities"""
-    text2 = html.unescape(text)
-    text2 = text2.encode("utf-8", "replace").decode("utf-8")
-    text2 = text2.replace("\t", "    ")
-    return text2
+    """adjust encoding to latin-1 and transform HTML entities
+
+    Each step is skipped when the text does not need it,
+    so that plain ASCII text is returned as is.
+    """
+    if "&" in text:
+        text = html.unescape(text)
+    if not text.isascii():
+        text = text.encode("utf-8", "replace").decode("utf-8")
+    if "\t" in text:
+        text = text.replace("\t", "    ")
+    return text
 
 
 def read_array_from_json_file(filepath: Path, quiet=False) -> list:
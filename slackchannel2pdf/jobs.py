@@ -0,0 +1,299 @@
+"""Export jobs and a pool of warm exporters for running them."""
+
+import datetime as dt
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import settings
+
+
+class ExportJob(NamedTuple):
+    """An export of one or several channels with its parameters."""
+
+    channels: Tuple[str, ...]
+    slack_token: Optional[str] = None
+    dest_path: Optional[str] = None
+    oldest: Optional[dt.datetime] = None
+    latest: Optional[dt.datetime] = None
+    page_orientation: str = settings.PAGE_ORIENTATION_DEFAULT
+    page_format: str = settings.PAGE_FORMAT_DEFAULT
+    max_messages: int = settings.MAX_MESSAGES_PER_CHANNEL
+    timezone: Optional[str] = None
+    locale: Optional[str] = None
+    add_debug_info: bool = False
+    write_raw_data: bool = False
+    write_stats: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExportJob":
+        """Create a job from a dict, e.g. parsed from JSON.
+
+        Dates can be given as strings. Raises ValueError for invalid input.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("job must be an object")
+
+        unknown = set(data.keys()) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"unknown job fields: {', '.join(sorted(unknown))}")
+
+        channels = data.get("channels")
+        if isinstance(channels, str):
+            channels = [channels]
+        if not channels or not isinstance(channels, list):
+            raise ValueError("channels must be a non-empty list")
+
+        params = dict(data)
+        params["channels"] = tuple(str(channel) for channel in channels)
+        for name in ["oldest", "latest"]:
+            if isinstance(params.get(name), str):
+                params[name] = _parse_date(name, params[name])
+
+        if "max_messages" in params and not isinstance(params["max_messages"], int):
+            raise ValueError("max_messages must be an integer")
+
+        return cls(**params)
+
+    def exporter_key(self) -> tuple:
+        """Return key for exporters which can be shared by jobs."""
+        return (self.slack_token, self.timezone, self.locale, self.add_debug_info)
+
+    def estimated_size(self) -> float:
+        """Return a rough estimate of the work for this job.
+
+        The estimate grows with the number of channels, the message limit
+        and the length of the date window if one is given.
+        """
+        size = float(len(self.channels) * self.max_messages)
+        if self.oldest and self.latest and self.latest > self.oldest:
+            days = (self.latest - self.oldest) / dt.timedelta(days=1)
+            size *= min(1.0, max(days, 1.0) / 365)
+        return size
+
+
+class JobResult(NamedTuple):
+    """Outcome of a job, which was run from a batch."""
+
+    index: int
+    job: ExportJob
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the job succeeded."""
+        return self.error is None and bool(self.result and self.result.get("ok"))
+
+
+def load_manifest(path: Path, defaults: Optional[dict] = None) -> List[ExportJob]:
+    """Load export jobs from a JSON manifest file.
+
+    The manifest is an object with a list of jobs and optional defaults
+    for all jobs, e.g.: {"defaults": {"page_format": "a3"}, "jobs": [...]}.
+    Defaults given as argument, e.g. from the command line, apply to all jobs
+    unless the manifest defines the same fields.
+    Raises ValueError for invalid manifests.
+    """
+    try:
+        with Path(path).open("r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, json.JSONDecodeError) as ex:
+        raise ValueError(f"Can not read manifest {path}: {ex}") from ex
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ValueError("manifest must be an object with a list of jobs")
+
+    manifest_defaults = manifest.get("defaults", {})
+    if not isinstance(manifest_defaults, dict):
+        raise ValueError("defaults must be an object")
+
+    defaults = {**(defaults or {}), **manifest_defaults}
+
+    jobs = []
+    for num, data in enumerate(manifest["jobs"], start=1):
+        if not isinstance(data, dict):
+            raise ValueError(f"job {num}: job must be an object")
+        try:
+            jobs.append(ExportJob.from_dict({**defaults, **data}))
+        except ValueError as ex:
+            raise ValueError(f"job {num}: {ex}") from ex
+
+    return jobs
+
+
+def _parse_date(name: str, value: str) -> dt.datetime:
+    from dateutil import parser  # pylint: disable = import-outside-toplevel
+
+    try:
+        return parser.parse(value)
+    except (ValueError, OverflowError) as ex:
+        raise ValueError(f"Invalid date for {name}: {value}") from ex
+
+
+class ExporterPool:
+    """A pool of exporters, which stay warm between jobs.
+
+    Exporters keep their Slack client, workspace directories, locale helper
+    and transformation caches. Each exporter is only used by one job at a time.
+
+    Idle exporters are kept for the most recently used job settings only
+    and reload their workspace directories once these are older than the TTL.
+    """
+
+    def __init__(
+        self,
+        slack_token: Optional[str] = None,
+        max_keys: int = settings.SERVER_MAX_EXPORTER_KEYS,
+        max_idle_exporters: int = settings.SERVER_MAX_IDLE_EXPORTERS,
+        directories_ttl: int = settings.SERVER_DIRECTORIES_TTL,
+    ) -> None:
+        """
+        Args:
+        - slack_token: token for jobs which do not define their own
+        - max_keys: max number of job settings to keep idle exporters for
+        - max_idle_exporters: max number of idle exporters per job settings
+        - directories_ttl: seconds after which directories are reloaded, 0 = never
+        """
+        self._slack_token = slack_token
+        self._max_keys = max_keys
+        self._max_idle_exporters = max_idle_exporters
+        self._directories_ttl = directories_ttl
+        # idle exporters with the time their directories were loaded
+        # for each exporter key, least recently used key first
+        self._idle_exporters = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def exporter(self, job: ExportJob):
+        """Provide an exporter for the job and return it to the pool afterwards."""
+        if not job.slack_token:
+            job = job._replace(slack_token=self._slack_token)
+
+        key = job.exporter_key()
+        with self._lock:
+            idle_exporters = self._idle_exporters.get(key)
+            entry = idle_exporters.pop() if idle_exporters else None
+
+        if entry is None:
+            exporter = self._create_exporter(job)
+            loaded_at = time.monotonic()
+        else:
+            exporter, loaded_at = entry
+            if (
+                self._directories_ttl
+                and time.monotonic() - loaded_at > self._directories_ttl
+            ):
+                exporter.refresh_directories()
+                loaded_at = time.monotonic()
+
+        try:
+            yield exporter
+        finally:
+            self._release(key, exporter, loaded_at)
+
+    def _release(self, key: tuple, exporter, loaded_at: float) -> None:
+        """Return an exporter to the pool or drop it if the pool is full."""
+        with self._lock:
+            idle_exporters = self._idle_exporters.setdefault(key, [])
+            self._idle_exporters.move_to_end(key)
+            if len(idle_exporters) < self._max_idle_exporters:
+                idle_exporters.append((exporter, loaded_at))
+            while len(self._idle_exporters) > self._max_keys:
+                self._idle_exporters.popitem(last=False)
+
+    def idle_count(self) -> int:
+        """Return the number of idle exporters in the pool."""
+        with self._lock:
+            return sum(len(exporters) for exporters in self._idle_exporters.values())
+
+    def run(self, job: ExportJob, profilers: Optional[list] = None) -> dict:
+        """Run an export job and return its result."""
+        with self.exporter(job) as exporter:
+            return exporter.run(
+                channel_inputs=list(job.channels),
+                dest_path=Path(job.dest_path) if job.dest_path else None,
+                oldest=job.oldest,
+                latest=job.latest,
+                page_orientation=job.page_orientation,
+                page_format=job.page_format,
+                max_messages=job.max_messages,
+                write_raw_data=job.write_raw_data,
+                write_stats=job.write_stats,
+                profilers=profilers,
+            )
+
+    def run_batch(
+        self,
+        jobs: Sequence[ExportJob],
+        workers: int = 1,
+        profilers: Optional[list] = None,
+    ) -> Iterator[JobResult]:
+        """Run many jobs at the same time and yield their results as they finish.
+
+        The biggest jobs are started first, so that a batch finishes sooner.
+        A failing job does not stop the other jobs.
+        Profilers can only be used with one worker.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        if profilers and workers > 1:
+            raise ValueError("profilers can only be used with one worker")
+
+        order = sorted(
+            range(len(jobs)),
+            key=lambda index: jobs[index].estimated_size(),
+            reverse=True,
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.run, jobs[index], profilers): index
+                for index in order
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as ex:  # pylint: disable = broad-exception-caught
+                    yield JobResult(index, jobs[index], error=str(ex))
+                else:
+                    yield JobResult(index, jobs[index], result=result)
+
+    @staticmethod
+    def _create_exporter(job: ExportJob):
+        # pylint: disable = import-outside-toplevel
+        from .channel_exporter import SlackChannelExporter
+
+        my_tz = None
+        if job.timezone:
+            import pytz
+
+            try:
+                my_tz = pytz.timezone(job.timezone)
+            except pytz.UnknownTimeZoneError as ex:
+                raise ValueError(f"Unknown timezone: {job.timezone}") from ex
+
+        my_locale = None
+        if job.locale:
+            from babel import Locale, UnknownLocaleError
+
+            try:
+                my_locale = Locale.parse(job.locale, sep="-")
+            except (UnknownLocaleError, ValueError) as ex:
+                raise ValueError(f"Invalid locale: {job.locale}") from ex
+
+        if not job.slack_token:
+            raise ValueError("No slack token provided")
+
+        return SlackChannelExporter(
+            slack_token=job.slack_token,
+            my_tz=my_tz,
+            my_locale=my_locale,
+            add_debug_info=job.add_debug_info,
+        )
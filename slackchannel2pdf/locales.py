@@ -2,17 +2,35 @@
 
 import datetime as dt
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence
 
 import pytz
 from babel import Locale, UnknownLocaleError
-from babel.dates import format_date, format_datetime, format_time
+from babel.dates import (
+    format_date,
+    format_datetime,
+    format_time,
+    get_date_format,
+    get_time_format,
+    tokenize_pattern,
+)
 from tzlocal import get_localzone
 
 from . import settings
 
 logger = logging.getLogger(__name__)
 
+FORMAT_CACHE_SIZE = 4096
+
+
+class TimelineEntry(NamedTuple):
+    """Local datetime of a message and how it relates to the previous message."""
+
+    datetime: dt.datetime
+    is_new_day: bool
+    is_after_gap: bool
+
 
 class LocaleHelper:
     """Helpers for converting date & time according to current locale and timezone"""
@@ -33,6 +51,23 @@ class LocaleHelper:
         self._locale = self._determine_locale(my_locale, author_info)
         self._timezone = self._determine_timezone(my_tz, author_info)
 
+        # patterns are resolved once and formatted strings are cached
+        self._date_full_pattern = get_date_format("full", locale=self._locale)
+        self._time_short_pattern = get_time_format("short", locale=self._locale)
+        self._has_seconds = any(
+            token[0] == "field" and token[1][0] in "sSA"
+            for token in tokenize_pattern(self._time_short_pattern.pattern)
+        )
+        self._format_date_full_cached = lru_cache(maxsize=FORMAT_CACHE_SIZE)(
+            self._format_date_full
+        )
+        self._format_time_cached = lru_cache(maxsize=FORMAT_CACHE_SIZE)(
+            self._format_time
+        )
+        self._format_datetime_cached = lru_cache(maxsize=FORMAT_CACHE_SIZE)(
+            self._format_datetime
+        )
+
     @staticmethod
     def _determine_locale(
         my_locale: Optional[Locale] = None, author_info: Optional[dict] = None
@@ -86,23 +121,151 @@ class LocaleHelper:
 
     def format_date_full_str(self, my_datetime: dt.datetime) -> str:
         """Return all full formatted date."""
-        return format_date(my_datetime, format="full", locale=self.locale)
+        if isinstance(my_datetime, dt.datetime):
+            my_datetime = my_datetime.date()
+        return self._format_date_full_cached(my_datetime)
 
     def format_datetime_str(self, my_datetime: dt.datetime) -> str:
         """Return formatted datetime string for given dt using locale."""
-        return format_datetime(my_datetime, format="short", locale=self.locale)
+        return self._format_datetime_cached(
+            self._truncate_to_minute(my_datetime), my_datetime.tzinfo
+        )
 
     def get_datetime_formatted_str(self, timestamp: float) -> str:
         """Return given timestamp as formatted datetime string using locale."""
         my_datetime = self.get_datetime_from_ts(timestamp)
-        return format_datetime(my_datetime, format="short", locale=self.locale)
+        return self.format_datetime_str(my_datetime)
 
     def get_time_formatted_str(self, timestamp: float) -> str:
         """Return given timestamp as formatted datetime string using locale."""
         my_datetime = self.get_datetime_from_ts(timestamp)
-        return format_time(my_datetime, format="short", locale=self.locale)
+        return self.format_time_str(my_datetime)
+
+    def format_time_str(self, my_datetime: dt.datetime) -> str:
+        """Return formatted time string for given dt using locale."""
+        return self._format_time_cached(
+            self._truncate_to_minute(my_datetime), my_datetime.tzinfo
+        )
+
+    def cache_info(self) -> dict:
+        """Return statistics of the caches for formatted dates and times."""
+        return {
+            "date_full": self._format_date_full_cached.cache_info(),
+            "time": self._format_time_cached.cache_info(),
+            "datetime": self._format_datetime_cached.cache_info(),
+        }
+
+    def _truncate_to_minute(self, my_datetime: dt.datetime) -> dt.datetime:
+        """Return datetime without seconds, unless the locale shows them."""
+        if self._has_seconds:
+            return my_datetime
+        return my_datetime.replace(second=0, microsecond=0)
+
+    def _format_date_full(self, my_date: dt.date) -> str:
+        return format_date(my_date, format=self._date_full_pattern, locale=self.locale)
+
+    def _format_time(self, my_datetime: dt.datetime, _tzinfo) -> str:
+        # tzinfo is part of the cache key only,
+        # since datetimes of the same instant are equal for all timezones
+        return format_time(
+            my_datetime, format=self._time_short_pattern, locale=self.locale
+        )
+
+    def _format_datetime(self, my_datetime: dt.datetime, _tzinfo) -> str:
+        return format_datetime(my_datetime, format="short", locale=self.locale)
 
     def get_datetime_from_ts(self, timestamp: float) -> dt.datetime:
         """Return datetime object of a unix timestamp with local timezone."""
         my_datetime = dt.datetime.fromtimestamp(float(timestamp), pytz.UTC)
         return my_datetime.astimezone(self.timezone)
+
+    def get_datetimes_from_ts(self, timestamps: Iterable) -> List[dt.datetime]:
+        """Return datetime objects of many unix timestamps with local timezone.
+
+        The UTC offset is determined once per local day
+        and reused for all timestamps of that day.
+        """
+        results = []
+        day_start = day_end = None
+        utc_offset = local_tzinfo = None
+        for timestamp in timestamps:
+            utc_datetime = dt.datetime.fromtimestamp(float(timestamp), pytz.UTC)
+            if day_start is not None and day_start <= utc_datetime < day_end:
+                if utc_offset is not None:
+                    my_datetime = (utc_datetime + utc_offset).replace(
+                        tzinfo=local_tzinfo
+                    )
+                else:
+                    my_datetime = utc_datetime.astimezone(self.timezone)
+
+            else:
+                my_datetime = utc_datetime.astimezone(self.timezone)
+                day_start, day_end, utc_offset = self._local_day_bounds(my_datetime)
+                local_tzinfo = my_datetime.tzinfo
+
+            results.append(my_datetime)
+
+        return results
+
+    def _local_day_bounds(self, my_datetime: dt.datetime) -> tuple:
+        """Return start and end of the local day of a datetime in UTC
+        and the UTC offset for that day.
+
+        The offset is None if it changes during that day, e.g. for DST.
+        """
+        utc_offset = my_datetime.utcoffset()
+        midnight = dt.datetime.combine(my_datetime.date(), dt.time(), pytz.UTC)
+        day_start = midnight - utc_offset
+        day_end = day_start + dt.timedelta(days=1)
+        start_offset = day_start.astimezone(self.timezone).utcoffset()
+        end_offset = (
+            (day_end - dt.timedelta(microseconds=1)).astimezone(self.timezone)
+        ).utcoffset()
+        if start_offset != utc_offset or end_offset != utc_offset:
+            utc_offset = None
+
+        return day_start, day_end, utc_offset
+
+    def get_timeline(
+        self,
+        timestamps: Sequence,
+        minutes_until_gap: float,
+        previous_timestamps: Optional[Sequence] = None,
+    ) -> List[TimelineEntry]:
+        """Return local datetimes for messages and flags for day changes and gaps.
+
+        Args:
+        - timestamps: unix timestamps of messages in chronological order
+        - minutes_until_gap: a longer time between two messages is a gap
+        - previous_timestamps: timestamps to compare each message with,
+        default is the message before. None means there is no message before.
+        """
+        if previous_timestamps is None:
+            previous_timestamps = [None] + list(timestamps[:-1])
+
+        known_datetimes = dict(zip(timestamps, self.get_datetimes_from_ts(timestamps)))
+        missing = [
+            timestamp
+            for timestamp in previous_timestamps
+            if timestamp is not None and timestamp not in known_datetimes
+        ]
+        known_datetimes.update(zip(missing, self.get_datetimes_from_ts(missing)))
+
+        timeline = []
+        for timestamp, previous_timestamp in zip(timestamps, previous_timestamps):
+            my_datetime = known_datetimes[timestamp]
+            if previous_timestamp is None:
+                timeline.append(TimelineEntry(my_datetime, True, False))
+                continue
+
+            previous_datetime = known_datetimes[previous_timestamp]
+            minutes_delta = (my_datetime - previous_datetime) / dt.timedelta(minutes=1)
+            timeline.append(
+                TimelineEntry(
+                    my_datetime,
+                    my_datetime.date() != previous_datetime.date(),
+                    minutes_delta > minutes_until_gap,
+                )
+            )
+
+        return timeline
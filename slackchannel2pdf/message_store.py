@@ -0,0 +1,248 @@
+"""Storage for the messages of a channel with a memory budget."""
+
+import json
+import logging
+import sqlite3
+import tempfile
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 1000
+
+
+class MessageStore:
+    """Messages and threads of a channel.
+
+    They are kept in memory as long as their estimated size is within
+    the memory budget. Once the budget is exceeded, all messages are moved
+    to a temporary SQLite database on disk and read back from there.
+    The size of messages is estimated by their size as JSON.
+
+    Messages can be accessed through ``messages`` and ``threads``,
+    which are a list and a dict while in memory and read-only views
+    in chronological order once spilled.
+    """
+
+    def __init__(self, memory_budget: int = 0) -> None:
+        """
+        Args:
+        - memory_budget: max estimated size of messages in memory in bytes,
+        0 means no limit
+        """
+        if memory_budget < 0:
+            raise ValueError("memory_budget can not be negative")
+
+        self._memory_budget = memory_budget
+        self._memory_used = 0
+        self._messages = []
+        self._threads = {}
+        self._temp_dir = None
+        self._connection = None
+
+    def __enter__(self) -> "MessageStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def is_spilled(self) -> bool:
+        """Return True if messages are stored on disk."""
+        return self._connection is not None
+
+    @property
+    def messages(self) -> Sequence:
+        """Return all messages of the channel."""
+        if self.is_spilled:
+            return _SpilledMessages(self._connection)
+        return self._messages
+
+    @property
+    def threads(self) -> Mapping:
+        """Return messages of all threads with the thread's timestamp as key."""
+        if self.is_spilled:
+            return _SpilledThreads(self._connection)
+        return self._threads
+
+    def add_messages(self, messages: List[dict]) -> None:
+        """Add messages of the channel."""
+        if self.is_spilled:
+            self._insert_messages(messages)
+        else:
+            self._messages += messages
+            self._add_to_memory_used(messages)
+
+    def add_thread(self, thread_ts: str, messages: List[dict]) -> None:
+        """Add messages of a thread."""
+        if self.is_spilled:
+            self._insert_thread(thread_ts, messages)
+        else:
+            self._threads[thread_ts] = messages
+            self._add_to_memory_used(messages)
+
+    def apply(self, function: Callable[[dict], None]) -> None:
+        """Apply a function, which modifies a message in place, to all messages
+        incl. threads.
+        """
+        if not self.is_spilled:
+            for msg in self._messages:
+                function(msg)
+            for thread_messages in self._threads.values():
+                for msg in thread_messages:
+                    function(msg)
+            return
+
+        # messages are updated in batches, so that they never are all in memory
+        for table in ["messages", "thread_messages"]:
+            last_rowid = 0
+            while True:
+                rows = self._connection.execute(
+                    f"SELECT rowid, data FROM {table} WHERE rowid > ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (last_rowid, _BATCH_SIZE),
+                ).fetchall()
+                if not rows:
+                    break
+
+                updates = []
+                for rowid, data in rows:
+                    msg = json.loads(data)
+                    function(msg)
+                    updates.append((json.dumps(msg), rowid))
+                with self._connection:
+                    self._connection.executemany(
+                        f"UPDATE {table} SET data = ? WHERE rowid = ?", updates
+                    )
+                last_rowid = rows[-1][0]
+
+    def close(self) -> None:
+        """Remove all messages, incl. the temporary database if any."""
+        self._messages = []
+        self._threads = {}
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def _add_to_memory_used(self, messages: List[dict]) -> None:
+        if not self._memory_budget:
+            return
+
+        self._memory_used += sum(len(json.dumps(msg)) for msg in messages)
+        if self._memory_used > self._memory_budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Move all messages from memory to a temporary database."""
+        # pylint: disable = consider-using-with
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="slackchannel2pdf_")
+        path = Path(self._temp_dir.name) / "messages.sqlite"
+        logger.info("Messages exceed memory budget. Storing them in: %s", path)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE messages (ts REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX messages_ts ON messages (ts)")
+            self._connection.execute(
+                "CREATE TABLE thread_messages ("
+                "thread_ts TEXT NOT NULL, ts REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX thread_messages_thread_ts "
+                "ON thread_messages (thread_ts, ts)"
+            )
+        self._insert_messages(self._messages)
+        for thread_ts, thread_messages in self._threads.items():
+            self._insert_thread(thread_ts, thread_messages)
+        self._messages = []
+        self._threads = {}
+        self._memory_used = 0
+
+    def _insert_messages(self, messages: List[dict]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO messages (ts, data) VALUES (?, ?)",
+                ((float(msg["ts"]), json.dumps(msg)) for msg in messages),
+            )
+
+    def _insert_thread(self, thread_ts: str, messages: List[dict]) -> None:
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM thread_messages WHERE thread_ts = ?", (thread_ts,)
+            )
+            self._connection.executemany(
+                "INSERT INTO thread_messages (thread_ts, ts, data) VALUES (?, ?, ?)",
+                ((thread_ts, float(msg["ts"]), json.dumps(msg)) for msg in messages),
+            )
+
+
+class _SpilledMessages(Sequence):
+    """Read-only view of spilled messages in chronological order."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def __iter__(self) -> Iterator[dict]:
+        rows = self._connection.execute("SELECT data FROM messages ORDER BY ts, rowid")
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        row = None
+        if index >= 0:
+            row = self._connection.execute(
+                "SELECT data FROM messages ORDER BY ts, rowid LIMIT 1 OFFSET ?",
+                (index,),
+            ).fetchone()
+        if row is None:
+            raise IndexError("message index out of range")
+        return json.loads(row[0])
+
+
+class _SpilledThreads(Mapping):
+    """Read-only view of spilled threads, each in chronological order."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(DISTINCT thread_ts) FROM thread_messages"
+        ).fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._connection.execute(
+            "SELECT DISTINCT thread_ts FROM thread_messages ORDER BY thread_ts"
+        )
+        for (thread_ts,) in rows:
+            yield thread_ts
+
+    def __getitem__(self, thread_ts: str) -> List[dict]:
+        messages = self._get(thread_ts)
+        if messages is None:
+            raise KeyError(thread_ts)
+        return messages
+
+    def get(self, key, default=None):
+        messages = self._get(key)
+        return default if messages is None else messages
+
+    def _get(self, thread_ts: str) -> Optional[List[dict]]:
+        rows = self._connection.execute(
+            "SELECT data FROM thread_messages WHERE thread_ts = ? ORDER BY ts, rowid",
+            (thread_ts,),
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows] if rows else None
@@ -1,10 +1,24 @@
 """Slack message transformers for slackchannel2pdf."""
 
 import re
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from .helpers import transform_encoding
 from .locales import LocaleHelper
+from .rich_text import Marker, RichText, TextRun, from_html, to_html
 from .slack_service import SlackService
+from .stats import RunStats
+
+# kinds of tokens in a line of mrkdwn
+_TOKEN_TEXT = "text"
+_TOKEN_ENTITY = "entity"
+_TOKEN_MARKER = "marker"
+
+_FORMATTING_CHARS = "*_"
+_FORMATTING_MARKERS = frozenset(_FORMATTING_CHARS)
+
+TRANSFORM_CACHE_SIZE = 4096
 
 
 class MessageTransformer:
@@ -19,6 +33,11 @@ class MessageTransformer:
         self._slack_service = slack_service
         self._locale_helper = locale_helper
         self._font_family_mono_default = font_family_mono_default
+        # stats of transformations, can be replaced for each export
+        self.stats = RunStats()
+        self._transform_cached = lru_cache(maxsize=TRANSFORM_CACHE_SIZE)(
+            self._transform
+        )
 
     def transform_text(self, text: str, use_mrkdwn: bool = False) -> str:
         """Transform mrkdwn text into HTML text for PDF output.
@@ -34,69 +53,172 @@ class MessageTransformer:
         Returns:
             transformed text string with HTML formatting
         """
+        return self._transform_with_stats(text, use_mrkdwn)[0]
 
-        # pass 1 - adjust encoding to latin-1 and transform HTML entities
-        result = transform_encoding(text)
+    def transform_rich_text(self, text: str, use_mrkdwn: bool = False) -> RichText:
+        """Transform mrkdwn text into rich text for PDF output.
 
-        # if requested try to transform mrkdwn in text
-        if use_mrkdwn:
-            # pass 2 - transform mrkdwns with brackets
-            result = re.sub(r"<(.*?)>", self._replace_mrkdwn_in_text, result)
-
-            # pass 3 - transform formatting mrkdwns
-
-            # bold
-            result = re.sub(r"\*(.+)\*", r"<b>\1</b>", result)
-            # italic
-            result = re.sub(r"\b_(.+)_\b", r"<i>\1</i>", result)
-            # code
-            result = re.sub(
-                r"`(.*)`",
-                r'<s fontfamily="' + self._font_family_mono_default + r'">\1</s>',
-                result,
+        Same as transform_text(), but returns structured rich text
+        instead of HTML.
+        """
+        return self._transform_with_stats(text, use_mrkdwn)[1]
+
+    def cache_info(self):
+        """Return statistics of the cache for transformed texts."""
+        return self._transform_cached.cache_info()
+
+    def _transform_with_stats(
+        self, text: str, use_mrkdwn: bool
+    ) -> Tuple[str, RichText]:
+        """Transform text through the cache and measure the time incl. cache hits."""
+        with self.stats.phase("transform"):
+            return self._transform_cached(
+                text, use_mrkdwn, self._slack_service.directories_version()
             )
-            # indents
-            result = re.sub(
-                r"^>(.+)", r"<blockquote>\1</blockquote>", result, 0, re.MULTILINE
+
+    def _transform(
+        self, text: str, use_mrkdwn: bool, _directories_version: int
+    ) -> Tuple[str, RichText]:
+        """Transform text into HTML and rich text.
+
+        Results are cached, with the version of the Slack directories
+        as part of the key, so that changed names are picked up.
+        """
+        # adjust encoding to latin-1 and transform HTML entities
+        result = transform_encoding(text)
+        if use_mrkdwn:
+            rich_text = self._parse_mrkdwn(result)
+            return to_html(rich_text), rich_text
+
+        return result, from_html(result)
+
+    def _parse_mrkdwn(self, text: str) -> RichText:
+        """Parse mrkdwn into rich text in a single pass over the text."""
+        items = []
+        for line_no, line in enumerate(text.split("\n")):
+            if line_no > 0:
+                items.append(Marker.LINE_BREAK)
+
+            if len(line) > 1 and line[0] == ">":
+                items.append(Marker.BLOCKQUOTE_START)
+                self._parse_mrkdwn_line(line[1:], items)
+                items.append(Marker.BLOCKQUOTE_END)
+            else:
+                self._parse_mrkdwn_line(line, items)
+
+        return tuple(items)
+
+    def _parse_mrkdwn_line(self, line: str, items: list) -> None:
+        """Parse one line of mrkdwn and append the resulting runs to items."""
+        tokens = self._tokenize_mrkdwn_line(line)
+        paired = _pair_formatting_markers(tokens)
+        formats = {"*": False, "_": False}
+        for index, token in enumerate(tokens):
+            kind = token[0]
+            if kind == _TOKEN_MARKER:
+                if index in paired:
+                    formats[token[1]] = not formats[token[1]]
+                    continue
+                run = TextRun(token[1])
+            elif kind == _TOKEN_ENTITY:
+                run = token[1]
+            elif token[1]:
+                run = TextRun(token[1])
+            else:
+                continue
+
+            run = run._replace(
+                bold=run.bold or formats["*"],
+                italic=run.italic or formats["_"],
+                font_family=self._font_family_mono_default if token[-1] else None,
             )
-            result = result.replace("</blockquote><br>", "</blockquote>")
-            # EOF
-            result = result.replace("\n", "<br>")
+            # merge with previous run if the formatting is the same
+            if items and isinstance(items[-1], TextRun):
+                previous = items[-1]
+                if previous[1:] == run[1:]:
+                    items[-1] = previous._replace(text=previous.text + run.text)
+                    continue
 
-        return result
+            items.append(run)
 
-    def _replace_mrkdwn_in_text(self, match_obj: re.Match) -> str:
-        """inline function returns replacement string for re.sub
+    def _tokenize_mrkdwn_line(self, line: str, is_code: bool = False) -> list:
+        """Split one line of mrkdwn into tokens.
 
-        This function does the actual resolving of IDs and mrkdwn key words
+        Tokens are text, resolved entities like <@U12345678>
+        and candidates for formatting markers.
+        Each token is a tuple with its kind first and the code flag last.
         """
-        match = match_obj.group(1)
+        tokens = []
+        length = len(line)
+        text_start = 0
+        position = 0
+        next_closing_bracket = -1
+        next_backtick = -1
+        while position < length:
+            char = line[position]
+            if char == "<":
+                if next_closing_bracket < position:
+                    next_closing_bracket = line.find(">", position + 1)
+                    if next_closing_bracket == -1:
+                        next_closing_bracket = length
+
+                if position + 1 < next_closing_bracket < length:
+                    tokens.append((_TOKEN_TEXT, line[text_start:position], is_code))
+                    entity = line[position + 1 : next_closing_bracket]
+                    run = self._resolve_entity(entity)
+                    tokens.append((_TOKEN_ENTITY, run, is_code))
+                    position = text_start = next_closing_bracket + 1
+                    continue
+
+            elif char == "`" and not is_code:
+                if next_backtick <= position:
+                    next_backtick = line.find("`", position + 1)
+                    if next_backtick == -1:
+                        next_backtick = length
+
+                if next_backtick < length:
+                    tokens.append((_TOKEN_TEXT, line[text_start:position], is_code))
+                    tokens += self._tokenize_mrkdwn_line(
+                        line[position + 1 : next_backtick], is_code=True
+                    )
+                    position = text_start = next_backtick + 1
+                    continue
+
+            elif char in _FORMATTING_MARKERS and not is_code:
+                marker = _marker_token(line, position)
+                if marker:
+                    tokens.append((_TOKEN_TEXT, line[text_start:position], is_code))
+                    tokens.append(marker)
+                    text_start = position + 1
+
+            position += 1
+
+        tokens.append((_TOKEN_TEXT, line[text_start:], is_code))
+        return tokens
+
+    def _resolve_entity(self, entity: str) -> TextRun:
+        """Resolve a mrkdwn entity like <@U12345678> into a text run.
 
-        id_chars = match[0:2]
-        id_raw = match[1 : len(match)]
-        parts = id_raw.split("|", 1)
-        obj_id = parts[0]
+        Will resolve channel and user IDs to their names if possible
+        """
+        id_chars = entity[0:2]
+        obj_id = entity[1:].split("|", 1)[0]
 
-        make_bold = True
         if id_chars in {"@U", "@W"}:
-            result = self._process_user_id(obj_id)
-
-        elif id_chars == "#C":
-            result = self._process_channel_id(obj_id)
+            return TextRun(self._process_user_id(obj_id), bold=True)
 
-        elif match[0:9] == "!subteam^":
-            result = self._process_user_group_id(match)
+        if id_chars == "#C":
+            return TextRun(self._process_channel_id(obj_id), bold=True)
 
-        elif match[0:1] == "!":
-            make_bold, result = self._process_special_mention(match, obj_id)
+        if entity[0:9] == "!subteam^":
+            return TextRun(self._process_user_group_id(entity), bold=True)
 
-        else:
-            make_bold, result = self._process_url(match)
+        if entity[0:1] == "!":
+            make_bold, result = self._process_special_mention(entity, obj_id)
+            return TextRun(result, bold=make_bold)
 
-        if make_bold:
-            result = f"<b>{result}</b>"
-
-        return result
+        url, text = self._process_url(entity)
+        return TextRun(text, href=url)
 
     def _process_user_id(self, obj_id):
         if obj_id in self._slack_service.user_names():
@@ -155,6 +277,84 @@ class MessageTransformer:
             url = match
             text = match
 
-        make_bold = False
-        result = f'<a href="{url}">{text}</a>'
-        return make_bold, result
+        return url, text
+
+
+def _is_word_char(char: str) -> bool:
+    # formatting characters like * _ ~ are punctuation, e.g. in _*both*_
+    return char.isalnum()
+
+
+def _marker_token(line: str, position: int) -> Optional[tuple]:
+    """Return a marker token for the formatting char at position outside of code.
+
+    Returns None if the char can neither open nor close formatting.
+    """
+    previous_char = line[position - 1] if position > 0 else " "
+    next_char = line[position + 1] if position + 1 < len(line) else " "
+    can_open = not next_char.isspace() and not _is_word_char(previous_char)
+    can_close = not previous_char.isspace() and not _is_word_char(next_char)
+    if can_open or can_close:
+        return (_TOKEN_MARKER, line[position], can_open, can_close, False)
+    return None
+
+
+def _pair_formatting_markers(tokens: list) -> set:
+    """Pair opening and closing formatting markers and return their indexes.
+
+    Markers are only paired with text between them, so that empty
+    and unmatched markers stay literal characters, e.g. in ** or a ** b.
+    Formatting of the same kind is not nested and the outer markers
+    are paired, e.g. **a** is a bold *a*.
+    Markers between a pair which are not paired themselves are ignored,
+    e.g. the underscore in *a_b*.
+    """
+    paired = set()
+    # open markers as index and a flag telling if text follows them,
+    # there is at most one open marker for each formatting character
+    stack = []
+    for index, token in enumerate(tokens):
+        kind = token[0]
+        if kind != _TOKEN_MARKER:
+            if kind == _TOKEN_ENTITY or token[1].strip(_FORMATTING_CHARS):
+                for opening in stack:
+                    opening[1] = True
+            continue
+
+        _, char, can_open, can_close, _ = token
+        opening_position = _find_opening_marker(tokens, stack, char)
+        if (
+            can_close
+            and opening_position is not None
+            and stack[opening_position][1]
+            and not _is_followed_by_closing_marker(tokens, index)
+        ):
+            paired.add(stack[opening_position][0])
+            paired.add(index)
+            del stack[opening_position:]
+
+        elif can_open and opening_position is None:
+            stack.append([index, False])
+
+    return paired
+
+
+def _find_opening_marker(tokens: list, stack: list, char: str) -> Optional[int]:
+    """Return the position of the open marker for char in the stack if any."""
+    for position, (index, _) in enumerate(stack):
+        if tokens[index][1] == char:
+            return position
+    return None
+
+
+def _is_followed_by_closing_marker(tokens: list, index: int) -> bool:
+    """Return True if the marker at index is directly followed by
+    another closing marker of the same kind.
+    """
+    return (
+        index + 2 < len(tokens)
+        and not tokens[index + 1][1]
+        and tokens[index + 2][0] == _TOKEN_MARKER
+        and tokens[index + 2][1] == tokens[index][1]
+        and tokens[index + 2][3]
+    )
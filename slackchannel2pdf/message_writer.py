@@ -0,0 +1,565 @@
+"""Writes Slack messages with their threads to a PDF document."""
+
+import datetime as dt
+import logging
+import re
+from typing import List, Optional
+
+from . import settings
+from .fpdf_extension import MyFPDF
+from .locales import LocaleHelper
+from .message_transformer import MessageTransformer
+from .rich_text import from_html
+from .slack_service import SlackService
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """A class for writing Slack messages to a PDF document."""
+
+    def __init__(
+        self,
+        slack_service: SlackService,
+        locale_helper: LocaleHelper,
+        transformer: MessageTransformer,
+        add_debug_info: bool = False,
+    ) -> None:
+        self._slack_service = slack_service
+        self._locale_helper = locale_helper
+        self._transformer = transformer
+        self._add_debug_info = add_debug_info
+        # names of bots without a user name, can be replaced for each export
+        self.bot_names = {}
+
+    def write_messages(
+        self, document: MyFPDF, messages: List[dict], threads: dict
+    ) -> None:
+        """writes messages with their threads to the PDF document"""
+        last_user_id = None
+        last_page = None
+
+        if len(messages) > 0:
+            # messages from a spilled message store are already in order
+            if isinstance(messages, list):
+                messages = sorted(messages, key=lambda k: k["ts"])
+            timestamps, previous_timestamps = self._timeline_timestamps(
+                messages, threads
+            )
+            timeline = self._locale_helper.get_timeline(
+                timestamps, settings.MINUTES_UNTIL_USERNAME_REPEATS, previous_timestamps
+            )
+            for msg, entry in zip(messages, timeline):
+                # repeat user name for if last post from same user is older
+                if entry.is_after_gap:
+                    last_user_id = None
+
+                # write day separator if needed
+                if entry.is_new_day:
+                    self._write_day_separator(document, entry.datetime)
+                    last_user_id = None  # repeat user name for new day
+
+                # repeat user name for new page
+                if last_page != document.page_no():
+                    last_user_id = None
+                    last_page = document.page_no()
+
+                last_user_id = self._parse_message_and_write_to_pdf(
+                    document,
+                    msg,
+                    settings.MARGIN_LEFT,
+                    last_user_id,
+                    msg_dt=entry.datetime,
+                )
+                if "thread_ts" in msg and msg["thread_ts"] == msg["ts"]:
+                    self._write_messages_threads(document, threads, msg)
+
+        else:
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
+            )
+            document.ln()
+            document.write(settings.LINE_HEIGHT_DEFAULT, "This channel is empty", "I")
+
+    def _parse_message_and_write_to_pdf(
+        self,
+        document: MyFPDF,
+        msg: dict,
+        margin_left: int,
+        last_user_id: Optional[str],
+        full_date: bool = False,
+        msg_dt: Optional[dt.datetime] = None,
+    ) -> Optional[str]:
+        """parse a message and write it to the PDF"""
+
+        user_id, is_bot, user_name = self._identify_user(msg)
+
+        if user_name is not None:
+            # start again on the left border
+            document.set_left_margin(margin_left)
+            document.set_x(margin_left)
+
+            if last_user_id != user_id:
+                # write user name and date only when user switches
+                self._write_user_name_and_date(
+                    document, msg, full_date, is_bot, user_name, msg_dt
+                )
+
+            if "text" in msg and len(msg["text"]) > 0:
+                self._write_text(document, msg)
+
+            if "reactions" in msg:
+                self._write_reactions(document, msg, margin_left)
+
+            if "files" in msg:
+                self._write_files(document, msg, margin_left)
+
+            if "attachments" in msg:
+                self._write_attachments(document, msg, margin_left)
+
+            if "blocks" in msg:
+                self._write_blocks(document, msg, margin_left)
+
+                document.ln(settings.LINE_HEIGHT_SMALL)
+
+        else:
+            user_id = None
+            logger.warning("Can not process message with ts %s", msg["ts"])
+            document.write(
+                settings.LINE_HEIGHT_DEFAULT, "[Can not process this message]"
+            )
+            document.ln()
+
+        return user_id
+
+    def _write_user_name_and_date(
+        self, document, msg, full_date, is_bot, user_name, msg_dt=None
+    ):
+        document.ln(settings.LINE_HEIGHT_SMALL)
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_NORMAL,
+            style="B",
+        )
+        document.write(settings.LINE_HEIGHT_DEFAULT, user_name + " ")
+        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_SMALL)
+        if is_bot:
+            document.set_text_color(100, 100, 100)
+            document.write(settings.LINE_HEIGHT_DEFAULT, "App ")
+            document.set_text_color(0)
+
+        if msg_dt is None:
+            msg_dt = self._locale_helper.get_datetime_from_ts(msg["ts"])
+        datetime_str = (
+            self._locale_helper.format_datetime_str(msg_dt)
+            if full_date
+            else self._locale_helper.format_time_str(msg_dt)
+        )
+        document.write(settings.LINE_HEIGHT_DEFAULT, datetime_str)
+        document.ln(settings.LINE_HEIGHT_DEFAULT)
+
+    def _write_text(self, document, msg):
+        text = msg["text"]
+        if self._add_debug_info:
+            debug_text = (
+                f' [<s fontfamily="'
+                f'{settings.FONT_FAMILY_MONO_DEFAULT}" size="8">'
+                f'{msg["ts"]}]</s>'
+            )
+        else:
+            debug_text = ""
+
+        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL)
+        rich_text = self._transformer.transform_rich_text(
+            text, msg["mrkdwn"] if "mrkdwn" in msg else True
+        )
+        document.write_rich_text(
+            settings.LINE_HEIGHT_DEFAULT, rich_text + from_html(debug_text)
+        )
+        document.ln(settings.LINE_HEIGHT_DEFAULT)
+
+    def _write_reactions(self, document, msg, margin_left):
+        for reaction in msg["reactions"]:
+            document.set_left_margin(margin_left + settings.TAB_WIDTH)
+            document.set_x(margin_left + settings.TAB_WIDTH)
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
+            )
+            document.write_html(
+                settings.LINE_HEIGHT_DEFAULT,
+                ("[" + reaction["name"] + "] (" + str(reaction["count"]) + "):"),
+            )
+            document.ln()
+
+            # convert user IDs to names
+            users_with_names = []
+            for user in reaction["users"]:
+                if user in self._slack_service.user_names():
+                    user_name = self._slack_service.user_names()[user]
+                else:
+                    user_name = "unknown_user_" + user
+
+                users_with_names.append("<b>" + user_name + "</b>")
+
+            document.set_left_margin(
+                margin_left + settings.TAB_WIDTH + settings.TAB_WIDTH
+            )
+            document.set_x(margin_left + settings.TAB_WIDTH + settings.TAB_WIDTH)
+            document.write_html(
+                settings.LINE_HEIGHT_DEFAULT, ", ".join(users_with_names)
+            )
+            document.ln()
+
+        document.ln(settings.LINE_HEIGHT_SMALL)
+
+    def _write_files(self, document, msg, margin_left):
+        document.set_left_margin(margin_left + settings.TAB_WIDTH)
+        document.set_x(margin_left + settings.TAB_WIDTH)
+
+        for file in msg["files"]:
+            file_type = file.get("pretty_type", "")
+            file_name = file.get("name", "")
+            text = "[" + file_type + " file: <b>" + file_name + "</b>" + "]"
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL
+            )
+            document.write_html(settings.LINE_HEIGHT_DEFAULT, text)
+            document.ln()
+
+            if "preview" in file:
+                text = file["preview"]
+                # remove document tag if any
+                match = re.match(r"<document>(.+)<\/document>", text)
+                if match is not None:
+                    text = match.group(1)
+                    # replace <p> with <br>
+                text = re.sub(r"<p>(.+)<\/p>", r"\1<br>", text)
+                # replace \r\n with <br>
+                text = re.sub(r"\n|\r\n", r"<br>", text)
+                # output
+                document.set_font(
+                    settings.FONT_FAMILY_DEFAULT,
+                    size=settings.FONT_SIZE_NORMAL,
+                )
+                document.write_html(settings.LINE_HEIGHT_DEFAULT, text)
+                document.ln()
+
+    def _write_attachments(self, document, msg, margin_left):
+        document.set_left_margin(margin_left + settings.TAB_WIDTH)
+        document.set_x(margin_left + settings.TAB_WIDTH)
+
+        # draw normal text attachments
+        for attach in msg["attachments"]:
+            if "mrkdwn_in" in attach:
+                mrkdwn_in = attach["mrkdwn_in"]
+            else:
+                mrkdwn_in = []
+
+            if "pretext" in attach:
+                self._write_attachments_pretext(
+                    document, margin_left, attach, mrkdwn_in
+                )
+
+            document.ln(settings.LINE_HEIGHT_SMALL)
+
+            if "author_name" in attach:
+                self._write_attachments_author_name(document, attach)
+
+            if "title" in attach:
+                self._write_attachments_title(document, attach, mrkdwn_in)
+
+            if "text" in attach:
+                self._write_attachments_text(document, attach, mrkdwn_in)
+
+            if "fields" in attach:
+                self._write_attachments_fields(document, attach, mrkdwn_in)
+
+            if "footer" in attach:
+                self._write_attachments_footer(document, attach)
+
+            if "image_url" in attach:
+                self._write_attachments_image_url(document, attach)
+
+                # action attachments
+            if "actions" in attach:
+                self._write_attachments_actions(document, attach)
+
+        document.ln(settings.LINE_HEIGHT_SMALL)
+
+    def _write_attachments_pretext(self, document, margin_left, attach, mrkdwn_in):
+        document.set_left_margin(margin_left)
+        document.set_x(margin_left)
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_NORMAL,
+        )
+        document.write_rich_text(
+            settings.LINE_HEIGHT_DEFAULT,
+            self._transformer.transform_rich_text(
+                attach["pretext"], "pretext" in mrkdwn_in
+            ),
+        )
+        document.set_left_margin(margin_left + settings.TAB_WIDTH)
+        document.set_x(margin_left + settings.TAB_WIDTH)
+        document.ln()
+
+    def _write_attachments_author_name(self, document, attach):
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_LARGE,
+            style="B",
+        )
+        document.write(
+            settings.LINE_HEIGHT_DEFAULT,
+            self._transformer.transform_text(attach["author_name"]),
+        )
+        document.ln()
+
+    def _write_attachments_title(self, document, attach, mrkdwn_in):
+        title_text = self._transformer.transform_text(
+            attach["title"], "title" in mrkdwn_in
+        )
+
+        # add link to title if defined
+        if "title_link" in attach:
+            title_text = '<a href="' + attach["title_link"] + '">' + title_text + "</a>"
+
+            # add bold formatting to title
+        title_text = "<b>" + title_text + "</b>"
+
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_NORMAL,
+        )
+        document.write_html(settings.LINE_HEIGHT_DEFAULT, title_text)
+        document.ln()
+
+    def _write_attachments_text(self, document, attach, mrkdwn_in):
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_NORMAL,
+        )
+        document.write_rich_text(
+            settings.LINE_HEIGHT_DEFAULT,
+            self._transformer.transform_rich_text(attach["text"], "text" in mrkdwn_in),
+        )
+        document.ln()
+
+    def _write_attachments_fields(self, document, attach, mrkdwn_in):
+        for field in attach["fields"]:
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT,
+                size=settings.FONT_SIZE_NORMAL,
+                style="B",
+            )
+            document.write(
+                settings.LINE_HEIGHT_DEFAULT,
+                self._transformer.transform_text(field["title"]),
+            )
+            document.ln()
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT,
+                size=settings.FONT_SIZE_NORMAL,
+            )
+            document.write_rich_text(
+                settings.LINE_HEIGHT_DEFAULT,
+                self._transformer.transform_rich_text(
+                    field["value"], "fields" in mrkdwn_in
+                ),
+            )
+            document.ln()
+
+    def _write_attachments_footer(self, document, attach):
+        if "ts" in attach:
+            text = (
+                self._transformer.transform_text(attach["footer"])
+                + "|"
+                + self._locale_helper.get_datetime_formatted_str(attach["ts"])
+            )
+        else:
+            text = self._transformer.transform_text(attach["footer"])
+
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_SMALL,
+        )
+        document.write(settings.LINE_HEIGHT_DEFAULT, text)
+        document.ln()
+
+    def _write_attachments_image_url(self, document, attach):
+        image_url_html = '<a href="' + attach["image_url"] + '">[Image]</a>'
+        document.set_font(
+            settings.FONT_FAMILY_DEFAULT,
+            size=settings.FONT_SIZE_NORMAL,
+        )
+        document.write_html(settings.LINE_HEIGHT_DEFAULT, image_url_html)
+        document.ln()
+
+    def _write_attachments_actions(self, document, attach):
+        for action in attach["actions"]:
+            document.set_font(
+                settings.FONT_FAMILY_DEFAULT,
+                size=settings.FONT_SIZE_SMALL,
+            )
+            document.write_html(
+                settings.LINE_HEIGHT_DEFAULT,
+                ("[" + self._transformer.transform_text(action["text"]) + "] "),
+            )
+
+        document.ln()
+
+    def _write_blocks(self, document, msg, margin_left):
+        document.set_left_margin(margin_left + settings.TAB_WIDTH)
+        document.set_x(margin_left + settings.TAB_WIDTH)
+
+        for layout_block in msg["blocks"]:
+            block_type = layout_block["type"]
+            document.ln(settings.LINE_HEIGHT_SMALL)
+
+            # section layout blocks
+            if block_type == "section":
+                document.set_font(
+                    settings.FONT_FAMILY_DEFAULT,
+                    size=settings.FONT_SIZE_NORMAL,
+                )
+                document.write_rich_text(
+                    settings.LINE_HEIGHT_DEFAULT,
+                    self._transformer.transform_rich_text(
+                        layout_block["text"]["text"],
+                        layout_block["text"]["type"] == "mrkdwn",
+                    ),
+                )
+                document.ln()
+
+                if "fields" in layout_block:
+                    for field in layout_block["fields"]:
+                        document.set_font(
+                            settings.FONT_FAMILY_DEFAULT,
+                            size=settings.FONT_SIZE_NORMAL,
+                        )
+                        document.write_rich_text(
+                            settings.LINE_HEIGHT_DEFAULT,
+                            self._transformer.transform_rich_text(
+                                field["text"], field["type"] == "mrkdwn"
+                            ),
+                        )
+                        document.ln()
+
+    def _identify_user(self, msg):
+        if "user" in msg:
+            user_id = msg["user"]
+            is_bot = False
+            if user_id in self._slack_service.user_names():
+                user_name = self._slack_service.user_names()[user_id]
+            else:
+                user_name = f"unknown_user_{user_id}"
+            return user_id, is_bot, user_name
+
+        if "bot_id" in msg:
+            user_id = msg["bot_id"]
+            is_bot = True
+            if "username" in msg:
+                user_name = msg["username"]
+            elif user_id in self.bot_names:
+                user_name = self.bot_names[user_id]
+            else:
+                user_name = f"unknown_bot_{user_id}"
+            return user_id, is_bot, user_name
+
+        if "subtype" in msg and msg["subtype"] == "file_comment":
+            is_bot = False
+            if "user" in msg["comment"]:
+                user_id = msg["comment"]["user"]
+                if user_id in self._slack_service.user_names():
+                    user_name = self._slack_service.user_names()[user_id]
+                else:
+                    user_name = f"unknown_user_{user_id}"
+            else:
+                user_id = None
+                user_name = None
+            return user_id, is_bot, user_name
+
+        return None, False, None
+
+    @staticmethod
+    def _thread_replies(threads: dict, msg: dict) -> List[dict]:
+        """returns the replies to a message in chronological order"""
+        if "thread_ts" not in msg or msg["thread_ts"] != msg["ts"]:
+            return []
+
+        thread_messages = threads.get(msg["thread_ts"], [])
+        return [
+            thread_msg
+            for thread_msg in sorted(thread_messages, key=lambda k: k["ts"])
+            if thread_msg["ts"] != thread_msg["thread_ts"]
+        ]
+
+    def _timeline_timestamps(self, messages: List[dict], threads: dict) -> tuple:
+        """returns the timestamps of messages and the ones they are compared with
+
+        A message is compared with the previous message or the last reply
+        in its thread for day and gap. Both are collected in one pass,
+        since iterating a spilled message store reads all messages again.
+        """
+        timestamps = []
+        previous_timestamps = []
+        last_ts = None
+        for msg in messages:
+            timestamps.append(msg["ts"])
+            previous_timestamps.append(last_ts)
+            replies = self._thread_replies(threads, msg)
+            last_ts = replies[-1]["ts"] if replies else msg["ts"]
+
+        return timestamps, previous_timestamps
+
+    def _write_day_separator(self, document, msg_dt):
+        document.ln(settings.LINE_HEIGHT_SMALL)
+        document.ln(settings.LINE_HEIGHT_SMALL)
+        document.set_font(settings.FONT_FAMILY_DEFAULT, size=settings.FONT_SIZE_NORMAL)
+
+        # draw divider line for next day
+        page_width = document.fw - 2 * settings.MARGIN_LEFT
+        x1 = settings.MARGIN_LEFT
+        x2 = x1 + page_width
+        y1 = document.get_y() + 3
+        document.line(x1, y1, x2, y1)
+
+        # stamp date on divider
+        date_text = self._locale_helper.format_date_full_str(msg_dt)
+        text_width = document.get_string_width(date_text)
+        x3 = (x2 - x1) / 2 + x1
+        x4 = x3 - (text_width / 2)
+        border_x = 3
+        document.set_fill_color(255, 255, 255)
+        document.set_x(x4 - border_x)
+        document.cell(
+            text_width + 2 * border_x,
+            settings.LINE_HEIGHT_DEFAULT,
+            date_text,
+            0,
+            0,
+            "C",
+            True,
+        )
+        document.ln()
+
+    def _write_messages_threads(self, document, threads, msg):
+        replies = self._thread_replies(threads, msg)
+        if replies:
+            timeline = self._locale_helper.get_timeline(
+                [thread_msg["ts"] for thread_msg in replies],
+                settings.MINUTES_UNTIL_USERNAME_REPEATS,
+            )
+            last_user_id = None
+            for thread_msg, entry in zip(replies, timeline):
+                # repeat user name for if last post from same user is older
+                if entry.is_after_gap:
+                    last_user_id = None
+                last_user_id = self._parse_message_and_write_to_pdf(
+                    document,
+                    thread_msg,
+                    settings.MARGIN_LEFT + settings.TAB_WIDTH,
+                    last_user_id,
+                    full_date=True,
+                    msg_dt=entry.datetime,
+                )
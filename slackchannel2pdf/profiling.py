@@ -0,0 +1,141 @@
+"""Profilers, which can be hooked into export runs.
+
+Profilers are called when the export of a channel starts and finishes
+and around each phase of an export, e.g. layout or compression.
+Custom profilers can be created by subclassing Profiler.
+"""
+
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+
+# only one cProfile profiler can be active at a time since Python 3.12
+_CPROFILE_LOCK = threading.Lock()
+
+
+class Profiler:
+    """Base class for profilers of export runs.
+
+    All methods do nothing by default, so subclasses only need to
+    implement the events they are interested in.
+    """
+
+    def channel_started(self, channel_id: str, filename_base: Path) -> None:
+        """Called when the export of a channel starts.
+
+        Args:
+        - channel_id: ID of the channel
+        - filename_base: path of output files for this channel without extension
+        """
+
+    def channel_finished(self, channel_id: str, filename_base: Path) -> None:
+        """Called when the export of a channel has finished."""
+
+    def phase_started(self, name: str) -> None:
+        """Called when a phase starts. Phases can be nested."""
+
+    def phase_finished(self, name: str) -> None:
+        """Called when a phase has finished."""
+
+
+class CProfileProfiler(Profiler):
+    """Profiles each phase with cProfile and writes pstats files.
+
+    Writes one file per phase and one with all phases for each channel,
+    e.g. <team>_<channel>_profile.prof and <team>_<channel>_profile_layout.prof.
+    Nested phases are profiled exclusively like in the run stats.
+    Only the exporting thread is profiled, e.g. not the compression threads.
+    Channels exported at the same time in other threads wait
+    until the profiling of the current channel has finished.
+    """
+
+    def __init__(self) -> None:
+        self._profiles = {}
+        self._stack = []
+        self._has_lock = False
+
+    def channel_started(self, channel_id: str, filename_base: Path) -> None:
+        if not self._has_lock:
+            _CPROFILE_LOCK.acquire()  # pylint: disable = consider-using-with
+            self._has_lock = True
+        self._profiles = {}
+        self._stack = []
+
+    def phase_started(self, name: str) -> None:
+        if self._stack:
+            self._profiles[self._stack[-1]].disable()
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        self._stack.append(name)
+        profile.enable()
+
+    def phase_finished(self, name: str) -> None:
+        self._profiles[name].disable()
+        self._stack.pop()
+        if self._stack:
+            self._profiles[self._stack[-1]].enable()
+
+    def channel_finished(self, channel_id: str, filename_base: Path) -> None:
+        try:
+            for name in reversed(self._stack):
+                self._profiles[name].disable()
+            self._stack = []
+            if not self._profiles:
+                return
+
+            for name, profile in self._profiles.items():
+                profile.dump_stats(_profile_path(filename_base, f"profile_{name}.prof"))
+
+            all_stats = pstats.Stats(*self._profiles.values())
+            all_stats.dump_stats(_profile_path(filename_base, "profile.prof"))
+            self._profiles = {}
+        finally:
+            if self._has_lock:
+                self._has_lock = False
+                _CPROFILE_LOCK.release()
+
+
+class TracemallocProfiler(Profiler):
+    """Takes tracemalloc snapshots after each top level phase.
+
+    Writes one snapshot file per phase for each channel,
+    e.g. <team>_<channel>_memory_layout.snapshot.
+    They can be loaded with tracemalloc.Snapshot.load().
+    """
+
+    def __init__(self, frames: int = 1) -> None:
+        """
+        Args:
+        - frames: number of frames to store for each traceback
+        """
+        self._frames = frames
+        self._filename_base = None
+        self._depth = 0
+        self._is_tracing_started = False
+
+    def channel_started(self, channel_id: str, filename_base: Path) -> None:
+        self._filename_base = filename_base
+        self._depth = 0
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._is_tracing_started = True
+
+    def phase_started(self, name: str) -> None:
+        self._depth += 1
+
+    def phase_finished(self, name: str) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._filename_base is not None:
+            snapshot = tracemalloc.take_snapshot()
+            snapshot.dump(_profile_path(self._filename_base, f"memory_{name}.snapshot"))
+
+    def channel_finished(self, channel_id: str, filename_base: Path) -> None:
+        self._filename_base = None
+        if self._is_tracing_started:
+            tracemalloc.stop()
+            self._is_tracing_started = False
+
+
+def _profile_path(filename_base: Path, suffix: str) -> str:
+    return str(filename_base.parent / f"{filename_base.name}_{suffix}")
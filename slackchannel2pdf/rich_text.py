@@ -0,0 +1,200 @@
+"""Structured rich text, which is produced from Slack messages and rendered to PDF.
+
+Rich text is a tuple of items. Each item is either a run of text
+with the same formatting or a marker for a line break or a block quote.
+"""
+
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, Union
+
+HTML_CACHE_SIZE = 1024
+
+_RE_HTML_TAGS = re.compile(r"<([^>]*)>")
+_RE_HTML_ATTRIBUTE = re.compile(r'([^=]*)=["\']?([^"\']*)')
+
+# operations of compiled HTML instructions
+_OP_TEXT = "text"
+_OP_OPEN_TAG = "open"
+_OP_CLOSE_TAG = "close"
+
+
+class TextRun(NamedTuple):
+    """A run of text with the same formatting."""
+
+    text: str
+    bold: bool = False
+    italic: bool = False
+    underline: bool = False
+    font_family: Optional[str] = None
+    font_size: Optional[int] = None
+    href: Optional[str] = None
+
+
+class Marker(Enum):
+    """A structural element between text runs."""
+
+    LINE_BREAK = "br"
+    BLOCKQUOTE_START = "blockquote_start"
+    BLOCKQUOTE_END = "blockquote_end"
+
+
+RichTextItem = Union[TextRun, Marker]
+RichText = Tuple[RichTextItem, ...]
+
+
+@lru_cache(maxsize=HTML_CACHE_SIZE)
+def compile_html(html: str) -> tuple:
+    """Compile HTML into a tuple of instructions.
+
+    Each instruction is a tuple of an operation and its arguments:
+    (text, str), (open, tag, attributes) or (close, tag).
+    Results are cached and must not be modified.
+    """
+    # split html into parts to identify all HTML tags
+    # even numbered parts will contain text
+    # odd numbered parts will contain tags
+    parts = _RE_HTML_TAGS.split(html.replace("\n", " "))
+    instructions = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            instructions.append((_OP_TEXT, part))
+        elif not part:
+            continue
+        elif part[0] == "/":
+            instructions.append((_OP_CLOSE_TAG, part[1:].upper()))
+        else:
+            # extract all attributes from the current tag if any
+            tag_parts = part.split(" ")
+            tag = tag_parts.pop(0).upper()
+            attributes = {}
+            for tag_part in tag_parts:
+                match_obj = _RE_HTML_ATTRIBUTE.search(tag_part)
+                if match_obj is not None:
+                    attributes[match_obj.group(1).upper()] = match_obj.group(2)
+            instructions.append((_OP_OPEN_TAG, tag, attributes))
+    return tuple(instructions)
+
+
+@lru_cache(maxsize=HTML_CACHE_SIZE)
+def from_html(html: str) -> RichText:
+    """Convert rudimentary HTML as supported by FPDFext into rich text.
+
+    Nested <s> tags are ignored, i.e. their text keeps the font
+    of the outermost <s> tag until that tag is closed.
+    FPDFext used to stop rendering a snippet at a nested <s> tag instead.
+    """
+    items = []
+    counts = {"B": 0, "I": 0, "U": 0}
+    font_family = None
+    font_size = None
+    font_style = ""
+    font_depth = 0
+    href = None
+    for instruction in compile_html(html):
+        if instruction[0] == _OP_TEXT:
+            if instruction[1]:
+                items.append(
+                    TextRun(
+                        instruction[1],
+                        bold=counts["B"] > 0 or "B" in font_style,
+                        italic=counts["I"] > 0 or "I" in font_style,
+                        underline=counts["U"] > 0 or "U" in font_style,
+                        font_family=font_family,
+                        font_size=font_size,
+                        href=href,
+                    )
+                )
+            continue
+
+        tag = instruction[1]
+        is_open = instruction[0] == _OP_OPEN_TAG
+        if tag in counts:
+            counts[tag] += 1 if is_open else -1
+        elif tag == "BR" and is_open:
+            items.append(Marker.LINE_BREAK)
+        elif tag == "BLOCKQUOTE":
+            items.append(Marker.BLOCKQUOTE_START if is_open else Marker.BLOCKQUOTE_END)
+        elif tag == "A":
+            href = instruction[2].get("HREF") if is_open else None
+        elif tag == "S":
+            if is_open:
+                if not font_depth:
+                    attributes = instruction[2]
+                    font_family = attributes.get("FONTFAMILY")
+                    font_size = (
+                        int(attributes["SIZE"]) if "SIZE" in attributes else None
+                    )
+                    font_style = attributes.get("STYLE", "").upper()
+                font_depth += 1
+            elif font_depth:
+                font_depth -= 1
+                if not font_depth:
+                    font_family = font_size = None
+                    font_style = ""
+
+    return tuple(items)
+
+
+def to_html(rich_text: RichText) -> str:
+    """Convert rich text into rudimentary HTML as supported by FPDFext."""
+    parts = []
+    open_tags = []
+    for item in rich_text:
+        if isinstance(item, TextRun):
+            tags = _html_tags_for_run(item)
+        else:
+            tags = []
+
+        # close tags down to the common prefix, then open the missing ones
+        common = 0
+        while (
+            common < len(open_tags)
+            and common < len(tags)
+            and open_tags[common] == tags[common]
+        ):
+            common += 1
+        while len(open_tags) > common:
+            parts.append(_closing_html_tag(open_tags.pop()))
+        for tag in tags[common:]:
+            parts.append(f"<{tag}>")
+            open_tags.append(tag)
+
+        if isinstance(item, TextRun):
+            parts.append(item.text)
+        elif item is Marker.LINE_BREAK:
+            parts.append("<br>")
+        elif item is Marker.BLOCKQUOTE_START:
+            parts.append("<blockquote>")
+        else:
+            parts.append("</blockquote>")
+
+    while open_tags:
+        parts.append(_closing_html_tag(open_tags.pop()))
+
+    return "".join(parts)
+
+
+def _html_tags_for_run(run: TextRun) -> list:
+    tags = []
+    if run.bold:
+        tags.append("b")
+    if run.italic:
+        tags.append("i")
+    if run.underline:
+        tags.append("u")
+    if run.font_family is not None or run.font_size is not None:
+        attributes = ""
+        if run.font_family is not None:
+            attributes += f' fontfamily="{run.font_family}"'
+        if run.font_size is not None:
+            attributes += f' size="{run.font_size}"'
+        tags.append(f"s{attributes}")
+    if run.href is not None:
+        tags.append(f'a href="{run.href}"')
+    return tags
+
+
+def _closing_html_tag(tag: str) -> str:
+    return f"</{tag.split(' ', 1)[0]}>"
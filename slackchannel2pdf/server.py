@@ -0,0 +1,364 @@
+"""Export server, which runs export jobs received over HTTP with warm caches.
+
+Jobs are submitted as JSON with a POST request to /jobs and their status
+can be requested with GET /jobs/<id>. The server is meant for local clients.
+All requests need the server's auth token as bearer token and jobs can only
+write files below the server's output root.
+"""
+
+import argparse
+import hmac
+import itertools
+import json
+import logging
+import os
+import queue
+import secrets
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from . import __version__, settings
+from .cli import add_version_argument
+from .jobs import ExporterPool, ExportJob
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 1000
+AUTH_TOKEN_ENV = "SLACKCHANNEL2PDF_SERVER_TOKEN"
+
+
+class QueueFullError(Exception):
+    """The job queue is full."""
+
+
+class _JobRecord:
+    """State of a submitted job."""
+
+    def __init__(self, job_id: str, job: ExportJob) -> None:
+        self.job_id = job_id
+        self.job = job
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> dict:
+        """Return job state for the API."""
+        return {
+            "id": self.job_id,
+            "status": self.status,
+            "channels": list(self.job.channels),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class ExportServer:
+    """Runs export jobs from a bounded queue with a fixed number of workers.
+
+    Exporters are kept warm in a pool and reused by later jobs.
+    """
+
+    def __init__(
+        self,
+        slack_token: Optional[str] = None,
+        workers: int = settings.SERVER_WORKERS,
+        max_queued_jobs: int = settings.SERVER_MAX_QUEUED_JOBS,
+        output_root: Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+        - slack_token: token for jobs which do not define their own
+        - workers: number of jobs running at the same time
+        - max_queued_jobs: further jobs are rejected while the queue is full
+        - output_root: jobs can only write below this path,
+        defaults to the configured output root or the current working directory
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queued_jobs < 1:
+            raise ValueError("max_queued_jobs must be at least 1")
+
+        self._output_root = Path(
+            output_root or settings.SERVER_OUTPUT_ROOT or os.getcwd()
+        ).resolve()
+        self._pool = ExporterPool(slack_token)
+        self._queue = queue.Queue(maxsize=max_queued_jobs)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"worker-{num}", daemon=True)
+            for num in range(1, workers + 1)
+        ]
+        self._is_started = False
+
+    def start(self) -> None:
+        """Start the workers."""
+        if not self._is_started:
+            for worker in self._workers:
+                worker.start()
+            self._is_started = True
+
+    def stop(self) -> None:
+        """Stop the workers after they finished all queued jobs."""
+        if self._is_started:
+            for _ in self._workers:
+                self._queue.put(None)
+            for worker in self._workers:
+                worker.join()
+            self._is_started = False
+
+    def submit(self, data: dict) -> str:
+        """Add a job to the queue and return its ID.
+
+        Raises ValueError for invalid jobs and QueueFullError if the queue is full.
+        """
+        job = ExportJob.from_dict(data)
+        job = job._replace(dest_path=self._resolve_dest_path(job.dest_path))
+        with self._lock:
+            job_id = str(next(self._job_ids))
+            record = _JobRecord(job_id, job)
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full as ex:
+                raise QueueFullError("Too many queued jobs") from ex
+            self._jobs[job_id] = record
+        logger.info("Job %s queued for channels: %s", job_id, ", ".join(job.channels))
+        return job_id
+
+    def _resolve_dest_path(self, dest_path: Optional[str]) -> str:
+        """Return the absolute destination path for a job.
+
+        Relative paths are relative to the output root.
+        Raises ValueError for paths outside of the output root.
+        """
+        path = (self._output_root / (dest_path or "")).resolve()
+        if path != self._output_root and self._output_root not in path.parents:
+            raise ValueError(f"dest_path must be below {self._output_root}")
+        return str(path)
+
+    def job_status(self, job_id: str) -> Optional[dict]:
+        """Return the state of a job or None if it is not known."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+        return record.to_dict() if record else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """Wait until a job has finished and return its state."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+        if record is None:
+            return None
+        record.done.wait(timeout)
+        return record.to_dict()
+
+    def status(self) -> dict:
+        """Return the state of the server."""
+        with self._lock:
+            statuses = [record.status for record in self._jobs.values()]
+        return {
+            "version": __version__,
+            "workers": len(self._workers),
+            "queued_jobs": statuses.count("queued"),
+            "running_jobs": statuses.count("running"),
+        }
+
+    def _work(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+
+            record.status = "running"
+            try:
+                record.result = self._pool.run(record.job)
+            except Exception as ex:  # pylint: disable = broad-exception-caught
+                logger.exception("Job %s failed", record.job_id)
+                record.status = "failed"
+                record.error = str(ex)
+            else:
+                record.status = "done" if record.result.get("ok") else "failed"
+            finally:
+                record.done.set()
+                self._forget_finished_jobs()
+
+    def _forget_finished_jobs(self) -> None:
+        with self._lock:
+            finished = [
+                job_id for job_id, record in self._jobs.items() if record.done.is_set()
+            ]
+            for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[job_id]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handles HTTP requests for an export server."""
+
+    server_version = f"slackchannel2pdf/{__version__}"
+
+    def do_GET(self):  # pylint: disable = invalid-name
+        """Return status of the server or of a job."""
+        if not self._is_authorized():
+            return
+
+        export_server = self.server.export_server
+        if self.path == "/status":
+            self._send_json(HTTPStatus.OK, export_server.status())
+            return
+
+        if self.path.startswith("/jobs/"):
+            job = export_server.job_status(self.path[len("/jobs/") :])
+            if job:
+                self._send_json(HTTPStatus.OK, job)
+                return
+
+        self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def do_POST(self):  # pylint: disable = invalid-name
+        """Submit a new job."""
+        if not self._is_authorized():
+            return
+
+        if self.path != "/jobs":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+
+        # other content types could be sent cross-site by any web page
+        # without a preflight request
+        if self.headers.get_content_type() != "application/json":
+            self._send_json(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                {"error": "Content-Type must be application/json"},
+            )
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length) or b"null")
+            job_id = self.server.export_server.submit(data)
+        except (ValueError, TypeError) as ex:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(ex)})
+        except QueueFullError as ex:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(ex)})
+        else:
+            self._send_json(HTTPStatus.ACCEPTED, {"id": job_id})
+
+    def log_message(self, format, *args):  # pylint: disable = redefined-builtin
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _is_authorized(self) -> bool:
+        """Check the bearer token of a request and respond if it is wrong."""
+        expected = f"Bearer {self.server.auth_token}".encode("utf-8")
+        received = self.headers.get("Authorization", "").encode("utf-8")
+        if hmac.compare_digest(received, expected):
+            return True
+
+        self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "unauthorized"})
+        return False
+
+    def _send_json(self, status: HTTPStatus, data: dict) -> None:
+        body = json.dumps(data, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_http_server(
+    export_server: ExportServer,
+    auth_token: str,
+    host: str = settings.SERVER_HOST,
+    port: int = settings.SERVER_PORT,
+) -> ThreadingHTTPServer:
+    """Create a HTTP server, which passes requests to the export server.
+
+    Requests must have the auth token as bearer token.
+    """
+    if not auth_token:
+        raise ValueError("auth_token can not be empty")
+
+    http_server = ThreadingHTTPServer((host, port), _RequestHandler)
+    http_server.export_server = export_server  # type: ignore
+    http_server.auth_token = auth_token  # type: ignore
+    return http_server
+
+
+def main():
+    """Runs the export server until it is interrupted."""
+    args = _parse_args(sys.argv[1:])
+    slack_token = args.token or os.environ.get("SLACK_TOKEN")
+    auth_token = args.auth_token or os.environ.get(AUTH_TOKEN_ENV)
+    if not auth_token:
+        auth_token = secrets.token_urlsafe(32)
+        print(f"Auth token for this session: {auth_token}")
+    export_server = ExportServer(
+        slack_token=slack_token,
+        workers=args.workers,
+        max_queued_jobs=args.max_queued_jobs,
+        output_root=args.output_root,
+    )
+    http_server = create_http_server(export_server, auth_token, args.host, args.port)
+    export_server.start()
+    print(f"Export server listening on http://{args.host}:{args.port}")
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        export_server.stop()
+
+
+def _parse_args(args: list) -> argparse.Namespace:
+    """defines the argument parser and returns parsed result from given argument"""
+    my_arg_parser = argparse.ArgumentParser(
+        description="This program runs a server for exporting Slack channels to PDF",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    my_arg_parser.add_argument(
+        "--token", help="Slack OAuth token for jobs without their own token"
+    )
+    my_arg_parser.add_argument(
+        "--auth-token",
+        help=(
+            "token clients must send as bearer token, "
+            f"defaults to ${AUTH_TOKEN_ENV} or a new random token"
+        ),
+    )
+    my_arg_parser.add_argument(
+        "--host", help="address to listen on", default=settings.SERVER_HOST
+    )
+    my_arg_parser.add_argument(
+        "--output-root",
+        help="directory below which jobs can write files",
+        type=Path,
+        default=settings.SERVER_OUTPUT_ROOT or None,
+    )
+    my_arg_parser.add_argument(
+        "--port", help="port to listen on", type=int, default=settings.SERVER_PORT
+    )
+    my_arg_parser.add_argument(
+        "--workers",
+        help="number of jobs running at the same time",
+        type=int,
+        default=settings.SERVER_WORKERS,
+    )
+    my_arg_parser.add_argument(
+        "--max-queued-jobs",
+        help="maximum number of jobs waiting to be run",
+        type=int,
+        default=settings.SERVER_MAX_QUEUED_JOBS,
+    )
+    add_version_argument(my_arg_parser)
+    return my_arg_parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
-"""Global settings incl. from configuration files for slackchannel2pdf."""
+"""Global settings incl. from configuration files for slackchannel2pdf.
+
+The configuration files are only read when the first setting is accessed.
+"""
 
 # pylint: disable = no-member
 
@@ -39,34 +42,51 @@ def config_parser(
     return parser
 
 
-_my_config = config_parser(
-    defaults_path=_DEFAULTS_PATH, home_path=Path.home(), cwd_path=Path.cwd()
-)
-
 # style and layout settings for PDF
 PAGE_UNITS_DEFAULT = "mm"
 FONT_FAMILY_DEFAULT = "NotoSans"
 FONT_FAMILY_MONO_DEFAULT = "NotoSansMono"
 
-PAGE_ORIENTATION_DEFAULT = _my_config.getstr("pdf", "page_orientation")  # type: ignore
-PAGE_FORMAT_DEFAULT = _my_config.getstr("pdf", "page_format")  # type: ignore
-FONT_SIZE_NORMAL = _my_config.getint("pdf", "font_size_normal")
-FONT_SIZE_LARGE = _my_config.getint("pdf", "font_size_large")
-FONT_SIZE_SMALL = _my_config.getint("pdf", "font_size_small")
-LINE_HEIGHT_DEFAULT = _my_config.getint("pdf", "line_height_default")
-LINE_HEIGHT_SMALL = _my_config.getint("pdf", "line_height_small")
-MARGIN_LEFT = _my_config.getint("pdf", "margin_left")
-TAB_WIDTH = _my_config.getint("pdf", "tab_width")
-
-# locale
-FALLBACK_LOCALE = _my_config.getstr("locale", "fallback_locale")  # type: ignore
 
-# slack
-MINUTES_UNTIL_USERNAME_REPEATS = _my_config.getint(
-    "slack", "minutes_until_username_repeats"
-)
-MAX_MESSAGES_PER_CHANNEL = _my_config.getint("slack", "max_messages_per_channel")
-SLACK_PAGE_LIMIT = _my_config.getint("slack", "slack_page_limit")
+def _load_settings() -> dict:
+    """Load all settings, which can be configured, from the configuration files."""
+    config = config_parser(
+        defaults_path=_DEFAULTS_PATH, home_path=Path.home(), cwd_path=Path.cwd()
+    )
+    return {
+        "PAGE_ORIENTATION_DEFAULT": config.getstr("pdf", "page_orientation"),
+        "PAGE_FORMAT_DEFAULT": config.getstr("pdf", "page_format"),
+        "FONT_SIZE_NORMAL": config.getint("pdf", "font_size_normal"),
+        "FONT_SIZE_LARGE": config.getint("pdf", "font_size_large"),
+        "FONT_SIZE_SMALL": config.getint("pdf", "font_size_small"),
+        "LINE_HEIGHT_DEFAULT": config.getint("pdf", "line_height_default"),
+        "LINE_HEIGHT_SMALL": config.getint("pdf", "line_height_small"),
+        "MARGIN_LEFT": config.getint("pdf", "margin_left"),
+        "TAB_WIDTH": config.getint("pdf", "tab_width"),
+        "COMPRESSION_LEVEL": config.getint("pdf", "compression_level"),
+        # locale
+        "FALLBACK_LOCALE": config.getstr("locale", "fallback_locale"),
+        # slack
+        "MINUTES_UNTIL_USERNAME_REPEATS": config.getint(
+            "slack", "minutes_until_username_repeats"
+        ),
+        "MAX_MESSAGES_PER_CHANNEL": config.getint("slack", "max_messages_per_channel"),
+        "SLACK_PAGE_LIMIT": config.getint("slack", "slack_page_limit"),
+        "MEMORY_BUDGET_MB": config.getfloat("slack", "memory_budget_mb"),
+        # server
+        "SERVER_HOST": config.getstr("server", "host"),
+        "SERVER_PORT": config.getint("server", "port"),
+        "SERVER_WORKERS": config.getint("server", "workers"),
+        "SERVER_MAX_QUEUED_JOBS": config.getint("server", "max_queued_jobs"),
+        "SERVER_OUTPUT_ROOT": config.getstr("server", "output_root"),
+        "SERVER_MAX_EXPORTER_KEYS": config.getint("server", "max_exporter_keys"),
+        "SERVER_MAX_IDLE_EXPORTERS": config.getint("server", "max_idle_exporters"),
+        "SERVER_DIRECTORIES_TTL": config.getint("server", "directories_ttl"),
+        # batch
+        "BATCH_WORKERS": config.getint("batch", "workers"),
+        # logging
+        "DEFAULT_LOGGING": _setup_logging(config),
+    }
 
 
 def _setup_logging(config: configparser.ConfigParser) -> dict:
@@ -114,4 +134,11 @@ def _setup_logging(config: configparser.ConfigParser) -> dict:
     return config_logging
 
 
-DEFAULT_LOGGING = _setup_logging(_my_config)
+def __getattr__(name: str):
+    """Load the configuration files when the first setting is accessed."""
+    if not name.startswith("_") and "DEFAULT_LOGGING" not in globals():
+        globals().update(_load_settings())
+        if name in globals():
+            return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
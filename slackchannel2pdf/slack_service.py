@@ -1,7 +1,9 @@
 """Logic for handling Slack API."""
 
+import json
 import logging
-from typing import Optional
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import slack_sdk
 from babel.numbers import format_decimal
@@ -9,6 +11,7 @@ from babel.numbers import format_decimal
 from . import settings
 from .helpers import transform_encoding
 from .locales import LocaleHelper
+from .stats import RunStats
 
 logger = logging.getLogger(__name__)
 
@@ -27,34 +30,37 @@ class SlackService:
         if slack_token is None:
             raise ValueError("slack_token can not be null")
 
+        # stats of API calls, can be replaced for each export
+        self.stats = RunStats()
+        self._directories_version = 0
+
         # load information for current Slack workspace
         self._client = slack_sdk.WebClient(token=slack_token)
         if not locale_helper:
             locale_helper = LocaleHelper()
         self._locale = locale_helper.locale
-        self._workspace_info = self._fetch_workspace_info()
-        logger.info("Current Slack workspace: %s", self.team)
-        self._user_names = self.fetch_user_names()
-
-        # set author
-        if "user_id" in self._workspace_info:
-            author_id = self._workspace_info["user_id"]
-            if author_id in self._user_names:
-                self._author = self._user_names[author_id]
+        with self.stats.phase("directories"):
+            self._workspace_info = self._fetch_workspace_info()
+            logger.info("Current Slack workspace: %s", self.team)
+            self._load_directories()
+
+            # set author
+            if "user_id" in self._workspace_info:
+                author_id = self._workspace_info["user_id"]
+                if author_id in self._user_names:
+                    self._author = self._user_names[author_id]
+                else:
+                    self._author = f"unknown_user_{author_id}"
             else:
-                self._author = f"unknown_user_{author_id}"
-        else:
-            author_id = None
-            self._author = "unknown user"
+                author_id = None
+                self._author = "unknown user"
 
-        logger.info("Current Slack user: %s", self.author)
-        self._channel_names = self._fetch_channel_names()
-        self._usergroup_names = self._fetch_usergroup_names()
+            logger.info("Current Slack user: %s", self.author)
 
-        if author_id is not None:
-            self._author_info = self._fetch_user_info(author_id)
-        else:
-            self._author_info = {}
+            if author_id is not None:
+                self._author_info = self._fetch_user_info(author_id)
+            else:
+                self._author_info = {}
 
     @property
     def author(self) -> str:
@@ -82,11 +88,32 @@ class SlackService:
         """Return usergroup names."""
         return self._usergroup_names
 
+    def directories_version(self) -> int:
+        """Return a counter which changes when the user, channel
+        or usergroup directories are reloaded or changed.
+        """
+        return self._directories_version
+
+    def directories_changed(self) -> None:
+        """Mark the directories as changed after modifying them in place."""
+        self._directories_version += 1
+
+    def refresh_directories(self) -> None:
+        """Reload the user, channel and usergroup directories from Slack."""
+        with self.stats.phase("directories"):
+            self._load_directories()
+
+    def _load_directories(self) -> None:
+        self._user_names = self.fetch_user_names()
+        self._channel_names = self._fetch_channel_names()
+        self._usergroup_names = self._fetch_usergroup_names()
+        self.directories_changed()
+
     def _fetch_workspace_info(self) -> dict:
         """returns dict with info about current workspace"""
 
         logger.info("Fetching workspace info from Slack...")
-        res = self._client.auth_test()
+        res = self._call_api("auth_test")
         return res.data  # type: ignore
 
     def fetch_user_names(self) -> dict:
@@ -102,7 +129,7 @@ class SlackService:
     def _fetch_user_info(self, user_id: str) -> dict:
         """returns dict of user info for user ID incl. locale"""
         logger.info("Fetching user info for author...")
-        response = self._client.users_info(user=user_id, include_locale=True)
+        response = self._call_api("users_info", user=user_id, include_locale=True)
         return response["user"]
 
     def _fetch_channel_names(self) -> dict:
@@ -122,7 +149,7 @@ class SlackService:
         """returns dict of usergroup names with usergroup ID as key"""
 
         logger.info("Fetching usergroups from Slack...")
-        response = self._client.usergroups_list()
+        response = self._call_api("usergroups_list")
         usergroup_names = self._reduce_to_dict(response["usergroups"], "id", "handle")
         if usergroup_names:
             for usergroup in usergroup_names:
@@ -141,10 +168,21 @@ class SlackService:
         self, channel_id, max_messages, oldest=None, latest=None
     ) -> list:
         """retrieve messages from a channel on Slack and return as list"""
+        return list(
+            chain.from_iterable(
+                self.iter_message_pages_from_channel(
+                    channel_id, max_messages, oldest, latest
+                )
+            )
+        )
 
+    def iter_message_pages_from_channel(
+        self, channel_id, max_messages, oldest=None, latest=None
+    ) -> Iterator[List[dict]]:
+        """retrieve messages from a channel on Slack and yield them page by page"""
         oldest_ts = str(oldest.timestamp()) if oldest is not None else 0
         latest_ts = str(latest.timestamp()) if latest is not None else 0
-        messages = self._fetch_pages(
+        yield from self._iter_pages(
             "conversations_history",
             key="messages",
             args={
@@ -156,24 +194,42 @@ class SlackService:
             items_name="messages",
             collection_name="channel",
         )
-        return messages
 
     def fetch_threads_from_messages(
         self, channel_id, messages, max_messages, oldest=None, latest=None
     ) -> dict:
         """returns threads from all messages from for a channel as dict"""
-        threads = {}
+        return dict(
+            self.iter_threads_from_messages(
+                channel_id, messages, max_messages, oldest, latest
+            )
+        )
+
+    def iter_threads_from_messages(
+        self,
+        channel_id,
+        messages: Iterable[dict],
+        max_messages,
+        oldest=None,
+        latest=None,
+    ) -> Iterator[Tuple[str, List[dict]]]:
+        """retrieve threads from all messages for a channel
+        and yield them thread by thread with the thread's timestamp
+        """
+        thread_timestamps = [
+            msg["ts"]
+            for msg in messages
+            if "thread_ts" in msg and msg["thread_ts"] == msg["ts"]
+        ]
         thread_num = 0
         thread_messages_total = 0
-        for msg in messages:
-            if "thread_ts" in msg and msg["thread_ts"] == msg["ts"]:
-                thread_ts = msg["thread_ts"]
-                thread_num += 1
-                thread_messages = self._fetch_messages_from_thread(
-                    channel_id, thread_ts, max_messages, oldest, latest
-                )
-                threads[thread_ts] = thread_messages
-                thread_messages_total += len(thread_messages)
+        for thread_ts in thread_timestamps:
+            thread_num += 1
+            thread_messages = self._fetch_messages_from_thread(
+                channel_id, thread_ts, max_messages, oldest, latest
+            )
+            thread_messages_total += len(thread_messages)
+            yield thread_ts, thread_messages
 
         if thread_messages_total:
             logger.info(
@@ -184,8 +240,6 @@ class SlackService:
         else:
             logger.info("This channel has no threads")
 
-        return threads
-
     def _fetch_messages_from_thread(
         self, channel_id, thread_ts, max_messages, oldest=None, latest=None
     ) -> list:
@@ -220,6 +274,33 @@ class SlackService:
         print_result: bool = True,
     ) -> list:
         """helper for retrieving all pages from an API endpoint"""
+        return list(
+            chain.from_iterable(
+                self._iter_pages(
+                    method,
+                    key,
+                    args,
+                    limit,
+                    max_rows,
+                    items_name,
+                    collection_name,
+                    print_result,
+                )
+            )
+        )
+
+    def _iter_pages(
+        self,
+        method,
+        key: str,
+        args: Optional[dict] = None,
+        limit: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        items_name: Optional[str] = None,
+        collection_name: Optional[str] = None,
+        print_result: bool = True,
+    ) -> Iterator[list]:
+        """helper for retrieving pages from an API endpoint one by one"""
         # fetch first page
         page = 1
         output_str = (
@@ -232,12 +313,13 @@ class SlackService:
         if not limit:
             limit = settings.SLACK_PAGE_LIMIT
         base_args = {**args, **{"limit": limit}}
-        response = getattr(self._client, method)(**base_args)
-        rows = response[key]
+        response = self._call_api(method, **base_args)
+        rows_count = len(response[key])
+        yield response[key]
 
         # fetch additional page (if any)
         while (
-            (not max_rows or len(rows) < max_rows)
+            (not max_rows or rows_count < max_rows)
             and response.get("response_metadata")
             and response["response_metadata"].get("next_cursor")
         ):
@@ -249,16 +331,35 @@ class SlackService:
                     "cursor": response["response_metadata"].get("next_cursor"),
                 },
             }
-            response = getattr(self._client, method)(**page_args)
-            rows += response[key]
+            response = self._call_api(method, **page_args)
+            rows_count += len(response[key])
+            yield response[key]
 
         if print_result:
             logger.info(
                 "Received %s %s",
-                format_decimal(len(rows), locale=self._locale),
+                format_decimal(rows_count, locale=self._locale),
                 items_name if items_name else "objects",
             )
-        return rows
+
+    def _call_api(self, method: str, **kwargs):
+        """Call a method of the Slack API and count the call."""
+        response = getattr(self._client, method)(**kwargs)
+        self.stats.count("api_calls")
+        self.stats.count("api_bytes_received", self._body_size(response))
+        return response
+
+    @staticmethod
+    def _body_size(response) -> int:
+        """Return the size of the body of an API response in bytes.
+
+        The Slack SDK does not keep the raw body and chunked responses have no
+        Content-Length header, so the size is measured from the received data.
+        """
+        data = getattr(response, "data", response)
+        if isinstance(data, bytes):
+            return len(data)
+        return len(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode())
 
     def fetch_bot_names_for_messages(self, messages: list, threads: dict) -> dict:
         """Fetches bot names from API for provided messages
@@ -294,7 +395,7 @@ class SlackService:
         if len(bot_ids) > 0:
             logger.info("Fetching names for %d bots", len(bot_ids))
             for bot_id in bot_ids:
-                response = self._client.bots_info(bot=bot_id)
+                response = self._call_api("bots_info", bot=bot_id)
                 if response["ok"]:
                     bot_names[bot_id] = transform_encoding(response["bot"]["name"])
         return bot_names
@@ -0,0 +1,141 @@
+"""Performance statistics of export runs."""
+
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+# phases of an export in the order they usually happen
+PHASES = (
+    "directories",
+    "history",
+    "threads",
+    "bots",
+    "transform",
+    "layout",
+    "font_embedding",
+    "compression",
+    "write",
+)
+
+# min duration of a phase in seconds for measuring memory again after it
+MEMORY_MIN_WALL_TIME = 0.01
+
+
+class RunStats:
+    """Collects wall time and CPU time per phase and counters of an export.
+
+    Phases can be nested. The time of a nested phase is only counted
+    for that phase and not for the phase around it.
+
+    CPU time is measured for the whole process, so it includes the threads
+    that compress streams and any other exports running at the same time.
+
+    Profilers are notified when a phase starts and finishes.
+    """
+
+    def __init__(self, profilers: Iterable = ()) -> None:
+        self._profilers = tuple(profilers)
+        self._wall_times = Counter()
+        self._cpu_times = Counter()
+        self._calls = Counter()
+        self._counters = Counter()
+        self._memory = {}
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the time spent in a phase."""
+        # profilers are called outside of the measured time
+        for profiler in self._profilers:
+            profiler.phase_started(name)
+        # the last two entries of a frame collect the time of nested phases
+        frame = [time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - frame[0]
+            cpu_time = time.process_time() - frame[1]
+            self._stack.pop()
+            for profiler in reversed(self._profilers):
+                profiler.phase_finished(name)
+            self._wall_times[name] += wall_time - frame[2]
+            self._cpu_times[name] += cpu_time - frame[3]
+            self._calls[name] += 1
+            if self._stack:
+                self._stack[-1][2] += wall_time
+                self._stack[-1][3] += cpu_time
+            elif name not in self._memory or wall_time >= MEMORY_MIN_WALL_TIME:
+                # memory is only measured after top level phases and again
+                # only after longer ones, since short phases can be called very often
+                self._record_memory(name)
+
+    def _record_memory(self, name: str) -> None:
+        memory = current_memory()
+        if memory is not None:
+            self._memory[name] = max(memory, self._memory.get(name, 0))
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a counter."""
+        self._counters[name] += value
+
+    def merge(self, other: "RunStats") -> None:
+        """Add all times and counters from other stats."""
+        other_stats = other.to_dict()
+        for name, phase in other_stats["phases"].items():
+            self._wall_times[name] += phase["wall_time"]
+            self._cpu_times[name] += phase["cpu_time"]
+            self._calls[name] += phase["calls"]
+            if "memory" in phase:
+                self._memory[name] = max(phase["memory"], self._memory.get(name, 0))
+        self._counters.update(other_stats["counters"])
+
+    def to_dict(self) -> dict:
+        """Return stats as dict, which can be serialized to JSON.
+
+        Times are in seconds. Memory is the resident memory of the process
+        in bytes after a phase, if it can be measured on this platform.
+        """
+        names = [name for name in PHASES if name in self._calls]
+        names += sorted(name for name in self._calls if name not in PHASES)
+        phases = {}
+        for name in names:
+            phases[name] = {
+                "wall_time": round(self._wall_times[name], 6),
+                "cpu_time": round(self._cpu_times[name], 6),
+                "calls": self._calls[name],
+            }
+            if name in self._memory:
+                phases[name]["memory"] = self._memory[name]
+        return {
+            "phases": phases,
+            "wall_time": round(sum(self._wall_times.values()), 6),
+            "cpu_time": round(sum(self._cpu_times.values()), 6),
+            "peak_memory": max(self._memory.values(), default=None),
+            "counters": dict(sorted(self._counters.items())),
+        }
+
+
+def current_memory() -> Optional[int]:
+    """Return the resident memory of this process in bytes.
+
+    Returns the peak instead where the current value is not available
+    and None if neither can be measured, e.g. on Windows.
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource  # pylint: disable = import-outside-toplevel
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,221 @@
+"""Benchmarks of the exporter with synthetic channels and of the CLI startup.
+
+The benchmarks are not part of the test suite. Run them from the repo root:
+
+    python -m tests.benchmarks.run_benchmarks
+
+Channels with 1k and 10k messages are benchmarked by default.
+Use --large to also benchmark a channel with 100k messages,
+which takes several minutes and has no stored baselines.
+
+Each benchmark is timed with the best of several runs and compared
+with the stored baselines. The script fails if a benchmark is slower
+than its baseline by more than the tolerance. Baselines depend on the
+machine, so update them on the reference machine with --update-baselines.
+"""
+
+# pylint: disable = protected-access
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from itertools import chain
+from pathlib import Path
+from unittest.mock import patch
+
+import pytz
+from babel import Locale
+
+from slackchannel2pdf import settings
+from slackchannel2pdf.channel_exporter import SlackChannelExporter
+from slackchannel2pdf.fpdf_mod import fpdf
+from slackchannel2pdf.message_transformer import MessageTransformer
+from slackchannel2pdf.message_writer import MessageWriter
+from slackchannel2pdf.stats import RunStats
+
+from ..helpers import SlackClientStub
+from .synthetic import ChannelSpec, generate_channel
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+REPO_PATH = Path(__file__).parents[2]
+# same as running "slackchannel2pdf --version" from the installed entry point
+STARTUP_CODE = (
+    "import sys; from slackchannel2pdf.cli import main; "
+    "sys.argv[1:] = ['--version']; main()"
+)
+DEFAULT_SIZES = [1000, 10000]
+LARGE_SIZE = 100000
+DEFAULT_TOLERANCE = 0.3
+# smaller differences in seconds are noise and no regression
+MIN_REGRESSION = 0.02
+
+
+def main():
+    args = _parse_args(sys.argv[1:])
+    exporter = _create_exporter()
+    results = {"startup/version": _run_startup_benchmark(args.repeat)}
+    print(f"{'startup/version':<24} {results['startup/version']:10.4f} s", flush=True)
+    sizes = args.sizes + [LARGE_SIZE] if args.large else args.sizes
+    for size in sizes:
+        messages, threads = generate_channel(ChannelSpec(message_count=size))
+        for msg in chain(messages, *threads.values()):
+            exporter._normalize_message(msg)
+        for name, duration in _run_benchmarks(
+            exporter, messages, threads, args.repeat
+        ).items():
+            key = f"{name}/{size}"
+            results[key] = duration
+            print(f"{key:<24} {duration:10.4f} s", flush=True)
+
+    if args.update_baselines:
+        baselines = _load_baselines()
+        baselines.update({key: round(value, 4) for key, value in results.items()})
+        BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=4, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        print(f"Updated baselines in {BASELINES_PATH}")
+        return
+
+    baselines = _load_baselines()
+    for key in sorted(set(results) - set(baselines)):
+        print(f"NO BASELINE: {key} is not compared")
+    regressions = _find_regressions(results, baselines, args.tolerance)
+    for key, duration, baseline in regressions:
+        print(f"REGRESSION: {key} took {duration:.4f} s, baseline is {baseline:.4f} s")
+    if regressions:
+        sys.exit(1)
+
+
+def _create_exporter() -> SlackChannelExporter:
+    with patch("slackchannel2pdf.slack_service.slack_sdk") as mock_slack:
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        return SlackChannelExporter(
+            slack_token="TOKEN_DUMMY",
+            my_tz=pytz.UTC,
+            my_locale=Locale.parse("en-US", sep="-"),
+        )
+
+
+def _run_startup_benchmark(repeat) -> float:
+    """Return the best time for starting the CLI in a new interpreter."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", STARTUP_CODE],
+            cwd=REPO_PATH,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _run_benchmarks(exporter, messages, threads, repeat) -> dict:
+    """Run all benchmarks for one channel and return the best time of each."""
+    texts = list(_texts_from_messages(messages, threads))
+    timings = {"transform": [], "layout": [], "font_embedding": [], "output": []}
+    for _ in range(repeat):
+        # transform with a cold cache
+        transformer = _create_transformer(exporter)
+        start = time.perf_counter()
+        for text in texts:
+            transformer.transform_rich_text(text, True)
+        timings["transform"].append(time.perf_counter() - start)
+
+        # layout incl. transform with cold caches
+        writer = MessageWriter(
+            slack_service=exporter._slack_service,
+            locale_helper=exporter._locale_helper,
+            transformer=_create_transformer(exporter),
+        )
+        fpdf.clear_string_width_cache()
+        document = exporter._create_document("portrait", "a4")
+        start = time.perf_counter()
+        writer.write_messages(document, messages, threads)
+        timings["layout"].append(time.perf_counter() - start)
+
+        # output incl. font embedding and compression without cached subsets
+        fpdf.clear_subset_cache()
+        stats = RunStats()
+        document.stats = stats
+        start = time.perf_counter()
+        document.output(dest="S")
+        timings["output"].append(time.perf_counter() - start)
+        phases = stats.to_dict()["phases"]
+        timings["font_embedding"].append(phases["font_embedding"]["wall_time"])
+
+    return {name: min(values) for name, values in timings.items()}
+
+
+def _create_transformer(exporter) -> MessageTransformer:
+    return MessageTransformer(
+        slack_service=exporter._slack_service,
+        locale_helper=exporter._locale_helper,
+        font_family_mono_default=settings.FONT_FAMILY_MONO_DEFAULT,
+    )
+
+
+def _texts_from_messages(messages, threads):
+    for msg in messages:
+        yield msg["text"]
+    for thread_messages in threads.values():
+        for msg in thread_messages[1:]:
+            yield msg["text"]
+
+
+def _load_baselines() -> dict:
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text(encoding="utf-8"))
+
+
+def _find_regressions(results: dict, baselines: dict, tolerance: float) -> list:
+    regressions = []
+    for key, duration in results.items():
+        baseline = baselines.get(key)
+        if baseline is not None and duration > max(
+            baseline * (1 + tolerance), baseline + MIN_REGRESSION
+        ):
+            regressions.append((key, duration, baseline))
+    return regressions
+
+
+def _parse_args(args: list) -> argparse.Namespace:
+    my_arg_parser = argparse.ArgumentParser(
+        description="Benchmarks of the exporter with synthetic channels",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    my_arg_parser.add_argument(
+        "--sizes",
+        help="number of messages of each synthetic channel",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+    )
+    my_arg_parser.add_argument(
+        "--large",
+        help=f"also benchmark a channel with {LARGE_SIZE} messages",
+        action="store_true",
+    )
+    my_arg_parser.add_argument(
+        "--repeat", help="number of runs of each benchmark", type=int, default=3
+    )
+    my_arg_parser.add_argument(
+        "--tolerance",
+        help="allowed slowdown against the baseline, e.g. 0.3 for 30%%",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+    )
+    my_arg_parser.add_argument(
+        "--update-baselines",
+        help="store the results as new baselines instead of comparing them",
+        action="store_true",
+    )
+    return my_arg_parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    main()
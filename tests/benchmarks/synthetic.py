@@ -0,0 +1,198 @@
+"""Deterministic generator of synthetic Slack channels.
+
+Generated messages have the same structure as messages from the Slack API
+and refer to users, channels and usergroups of team T12345678
+in tests/slack_data.json, so that their names can be resolved.
+"""
+
+import random
+from typing import List, NamedTuple, Tuple
+
+USER_IDS = ["U12345678", "U62345678", "U72345678", "U9234567X", "U92345678"]
+CHANNEL_IDS = ["C12345678", "C72345678", "C42345678", "C92345678"]
+USERGROUP_IDS = ["S12345678", "S72345678", "S42345678"]
+BOT_ID = "B12345678"
+
+_WORDS_LATIN = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua release deploy "
+    "meeting review ticket build server customer report"
+).split()
+_WORDS_UNICODE = (
+    "Grüße Straße Ärger naïve café déjà Łódź Ελληνικά καλημέρα "
+    "Привет спасибо Київ Çalışma İstanbul señor año"
+).split()
+_EMOJIS = [":smile:", ":+1:", ":tada:", ":eyes:", ":rocket:"]
+_REACTIONS = ["+1", "heart", "tada", "eyes", "white_check_mark"]
+
+
+class ChannelSpec(NamedTuple):
+    """Parameters of a synthetic channel.
+
+    Ratios are the share of messages with that feature.
+    """
+
+    message_count: int = 1000
+    thread_ratio: float = 0.05
+    max_replies: int = 10
+    attachment_ratio: float = 0.05
+    block_ratio: float = 0.05
+    reaction_ratio: float = 0.1
+    mention_ratio: float = 0.2
+    unicode_ratio: float = 0.1
+    bot_ratio: float = 0.02
+    seed: int = 42
+    start_ts: float = 1600000000.0
+
+
+def generate_channel(spec: ChannelSpec = ChannelSpec()) -> Tuple[List[dict], dict]:
+    """Generate messages and threads of a channel.
+
+    The message count includes thread replies.
+    Messages are returned newest first like from the Slack API
+    and the same spec always produces the same channel.
+    """
+    generator = _Generator(spec)
+    return generator.channel()
+
+
+class _Generator:
+    def __init__(self, spec: ChannelSpec) -> None:
+        self._spec = spec
+        self._random = random.Random(spec.seed)
+        self._ts = spec.start_ts
+
+    def channel(self) -> Tuple[List[dict], dict]:
+        messages = []
+        threads = {}
+        count = 0
+        while count < self._spec.message_count:
+            msg = self._message()
+            messages.append(msg)
+            count += 1
+            remaining = self._spec.message_count - count
+            if remaining > 0 and self._random.random() < self._spec.thread_ratio:
+                reply_count = min(
+                    remaining, self._random.randint(1, self._spec.max_replies)
+                )
+                threads[msg["ts"]] = self._thread(msg, reply_count)
+                count += reply_count
+
+        messages.reverse()
+        return messages, threads
+
+    def _thread(self, parent: dict, reply_count: int) -> List[dict]:
+        parent["thread_ts"] = parent["ts"]
+        parent["reply_count"] = reply_count
+        thread_ts = self._ts
+        replies = [parent]
+        for _ in range(reply_count):
+            thread_ts += self._random.uniform(5, 900)
+            reply = self._message(ts=thread_ts)
+            reply["thread_ts"] = parent["ts"]
+            reply["parent_user_id"] = parent.get("user", "")
+            replies.append(reply)
+        return replies
+
+    def _message(self, ts: float = None) -> dict:
+        if ts is None:
+            # mostly short gaps, sometimes hours or days
+            self._ts += self._random.choice([30, 60, 120, 600, 3600, 86400]) * (
+                self._random.random() + 0.1
+            )
+            ts = self._ts
+
+        msg = {"type": "message", "ts": f"{ts:.6f}", "text": self._text()}
+        if self._random.random() < self._spec.bot_ratio:
+            msg["subtype"] = "bot_message"
+            msg["bot_id"] = BOT_ID
+            msg["username"] = "Build Bot"
+        else:
+            msg["user"] = self._random.choice(USER_IDS)
+
+        if self._random.random() < self._spec.attachment_ratio:
+            msg["attachments"] = [self._attachment()]
+        if self._random.random() < self._spec.block_ratio:
+            msg["blocks"] = [self._section_block()]
+        if self._random.random() < self._spec.reaction_ratio:
+            msg["reactions"] = self._reactions()
+
+        return msg
+
+    def _words(self, count: int) -> str:
+        words = []
+        for _ in range(count):
+            if self._random.random() < self._spec.unicode_ratio:
+                words.append(self._random.choice(_WORDS_UNICODE))
+            else:
+                words.append(self._random.choice(_WORDS_LATIN))
+        return " ".join(words)
+
+    def _text(self) -> str:
+        parts = [self._words(self._random.randint(3, 40))]
+        if self._random.random() < self._spec.mention_ratio:
+            parts.append(self._mention())
+        roll = self._random.random()
+        if roll < 0.1:
+            parts.append(f"*{self._words(2)}*")
+        elif roll < 0.2:
+            parts.append(f"_{self._words(2)}_")
+        elif roll < 0.25:
+            parts.append(f"`{self._words(3)}`")
+        elif roll < 0.3:
+            parts.append(f"~{self._words(2)}~")
+        elif roll < 0.35:
+            parts.append("<https://www.example.com/page|example page>")
+        elif roll < 0.4:
+            parts.append(f"\n&gt; {self._words(8)}\n")
+        elif roll < 0.45:
+            parts.append(f"\n```{self._words(12)}```\n")
+        if self._random.random() < 0.1:
+            parts.append(self._random.choice(_EMOJIS))
+        if self._random.random() < 0.1:
+            parts.append(f"\n{self._words(self._random.randint(3, 20))}")
+        return " ".join(parts)
+
+    def _mention(self) -> str:
+        roll = self._random.random()
+        if roll < 0.6:
+            return f"<@{self._random.choice(USER_IDS)}>"
+        if roll < 0.8:
+            return f"<#{self._random.choice(CHANNEL_IDS)}>"
+        if roll < 0.9:
+            return f"<!subteam^{self._random.choice(USERGROUP_IDS)}>"
+        return self._random.choice(["<!here>", "<!channel>", "<!everyone>"])
+
+    def _attachment(self) -> dict:
+        return {
+            "fallback": self._words(10),
+            "pretext": self._words(6),
+            "author_name": self._words(2),
+            "title": self._words(4),
+            "title_link": "https://www.example.com/title",
+            "text": self._text(),
+            "fields": [
+                {"title": self._words(1), "value": self._words(3), "short": True}
+                for _ in range(self._random.randint(0, 3))
+            ],
+            "footer": self._words(3),
+            "ts": self._random.randint(1500000000, 1600000000),
+            "mrkdwn_in": ["text", "pretext"],
+        }
+
+    def _section_block(self) -> dict:
+        return {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": self._text()},
+            "fields": [
+                {"type": "mrkdwn", "text": f"*{self._words(1)}*\n{self._words(2)}"}
+                for _ in range(self._random.randint(0, 4))
+            ],
+        }
+
+    def _reactions(self) -> List[dict]:
+        reactions = []
+        for name in self._random.sample(_REACTIONS, self._random.randint(1, 3)):
+            users = self._random.sample(USER_IDS, self._random.randint(1, 3))
+            reactions.append({"name": name, "count": len(users), "users": users})
+        return reactions
@@ -1,4 +1,7 @@
+import json
 import os
+import re
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -9,6 +12,10 @@ import pytz
 
 from slackchannel2pdf import __version__, settings
 from slackchannel2pdf.channel_exporter import SlackChannelExporter
+from slackchannel2pdf.fpdf_mod import fonts, fpdf
+from slackchannel2pdf.message_store import MessageStore
+from slackchannel2pdf.rich_text import Marker, TextRun
+from slackchannel2pdf.stats import RunStats
 
 from .helpers import NoSocketsTestCase, SlackClientStub
 
@@ -189,6 +196,272 @@ class TestSlackChannelExporter(NoSocketsTestCase):
         # then
         self.assertTrue(response["ok"])
 
+    def test_should_only_embed_used_fonts(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C72345678"
+        # when
+        response = exporter.run([channel], outputdir)
+        # then
+        self.assertTrue(response["ok"])
+        with open(response["channels"][channel]["filename_pdf"], "rb") as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            fonts = pdf_reader.pages[0]["/Resources"]["/Font"]
+            base_fonts = {font.get_object()["/BaseFont"] for font in fonts.values()}
+        self.assertEqual(base_fonts, {"/MPDFAA+NotoSans", "/MPDFAA+NotoSans-Bold"})
+
+    def test_should_use_configured_compression_level(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C12345678"
+        sizes = {}
+        # when
+        for level in [1, 9]:
+            with patch(
+                "slackchannel2pdf.channel_exporter.settings.COMPRESSION_LEVEL", level
+            ):
+                response = exporter.run([channel], outputdir)
+            self.assertTrue(response["ok"])
+            filename_pdf = Path(response["channels"][channel]["filename_pdf"])
+            sizes[level] = filename_pdf.stat().st_size
+        # then
+        self.assertGreater(sizes[1], sizes[9])
+
+    def test_should_share_cached_string_widths_between_documents(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C72345678"
+        fpdf.clear_string_width_cache()
+        response_1 = exporter.run([channel], outputdir)
+        misses = fpdf.string_width_cache_info().misses
+        # when
+        response_2 = exporter.run([channel], outputdir)
+        # then
+        self.assertTrue(response_1["ok"])
+        self.assertTrue(response_2["ok"])
+        self.assertGreater(misses, 0)
+        self.assertEqual(fpdf.string_width_cache_info().misses, misses)
+
+    def test_should_cache_string_widths_per_word(self, mock_slack):
+        # given
+        document = fpdf.FPDF()
+        document.add_page()
+        document.set_font("helvetica", size=10)
+        text = " ".join(f"word{num} Alice" for num in range(100))
+        fpdf.clear_string_width_cache()
+        # when
+        width = document.get_string_width(text)
+        # then
+        self.assertEqual(fpdf.string_width_cache_info().currsize, 101)
+        document.get_string_width("Alice word1")
+        self.assertEqual(fpdf.string_width_cache_info().currsize, 101)
+        expected = sum(document.get_string_width(char) for char in text)
+        self.assertAlmostEqual(width, expected)
+
+    def test_should_build_core_font_widths_on_first_use(self, mock_slack):
+        # when
+        widths = fonts.get_core_widths("helvetica")
+        # then
+        self.assertEqual(len(widths), 256)
+        self.assertEqual(widths["A"], 667)
+        self.assertIs(fonts.fpdf_charwidths["helvetica"], widths)
+        self.assertIs(
+            fonts.get_core_widths("courierB"), fonts.get_core_widths("courier")
+        )
+        self.assertIsNone(fonts.get_core_widths("unknown"))
+
+    def test_should_reuse_cached_font_subsets(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C72345678"
+        fpdf.clear_subset_cache()
+        # when
+        with patch.object(
+            fpdf.TTFontFile,
+            "makeSubset",
+            autospec=True,
+            side_effect=fpdf.TTFontFile.makeSubset,
+        ) as spy:
+            response_1 = exporter.run([channel], outputdir)
+            call_count = spy.call_count
+            response_2 = exporter.run([channel], outputdir)
+        # then
+        self.assertTrue(response_1["ok"])
+        self.assertTrue(response_2["ok"])
+        self.assertGreater(call_count, 0)
+        self.assertEqual(spy.call_count, call_count)
+
+    def test_should_write_page_count(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C12345678"
+        # when
+        response = exporter.run([channel], outputdir)
+        # then
+        self.assertTrue(response["ok"])
+        res_channel = response["channels"][channel]
+        with open(res_channel["filename_pdf"], "rb") as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            page_count = len(pdf_reader.pages)
+            first_page_text = pdf_reader.pages[0].extract_text()
+        self.assertIn(f"Pages {page_count}", first_page_text)
+        self.assertIn(f"Page 1 / {page_count}", first_page_text)
+
+    def test_should_replace_page_count_only_in_cells_with_alias(self, mock_slack):
+        # given
+        document = fpdf.FPDF()
+        document.set_compression(False)
+        document.alias_nb_pages()
+        document.set_font("helvetica", size=10)
+        for num in range(1, 4):
+            document.add_page()
+            document.cell(0, 10, f"Page {num} / {{nb}}")
+            document.cell(0, 10, "no alias here")
+        # when
+        aliases = [len(document.pages[num]["nb_aliases"]) for num in range(1, 4)]
+        result = document.output(dest="S")
+        # then
+        self.assertEqual(aliases, [1, 1, 1])
+        self.assertIn(b"(Page 3 / 3) Tj", result)
+        self.assertNotIn(b"{nb}", result)
+
+    def test_should_not_output_unused_font_selections(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "G1234567X"
+        # when
+        response = exporter.run([channel], outputdir)
+        # then
+        self.assertTrue(response["ok"])
+        with open(response["channels"][channel]["filename_pdf"], "rb") as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            for page in pdf_reader.pages:
+                content = page.get_contents().get_data().decode("latin1")
+                # every font selection must be used by text before the next one
+                for part in re.split(r"/F\d+ [\d.]+ Tf", content)[1:-1]:
+                    self.assertRegex(part, r"Tj|TJ")
+
+    def test_should_create_same_pdf_when_messages_exceed_memory_budget(
+        self, mock_slack
+    ):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "G1234567X"
+        response = exporter.run([channel], outputdir)
+        with open(response["channels"][channel]["filename_pdf"], "rb") as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            expected = [page.extract_text() for page in pdf_reader.pages]
+        # when
+        with patch(
+            "slackchannel2pdf.channel_exporter.settings.MEMORY_BUDGET_MB", 0.0001
+        ):
+            response = exporter.run([channel], outputdir, write_raw_data=True)
+        # then
+        self.assertTrue(response["ok"])
+        res_channel = response["channels"][channel]
+        self.assertGreater(res_channel["stats"]["counters"]["messages_spilled"], 0)
+        with open(res_channel["filename_pdf"], "rb") as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            result = [page.extract_text() for page in pdf_reader.pages]
+        # the export date can differ between both runs
+        exported_at = re.compile(r"Exported at.*")
+        self.assertEqual(
+            [exported_at.sub("", text) for text in result],
+            [exported_at.sub("", text) for text in expected],
+        )
+
+    def test_should_read_spilled_messages_twice_when_writing(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        store = MessageStore(1)
+        store.add_messages(
+            [
+                {"ts": f"{1600000000 + num * 60}.000100", "user": "U12345678"}
+                for num in range(10)
+            ]
+        )
+        self.assertTrue(store.is_spilled)
+        messages_class = type(store.messages)
+        original_iter = messages_class.__iter__
+        iterations = []
+
+        def count_iterations(messages):
+            iterations.append(messages)
+            return original_iter(messages)
+
+        document = exporter._create_document("portrait", "a4")
+        # when
+        with patch.object(messages_class, "__iter__", count_iterations):
+            exporter._writer.write_messages(document, store.messages, store.threads)
+        store.close()
+        # then
+        self.assertEqual(len(iterations), 2)
+
+    def test_should_remove_spilled_messages_when_export_fails(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        slack_service = exporter._slack_service  # pylint: disable = protected-access
+        closed_temp_dirs = []
+        original_close = MessageStore.close
+
+        def close_and_track(store):
+            if store.is_spilled:
+                closed_temp_dirs.append(Path(store._temp_dir.name))
+            original_close(store)
+
+        failures = [
+            patch.object(exporter, "_write_document", side_effect=RuntimeError),
+            patch.object(
+                slack_service, "fetch_bot_names_for_messages", side_effect=RuntimeError
+            ),
+        ]
+        # when
+        with patch(
+            "slackchannel2pdf.channel_exporter.settings.MEMORY_BUDGET_MB", 0.0001
+        ), patch.object(MessageStore, "close", close_and_track):
+            for failure in failures:
+                with failure, self.assertRaises(RuntimeError):
+                    exporter.run(["G1234567X"], outputdir)
+        # then
+        self.assertEqual(len(closed_temp_dirs), 2)
+        for temp_dir in closed_temp_dirs:
+            self.assertFalse(temp_dir.exists())
+
+    def test_should_report_stats_for_each_phase(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        channel = "C12345678"
+        # when
+        response = exporter.run([channel], outputdir, write_stats=True)
+        # then
+        self.assertTrue(response["ok"])
+        stats = response["stats"]
+        for phase in ["directories", "history", "layout", "compression", "write"]:
+            self.assertIn(phase, stats["phases"])
+        self.assertGreater(stats["counters"]["api_calls"], 0)
+        channel_stats = response["channels"][channel]["stats"]
+        self.assertNotIn("directories", channel_stats["phases"])
+        self.assertEqual(
+            channel_stats["counters"]["pdf_bytes_written"],
+            Path(response["channels"][channel]["filename_pdf"]).stat().st_size,
+        )
+        with (outputdir / "test_stats.json").open("r", encoding="utf-8") as file:
+            stats_file = json.load(file)
+        self.assertEqual(stats_file["total"]["counters"], stats["counters"])
+        # directories are only fetched once per exporter
+        response = exporter.run([channel], outputdir)
+        self.assertNotIn("directories", response["stats"]["phases"])
+
 
 class TestTransformations(NoSocketsTestCase):
     @classmethod
@@ -292,6 +565,108 @@ class TestTransformations(NoSocketsTestCase):
             "<b><i>bold+italic</i></b>",
         )
 
+    def test_transform_text_formatting_pairs(self):
+        self.assertEqual(
+            self.exporter._transformer.transform_text("*a* and *b*", True),
+            "<b>a</b> and <b>b</b>",
+        )
+        self.assertEqual(
+            self.exporter._transformer.transform_text("`a` x `b`", True),
+            '<s fontfamily="NotoSansMono">a</s> x <s fontfamily="NotoSansMono">b</s>',
+        )
+        self.assertEqual(
+            self.exporter._transformer.transform_text("`*no bold*`", True),
+            '<s fontfamily="NotoSansMono">*no bold*</s>',
+        )
+        self.assertEqual(
+            self.exporter._transformer.transform_text("snake_case_name *open", True),
+            "snake_case_name *open",
+        )
+
+    def test_transform_text_keeps_empty_and_unmatched_markers(self):
+        cases = [
+            ("**bold**", "<b>*bold*</b>"),
+            ("a ** b", "a ** b"),
+            ("**", "**"),
+            ("__", "__"),
+            ("***", "***"),
+            ("____", "____"),
+            ("*a**", "<b>a*</b>"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.exporter._transformer.transform_text(text, True), expected
+                )
+
+    def test_transform_text_formatting_next_to_formatting_chars(self):
+        cases = [
+            ("_*both*_", "<b><i>both</i></b>"),
+            ("*_both_*", "<b><i>both</i></b>"),
+            ("~*x*~", "~<b>x</b>~"),
+            ("~_x_~", "~<i>x</i>~"),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.exporter._transformer.transform_text(text, True), expected
+                )
+
+    def test_transform_text_pairs_markers_in_linear_time(self):
+        # given
+        text = "*_" * 20000 + " x"
+        start = time.perf_counter()
+        # when
+        self.exporter._transformer.transform_text(text, True)
+        # then
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_transform_rich_text(self):
+        self.assertEqual(
+            self.exporter._transformer.transform_rich_text(
+                "_it_ <@U62345678>\n>quote", True
+            ),
+            (
+                TextRun("it", italic=True),
+                TextRun(" "),
+                TextRun("@Janet Hakuli", bold=True),
+                Marker.LINE_BREAK,
+                Marker.BLOCKQUOTE_START,
+                TextRun("quote"),
+                Marker.BLOCKQUOTE_END,
+            ),
+        )
+
+    def test_should_cache_transformed_text(self):
+        # given
+        with patch("slackchannel2pdf.slack_service.slack_sdk") as mock_slack:
+            mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+            exporter = SlackChannelExporter("TOKEN_DUMMY")
+        transformer = exporter._transformer
+        # when
+        first = transformer.transform_text("alert <@U62345678>", True)
+        second = transformer.transform_text("alert <@U62345678>", True)
+        # rename user in place, which keeps the size of the directory
+        exporter._slack_service.user_names()["U62345678"] = "Janet Doe"
+        exporter._slack_service.directories_changed()
+        third = transformer.transform_text("alert <@U62345678>", True)
+        # then
+        self.assertEqual(first, "alert <b>@Janet Hakuli</b>")
+        self.assertEqual(second, first)
+        self.assertEqual(third, "alert <b>@Janet Doe</b>")
+        self.assertEqual(transformer.cache_info().hits, 1)
+        self.assertEqual(transformer.cache_info().misses, 2)
+
+    def test_should_measure_cached_transformations(self):
+        # given
+        transformer = self.exporter._transformer
+        transformer.stats = RunStats()
+        # when
+        transformer.transform_text("measure *me*", True)
+        transformer.transform_text("measure *me*", True)
+        # then
+        self.assertEqual(transformer.stats.to_dict()["phases"]["transform"]["calls"], 2)
+
     def test_transform_text_general(self):
         self.assertEqual(
             self.exporter._transformer.transform_text(
@@ -1,15 +1,24 @@
 import datetime as dt
+import json
+import subprocess
+import sys
+import tempfile
 from argparse import Namespace
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
 
 import babel
 import pytz
 
+from slackchannel2pdf import __version__
 from slackchannel2pdf.cli import main
+from slackchannel2pdf.profiling import CProfileProfiler, TracemallocProfiler
 
+from .helpers import SlackClientStub
 
-@patch("slackchannel2pdf.cli.SlackChannelExporter")
+
+@patch("slackchannel2pdf.channel_exporter.SlackChannelExporter")
 @patch("slackchannel2pdf.cli._parse_args")
 class TestCli(TestCase):
     def test_should_start_export_for_channel(self, mock_parse_args, MockExporter):
@@ -20,13 +29,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
             quiet=False,
         )
         # when
@@ -47,13 +60,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token=None,
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
             quiet=False,
         )
         # when
@@ -73,14 +90,18 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token=None,
             timezone=None,
             version=True,
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
@@ -94,13 +115,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token=None,
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
@@ -114,13 +139,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone="Asia/Bangkok",
             write_raw_data=None,
+            write_stats=None,
             quiet=False,
         )
         # when
@@ -138,13 +167,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale="es-MX",
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
             quiet=False,
         )
         # when
@@ -164,13 +197,17 @@ class TestCli(TestCase):
             destination=None,
             latest=latest,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=oldest,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
             quiet=False,
         )
         # when
@@ -183,6 +220,36 @@ class TestCli(TestCase):
         self.assertEqual(kwargs["oldest"], dt.datetime(2020, 2, 2, 20, 0))
         self.assertEqual(kwargs["latest"], dt.datetime(2020, 3, 3, 22, 0))
 
+    def test_should_pass_requested_profilers(self, mock_parse_args, MockExporter):
+        # given
+        mock_parse_args.return_value = Namespace(
+            add_debug_info=False,
+            channel="channel",
+            destination=None,
+            latest=None,
+            locale=None,
+            manifest=None,
+            max_messages=None,
+            oldest=None,
+            page_format=None,
+            page_orientation=None,
+            profile=True,
+            profile_memory=True,
+            token="DUMMY_TOKEN",
+            timezone=None,
+            write_raw_data=None,
+            write_stats=None,
+            quiet=False,
+        )
+        # when
+        main()
+        # then
+        kwargs = MockExporter.return_value.run.call_args[1]
+        self.assertEqual(
+            [type(profiler) for profiler in kwargs["profilers"]],
+            [CProfileProfiler, TracemallocProfiler],
+        )
+
     def test_should_abort_if_locale_is_invalid(self, mock_parse_args, MockExporter):
         # given
         mock_parse_args.return_value = Namespace(
@@ -191,13 +258,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale="xx",
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
@@ -211,13 +282,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone="xx",
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
@@ -231,13 +306,17 @@ class TestCli(TestCase):
             destination=None,
             latest=None,
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest="xx",
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
@@ -251,14 +330,164 @@ class TestCli(TestCase):
             destination=None,
             latest="xx",
             locale=None,
+            manifest=None,
             max_messages=None,
             oldest=None,
             page_format=None,
             page_orientation=None,
+            profile=None,
+            profile_memory=None,
             token="DUMMY_TOKEN",
             timezone=None,
             write_raw_data=None,
+            write_stats=None,
         )
         # when
         with self.assertRaises(SystemExit):
             main()
+
+
+class TestCliStartup(TestCase):
+    def test_should_show_version(self):
+        # when
+        result = subprocess.run(
+            [sys.executable, "-m", "slackchannel2pdf.cli", "--version"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # then
+        self.assertEqual(result.stdout.strip(), __version__)
+
+    def test_should_not_import_heavy_dependencies_on_startup(self):
+        # given
+        heavy_modules = [
+            "babel",
+            "dateutil",
+            "pytz",
+            "slack_sdk",
+            "slackchannel2pdf.channel_exporter",
+            "slackchannel2pdf.fpdf_mod",
+        ]
+        code = (
+            "import sys, slackchannel2pdf.cli; "
+            f"print([name for name in {heavy_modules} if name in sys.modules])"
+        )
+        # when
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        # then
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_should_not_read_configuration_for_version(self):
+        # given
+        code = (
+            "import sys; from slackchannel2pdf import cli, settings; "
+            "sys.argv[1:] = ['--version']\n"
+            "try:\n    cli.main()\n"
+            "except SystemExit:\n"
+            "    print('DEFAULT_LOGGING' in vars(settings))"
+        )
+        # when
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        # then
+        self.assertEqual(result.stdout.split(), [__version__, "False"])
+
+
+@patch("slackchannel2pdf.slack_service.slack_sdk")
+class TestCliManifest(TestCase):
+    def test_should_run_all_jobs_from_manifest(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "manifest.json"
+            manifest = {
+                "defaults": {"dest_path": temp_dir},
+                "jobs": [{"channels": ["C12345678"]}, {"channels": ["C72345678"]}],
+            }
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            argv = ["slackchannel2pdf", "--manifest", str(manifest_path)]
+            argv += ["--token", "DUMMY_TOKEN", "--quiet"]
+            # when
+            with patch.object(sys, "argv", argv):
+                main()
+            # then
+            self.assertEqual(
+                sorted(path.name for path in Path(temp_dir).glob("*.pdf")),
+                ["test_berlin.pdf", "test_london.pdf"],
+            )
+
+    def test_should_use_command_line_options_as_manifest_defaults(self, mock_slack):
+        # given
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "manifest.json"
+            manifest = {
+                "defaults": {"locale": "de-DE"},
+                "jobs": [
+                    {"channels": ["C12345678"]},
+                    {"channels": ["C72345678"], "timezone": "Asia/Tokyo"},
+                ],
+            }
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+            argv = ["slackchannel2pdf", "--manifest", str(manifest_path)]
+            argv += ["--token", "DUMMY_TOKEN", "--quiet", "-d", temp_dir]
+            argv += ["--timezone", "Europe/Berlin", "--locale", "en-US"]
+            argv += ["--add-debug-info"]
+            # when
+            with patch.object(sys, "argv", argv), patch(
+                "slackchannel2pdf.jobs.ExporterPool.run_batch", return_value=[]
+            ) as mock_run_batch:
+                main()
+            # then
+            jobs = mock_run_batch.call_args[0][0]
+            self.assertEqual(
+                [job.timezone for job in jobs], ["Europe/Berlin", "Asia/Tokyo"]
+            )
+            self.assertEqual([job.locale for job in jobs], ["de-DE", "de-DE"])
+            self.assertEqual([job.dest_path for job in jobs], [temp_dir, temp_dir])
+            self.assertTrue(all(job.add_debug_info for job in jobs))
+
+    def test_should_abort_when_channels_are_given_with_manifest(self, mock_slack):
+        # given
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "manifest.json"
+            manifest_path.write_text(
+                '{"jobs": [{"channels": ["C12345678"]}]}', encoding="utf-8"
+            )
+            argv = ["slackchannel2pdf", "C72345678", "--manifest", str(manifest_path)]
+            argv += ["--token", "DUMMY_TOKEN"]
+            # when/then
+            with patch.object(sys, "argv", argv), self.assertRaises(SystemExit):
+                main()
+        self.assertFalse(mock_slack.WebClient.called)
+
+    def test_should_abort_when_profiling_manifest_with_several_workers(
+        self, mock_slack
+    ):
+        # given
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "manifest.json"
+            manifest_path.write_text(
+                '{"jobs": [{"channels": ["C12345678"]}]}', encoding="utf-8"
+            )
+            argv = ["slackchannel2pdf", "--manifest", str(manifest_path)]
+            argv += ["--token", "DUMMY_TOKEN", "--profile", "--workers", "2"]
+            # when/then
+            with patch.object(sys, "argv", argv), self.assertRaises(SystemExit):
+                main()
+        self.assertFalse(mock_slack.WebClient.called)
+
+    def test_should_abort_when_manifest_is_invalid(self, mock_slack):
+        # given
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = Path(temp_dir) / "manifest.json"
+            manifest_path.write_text('{"jobs": [{}]}', encoding="utf-8")
+            argv = ["slackchannel2pdf", "--manifest", str(manifest_path)]
+            argv += ["--token", "DUMMY_TOKEN"]
+            # when/then
+            with patch.object(sys, "argv", argv), self.assertRaises(SystemExit):
+                main()
+        self.assertFalse(mock_slack.WebClient.called)
@@ -16,6 +16,16 @@ class TestTransformEncoding(unittest.TestCase):
         self.assertEqual(helpers.transform_encoding("&lt;"), "<")
         self.assertEqual(helpers.transform_encoding("&#60;"), "<")
 
+    def test_should_return_plain_text_as_is(self):
+        text = "plain text"
+        self.assertIs(helpers.transform_encoding(text), text)
+
+    def test_should_replace_tabs(self):
+        self.assertEqual(helpers.transform_encoding("a\tb"), "a    b")
+
+    def test_should_replace_invalid_characters(self):
+        self.assertEqual(helpers.transform_encoding("a\ud83d"), "a?")
+
 
 class TestLocaleHelper(unittest.TestCase):
     def test_should_init_with_defaults(self):
@@ -61,6 +71,49 @@ class TestLocaleHelper(unittest.TestCase):
         # then
         self.assertEqual(my_datetime.timestamp(), ts)
 
+    def test_should_convert_many_epochs_to_datetimes(self):
+        # given
+        locale_helper = LocaleHelper(my_tz=pytz.timezone("Europe/Berlin"))
+        # DST starts on 2023-03-26 at 01:00 UTC
+        timestamps = [str(1679781600 + i * 1800) for i in range(48)]
+        # when
+        result = locale_helper.get_datetimes_from_ts(timestamps)
+        # then
+        expected = [locale_helper.get_datetime_from_ts(ts) for ts in timestamps]
+        self.assertEqual(
+            [obj.isoformat() for obj in result], [obj.isoformat() for obj in expected]
+        )
+
+    def test_should_create_timeline(self):
+        # given
+        locale_helper = LocaleHelper(my_tz=pytz.UTC)
+        day = 1672531200  # 2023-01-01 00:00 UTC
+        timestamps = [str(day + offset) for offset in [3600, 3660, 7200, 86400]]
+        # when
+        result = locale_helper.get_timeline(timestamps, 30)
+        # then
+        self.assertEqual(
+            [(entry.is_new_day, entry.is_after_gap) for entry in result],
+            [(True, False), (False, False), (False, True), (True, True)],
+        )
+        self.assertEqual(
+            result[0].datetime, dt.datetime(2023, 1, 1, 1, tzinfo=pytz.UTC)
+        )
+
+    def test_should_create_timeline_with_previous_timestamps(self):
+        # given
+        locale_helper = LocaleHelper(my_tz=pytz.UTC)
+        day = 1672531200  # 2023-01-01 00:00 UTC
+        timestamps = [str(day + 3600), str(day + 7200)]
+        previous_timestamps = [None, str(day + 7000)]
+        # when
+        result = locale_helper.get_timeline(timestamps, 30, previous_timestamps)
+        # then
+        self.assertEqual(
+            [(entry.is_new_day, entry.is_after_gap) for entry in result],
+            [(True, False), (False, False)],
+        )
+
     def test_should_format_datetime(self):
         # given
         locale_helper = LocaleHelper(my_locale=babel.Locale.parse("de-DE", sep="-"))
@@ -70,6 +123,31 @@ class TestLocaleHelper(unittest.TestCase):
         # then
         self.assertEqual(result, "03.02.21, 18:10")
 
+    def test_should_cache_formatted_times_per_minute(self):
+        # given
+        locale_helper = LocaleHelper(
+            my_locale=babel.Locale.parse("de-DE", sep="-"), my_tz=pytz.UTC
+        )
+        # when
+        first = locale_helper.format_time_str(
+            dt.datetime(2021, 2, 3, 18, 10, 5, tzinfo=pytz.UTC)
+        )
+        second = locale_helper.format_time_str(
+            dt.datetime(2021, 2, 3, 18, 10, 55, tzinfo=pytz.UTC)
+        )
+        # then
+        self.assertEqual(first, "18:10")
+        self.assertEqual(second, "18:10")
+        self.assertEqual(locale_helper.cache_info()["time"].hits, 1)
+
+    def test_should_format_date_full(self):
+        # given
+        locale_helper = LocaleHelper(my_locale=babel.Locale.parse("en-US", sep="-"))
+        # when
+        result = locale_helper.format_date_full_str(dt.datetime(2021, 2, 3, 18, 10))
+        # then
+        self.assertEqual(result, "Wednesday, February 3, 2021")
+
     def test_should_format_epoch(self):
         # given
         locale_helper = LocaleHelper(my_locale=babel.Locale.parse("de-DE", sep="-"))
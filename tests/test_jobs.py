@@ -0,0 +1,216 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from slackchannel2pdf.jobs import ExporterPool, ExportJob, load_manifest
+
+from .helpers import NoSocketsTestCase, SlackClientStub
+
+
+class TestExportJob(NoSocketsTestCase):
+    def test_should_create_job_from_dict(self):
+        # when
+        job = ExportJob.from_dict(
+            {"channels": ["C12345678"], "oldest": "2020-02-02 20:00", "locale": "de-DE"}
+        )
+        # then
+        self.assertEqual(job.channels, ("C12345678",))
+        self.assertEqual(job.oldest.year, 2020)
+        self.assertEqual(job.locale, "de-DE")
+
+    def test_should_reject_job_without_channels(self):
+        with self.assertRaises(ValueError):
+            ExportJob.from_dict({"channels": []})
+
+    def test_should_reject_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            ExportJob.from_dict({"channels": ["C12345678"], "colour": "blue"})
+
+    def test_should_reject_invalid_dates(self):
+        with self.assertRaises(ValueError):
+            ExportJob.from_dict({"channels": ["C12345678"], "latest": "not a date"})
+
+
+class TestLoadManifest(NoSocketsTestCase):
+    def _write_manifest(self, data) -> Path:
+        path = Path(self.temp_dir.name) / "manifest.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_should_load_jobs_with_defaults(self):
+        # given
+        path = self._write_manifest(
+            {
+                "defaults": {"page_format": "a3", "locale": "de-DE"},
+                "jobs": [
+                    {"channels": ["C12345678"]},
+                    {"channels": ["C72345678"], "page_format": "letter"},
+                ],
+            }
+        )
+        # when
+        jobs = load_manifest(path)
+        # then
+        self.assertEqual([job.page_format for job in jobs], ["a3", "letter"])
+        self.assertEqual([job.locale for job in jobs], ["de-DE", "de-DE"])
+
+    def test_should_report_invalid_job(self):
+        # given
+        path = self._write_manifest({"jobs": [{"channels": ["C12345678"]}, {}]})
+        # when/then
+        with self.assertRaisesRegex(ValueError, "job 2"):
+            load_manifest(path)
+
+    def test_should_reject_manifest_without_jobs(self):
+        # given
+        path = self._write_manifest([{"channels": ["C12345678"]}])
+        # when/then
+        with self.assertRaises(ValueError):
+            load_manifest(path)
+
+
+@patch.object(ExporterPool, "_create_exporter", side_effect=lambda job: MagicMock())
+class TestExporterPool(NoSocketsTestCase):
+    def test_should_reuse_idle_exporter(self, mock_create_exporter):
+        # given
+        pool = ExporterPool("TOKEN_DUMMY")
+        job = ExportJob(channels=("C1",))
+        with pool.exporter(job) as exporter_1:
+            pass
+        # when
+        with pool.exporter(job) as exporter_2:
+            self.assertEqual(pool.idle_count(), 0)
+        # then
+        self.assertIs(exporter_1, exporter_2)
+        self.assertEqual(mock_create_exporter.call_count, 1)
+        self.assertEqual(pool.idle_count(), 1)
+
+    def test_should_limit_idle_exporters_per_key(self, mock_create_exporter):
+        # given
+        pool = ExporterPool("TOKEN_DUMMY", max_idle_exporters=2)
+        job = ExportJob(channels=("C1",))
+        # when
+        with pool.exporter(job), pool.exporter(job), pool.exporter(job):
+            pass
+        # then
+        self.assertEqual(mock_create_exporter.call_count, 3)
+        self.assertEqual(pool.idle_count(), 2)
+
+    def test_should_drop_exporters_of_least_recently_used_keys(
+        self, mock_create_exporter
+    ):
+        # given
+        pool = ExporterPool(max_keys=2)
+        jobs = [ExportJob(channels=("C1",), slack_token=f"T{num}") for num in range(3)]
+        for job in jobs:
+            with pool.exporter(job):
+                pass
+        self.assertEqual(pool.idle_count(), 2)
+        # when
+        with pool.exporter(jobs[0]):
+            pass
+        with pool.exporter(jobs[2]):
+            pass
+        # then
+        self.assertEqual(mock_create_exporter.call_count, 4)
+        self.assertEqual(pool.idle_count(), 2)
+
+    def test_should_refresh_directories_after_ttl(self, mock_create_exporter):
+        # given
+        pool = ExporterPool("TOKEN_DUMMY", directories_ttl=60)
+        job = ExportJob(channels=("C1",))
+        with patch("slackchannel2pdf.jobs.time.monotonic", return_value=1000):
+            with pool.exporter(job) as exporter:
+                pass
+            # when
+            with pool.exporter(job):
+                pass
+        # then
+        exporter.refresh_directories.assert_not_called()
+        with patch("slackchannel2pdf.jobs.time.monotonic", return_value=1061):
+            with pool.exporter(job):
+                pass
+            with pool.exporter(job):
+                pass
+        self.assertEqual(exporter.refresh_directories.call_count, 1)
+
+    def test_should_not_refresh_directories_without_ttl(self, mock_create_exporter):
+        # given
+        pool = ExporterPool("TOKEN_DUMMY", directories_ttl=0)
+        job = ExportJob(channels=("C1",))
+        with patch("slackchannel2pdf.jobs.time.monotonic", return_value=1000):
+            with pool.exporter(job) as exporter:
+                pass
+        # when
+        with patch("slackchannel2pdf.jobs.time.monotonic", return_value=100000):
+            with pool.exporter(job):
+                pass
+        # then
+        exporter.refresh_directories.assert_not_called()
+
+
+class TestExporterPoolBatch(NoSocketsTestCase):
+    def test_should_start_biggest_jobs_first(self):
+        # given
+        jobs = [
+            ExportJob(channels=("C1",), max_messages=100),
+            ExportJob(channels=("C2", "C3"), max_messages=1000),
+            ExportJob(channels=("C4",), max_messages=1000),
+        ]
+        pool = ExporterPool("TOKEN_DUMMY")
+        # when
+        with patch.object(ExporterPool, "run", return_value={"ok": True}) as mock_run:
+            results = list(pool.run_batch(jobs, workers=1))
+        # then
+        self.assertEqual(
+            [call.args[0].channels for call in mock_run.call_args_list],
+            [("C2", "C3"), ("C4",), ("C1",)],
+        )
+        self.assertEqual([result.index for result in results], [1, 2, 0])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_should_continue_after_failed_job(self):
+        # given
+        jobs = [ExportJob(channels=("C1",)), ExportJob(channels=("C2",))]
+        pool = ExporterPool("TOKEN_DUMMY")
+        # when
+        with patch.object(
+            ExporterPool, "run", side_effect=[RuntimeError("boom"), {"ok": True}]
+        ):
+            results = list(pool.run_batch(jobs, workers=1))
+        # then
+        self.assertEqual([result.error for result in results], ["boom", None])
+        self.assertEqual([result.ok for result in results], [False, True])
+
+    def test_should_not_allow_profilers_with_several_workers(self):
+        pool = ExporterPool("TOKEN_DUMMY")
+        with self.assertRaises(ValueError):
+            list(
+                pool.run_batch(
+                    [ExportJob(channels=("C1",))], workers=2, profilers=[MagicMock()]
+                )
+            )
+
+    @patch("slackchannel2pdf.slack_service.slack_sdk")
+    def test_should_run_jobs_with_shared_exporter(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        pool = ExporterPool("TOKEN_DUMMY")
+        with tempfile.TemporaryDirectory() as dest_path:
+            jobs = [
+                ExportJob(channels=(channel,), dest_path=dest_path)
+                for channel in ["C12345678", "C72345678"]
+            ]
+            # when
+            results = list(pool.run_batch(jobs, workers=1))
+            # then
+            self.assertTrue(all(result.ok for result in results))
+            self.assertEqual(len(list(Path(dest_path).glob("*.pdf"))), 2)
+        self.assertEqual(mock_slack.WebClient.call_count, 1)
@@ -0,0 +1,97 @@
+from pathlib import Path
+from unittest import TestCase
+
+from slackchannel2pdf.message_store import MessageStore
+
+
+def _message(ts: str, text: str = "hello") -> dict:
+    return {"type": "message", "ts": ts, "text": text}
+
+
+class TestMessageStore(TestCase):
+    def test_should_keep_messages_in_memory_within_budget(self):
+        # given
+        store = MessageStore(memory_budget=10000)
+        messages = [_message("1600000002.000000"), _message("1600000001.000000")]
+        # when
+        store.add_messages(messages)
+        store.add_thread("1600000001.000000", [_message("1600000001.000000")])
+        # then
+        self.assertFalse(store.is_spilled)
+        self.assertIs(store.messages, store.messages)
+        self.assertEqual(store.messages, messages)
+        self.assertEqual(list(store.threads.keys()), ["1600000001.000000"])
+
+    def test_should_spill_messages_in_chronological_order(self):
+        # given
+        store = MessageStore(memory_budget=100)
+        # when
+        store.add_messages(
+            [_message("1600000003.000000"), _message("1600000002.000000")]
+        )
+        store.add_messages([_message("1600000001.000000")])
+        # then
+        self.assertTrue(store.is_spilled)
+        self.assertEqual(
+            [msg["ts"] for msg in store.messages],
+            ["1600000001.000000", "1600000002.000000", "1600000003.000000"],
+        )
+        self.assertEqual(len(store.messages), 3)
+        self.assertEqual(store.messages[-1]["ts"], "1600000003.000000")
+        with self.assertRaises(IndexError):
+            store.messages[3]  # pylint: disable = expression-not-assigned
+        store.close()
+
+    def test_should_spill_threads(self):
+        # given
+        store = MessageStore(memory_budget=100)
+        thread_ts = "1600000001.000000"
+        store.add_messages([_message(thread_ts)])
+        # when
+        store.add_thread(
+            thread_ts, [_message("1600000005.000000"), _message(thread_ts)]
+        )
+        # then
+        self.assertTrue(store.is_spilled)
+        self.assertEqual(len(store.threads), 1)
+        self.assertEqual(
+            [msg["ts"] for msg in store.threads[thread_ts]],
+            [thread_ts, "1600000005.000000"],
+        )
+        self.assertEqual(store.threads.get("1600000009.000000", []), [])
+        with self.assertRaises(KeyError):
+            store.threads["1600000009.000000"]  # pylint: disable = pointless-statement
+        store.close()
+
+    def test_should_apply_function_to_spilled_messages(self):
+        # given
+        store = MessageStore(memory_budget=100)
+        thread_ts = "1600000001.000000"
+        store.add_messages([_message(thread_ts), _message("1600000002.000000")])
+        store.add_thread(thread_ts, [_message(thread_ts), _message("1600000003.0")])
+
+        def shout(msg):
+            msg["text"] = msg["text"].upper()
+
+        # when
+        store.apply(shout)
+        # then
+        self.assertEqual([msg["text"] for msg in store.messages], ["HELLO", "HELLO"])
+        self.assertEqual(
+            [msg["text"] for msg in store.threads[thread_ts]], ["HELLO", "HELLO"]
+        )
+        store.close()
+
+    def test_should_remove_temporary_database_when_closed(self):
+        # given
+        with MessageStore(memory_budget=10) as store:
+            store.add_messages([_message("1600000001.000000")])
+            path = Path(store._temp_dir.name)  # pylint: disable = protected-access
+            self.assertTrue(path.exists())
+        # then
+        self.assertFalse(store.is_spilled)
+        self.assertFalse(path.exists())
+
+    def test_should_not_allow_negative_budget(self):
+        with self.assertRaises(ValueError):
+            MessageStore(memory_budget=-1)
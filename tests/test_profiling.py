@@ -0,0 +1,111 @@
+import pstats
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+from slackchannel2pdf.channel_exporter import SlackChannelExporter
+from slackchannel2pdf.profiling import CProfileProfiler, Profiler, TracemallocProfiler
+
+from .helpers import NoSocketsTestCase, SlackClientStub
+
+
+class RecordingProfiler(Profiler):
+    def __init__(self) -> None:
+        self.events = []
+
+    def channel_started(self, channel_id, filename_base):
+        self.events.append(("channel_started", channel_id))
+
+    def channel_finished(self, channel_id, filename_base):
+        self.events.append(("channel_finished", channel_id))
+
+    def phase_started(self, name):
+        self.events.append(("phase_started", name))
+
+    def phase_finished(self, name):
+        self.events.append(("phase_finished", name))
+
+
+@patch("slackchannel2pdf.slack_service.slack_sdk")
+class TestProfilers(NoSocketsTestCase):
+    def test_should_call_custom_profiler_for_channels_and_phases(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        profiler = RecordingProfiler()
+        # when
+        with tempfile.TemporaryDirectory() as dest_path:
+            exporter.run(["C12345678"], Path(dest_path), profilers=[profiler])
+        # then
+        self.assertEqual(profiler.events[0], ("channel_started", "C12345678"))
+        self.assertEqual(profiler.events[-1], ("channel_finished", "C12345678"))
+        self.assertIn(("phase_started", "layout"), profiler.events)
+        started = [event for event in profiler.events if event[0] == "phase_started"]
+        finished = [event for event in profiler.events if event[0] == "phase_finished"]
+        self.assertEqual(len(started), len(finished))
+
+    def test_should_write_profiles_for_each_phase(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dest_path = Path(temp_dir)
+            # when
+            exporter.run(
+                ["C12345678"],
+                dest_path,
+                profilers=[CProfileProfiler(), TracemallocProfiler()],
+            )
+            # then
+            stats = pstats.Stats(str(dest_path / "test_berlin_profile.prof"))
+            self.assertGreater(stats.total_calls, 0)
+            self.assertTrue((dest_path / "test_berlin_profile_layout.prof").is_file())
+            snapshot = tracemalloc.Snapshot.load(
+                str(dest_path / "test_berlin_memory_layout.snapshot")
+            )
+            self.assertTrue(snapshot.traces)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_should_finish_profilers_when_export_fails(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        exporter = SlackChannelExporter(slack_token="TOKEN_DUMMY")
+        profiler = RecordingProfiler()
+        # when
+        with tempfile.TemporaryDirectory() as dest_path, patch.object(
+            SlackChannelExporter, "_write_document", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            exporter.run(
+                ["C12345678"],
+                Path(dest_path),
+                profilers=[profiler, CProfileProfiler(), TracemallocProfiler()],
+            )
+        # then
+        self.assertEqual(profiler.events[-1], ("channel_finished", "C12345678"))
+        self.assertFalse(tracemalloc.is_tracing())
+        other_profiler = CProfileProfiler()
+        other_profiler.channel_started("C72345678", Path(dest_path) / "test")
+        other_profiler.channel_finished("C72345678", Path(dest_path) / "test")
+
+
+class TestCProfileProfiler(NoSocketsTestCase):
+    def test_should_profile_one_channel_at_a_time(self):
+        # given
+        filename_base = Path(tempfile.gettempdir()) / "test"
+        profiler_1 = CProfileProfiler()
+        profiler_2 = CProfileProfiler()
+        profiler_1.channel_started("C12345678", filename_base)
+        thread = threading.Thread(
+            target=profiler_2.channel_started, args=("C72345678", filename_base)
+        )
+        # when
+        thread.start()
+        thread.join(timeout=0.1)
+        # then
+        self.assertTrue(thread.is_alive())
+        profiler_1.channel_finished("C12345678", filename_base)
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        profiler_2.channel_finished("C72345678", filename_base)
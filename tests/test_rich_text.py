@@ -0,0 +1,129 @@
+import unittest
+
+from slackchannel2pdf.rich_text import Marker, TextRun, compile_html, from_html, to_html
+
+
+class TestCompileHtml(unittest.TestCase):
+    def test_should_compile_text_and_tags(self):
+        # when
+        result = compile_html('first <b>bold</b><br><a href="https://x.com">link</a>')
+        # then
+        self.assertEqual(
+            result,
+            (
+                ("text", "first "),
+                ("open", "B", {}),
+                ("text", "bold"),
+                ("close", "B"),
+                ("text", ""),
+                ("open", "BR", {}),
+                ("text", ""),
+                ("open", "A", {"HREF": "https://x.com"}),
+                ("text", "link"),
+                ("close", "A"),
+                ("text", ""),
+            ),
+        )
+
+    def test_should_compile_attributes(self):
+        # when
+        result = compile_html('<s fontfamily="Courier" size="14" style=\'B\'>x</s>')
+        # then
+        self.assertEqual(
+            result[1],
+            ("open", "S", {"FONTFAMILY": "Courier", "SIZE": "14", "STYLE": "B"}),
+        )
+
+    def test_should_replace_newlines(self):
+        self.assertEqual(compile_html("a\nb"), (("text", "a b"),))
+
+    def test_should_return_cached_result(self):
+        self.assertIs(compile_html("<i>same</i>"), compile_html("<i>same</i>"))
+
+
+class TestFromHtml(unittest.TestCase):
+    def test_should_convert_formatting_into_runs(self):
+        # when
+        result = from_html('a<b>b<i>c</i></b><br><a href="https://x.com">d</a>')
+        # then
+        self.assertEqual(
+            result,
+            (
+                TextRun("a"),
+                TextRun("b", bold=True),
+                TextRun("c", bold=True, italic=True),
+                Marker.LINE_BREAK,
+                TextRun("d", href="https://x.com"),
+            ),
+        )
+
+    def test_should_convert_fonts(self):
+        # when
+        result = from_html('<s fontfamily="Courier" size="8" style="B">x</s>y')
+        # then
+        self.assertEqual(
+            result,
+            (
+                TextRun("x", bold=True, font_family="Courier", font_size=8),
+                TextRun("y"),
+            ),
+        )
+
+    def test_should_ignore_nested_fonts(self):
+        # when
+        result = from_html('<s size="8">a<s size="10">b</s></s>c')
+        # then
+        self.assertEqual(
+            result, (TextRun("a", font_size=8), TextRun("b", font_size=8), TextRun("c"))
+        )
+
+    def test_should_keep_outer_font_until_outer_tag_is_closed(self):
+        # when
+        result = from_html('<s size="8">a<s size="10">b</s>c</s>d')
+        # then
+        self.assertEqual(
+            result,
+            (
+                TextRun("a", font_size=8),
+                TextRun("b", font_size=8),
+                TextRun("c", font_size=8),
+                TextRun("d"),
+            ),
+        )
+
+    def test_should_ignore_unmatched_closing_font_tag(self):
+        # when
+        result = from_html('a</s><s size="8">b</s>')
+        # then
+        self.assertEqual(result, (TextRun("a"), TextRun("b", font_size=8)))
+
+    def test_should_convert_blockquotes(self):
+        # when
+        result = from_html("a<blockquote>b</blockquote>")
+        # then
+        self.assertEqual(
+            result,
+            (
+                TextRun("a"),
+                Marker.BLOCKQUOTE_START,
+                TextRun("b"),
+                Marker.BLOCKQUOTE_END,
+            ),
+        )
+
+
+class TestToHtml(unittest.TestCase):
+    def test_should_roundtrip_html(self):
+        for html in [
+            "plain",
+            "<b><i>bold+italic</i></b>",
+            'first<br><s fontfamily="NotoSansMono">code</s>',
+            "before<br><blockquote>indented</blockquote>after",
+            '<u>x<a href="https://x.com">link</a></u>',
+        ]:
+            with self.subTest(html=html):
+                self.assertEqual(to_html(from_html(html)), html)
+
+
+if __name__ == "__main__":
+    unittest.main()
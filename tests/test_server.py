@@ -0,0 +1,173 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from slackchannel2pdf.server import ExportServer, QueueFullError, _RequestHandler
+
+from .helpers import NoSocketsTestCase, SlackClientStub
+
+
+class _FakeConnection:
+    """A connection for a request handler, which needs no socket."""
+
+    def __init__(self, request: bytes) -> None:
+        self._request = request
+        self.response = b""
+
+    def makefile(self, *args, **kwargs):
+        return io.BytesIO(self._request)
+
+    def sendall(self, data: bytes) -> None:
+        self.response += data
+
+
+def _handle_request(export_server, method, path, headers=None, body=b""):
+    """Let the request handler process a request and return status and data."""
+    lines = [f"{method} {path} HTTP/1.1"]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body)}")
+    request = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body
+    connection = _FakeConnection(request)
+    http_server = SimpleNamespace(export_server=export_server, auth_token="SECRET")
+    _RequestHandler(connection, ("127.0.0.1", 12345), http_server)
+    head, _, response_body = connection.response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(response_body)
+
+
+@patch("slackchannel2pdf.slack_service.slack_sdk")
+class TestExportServer(NoSocketsTestCase):
+    def test_should_run_jobs_with_warm_exporter(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        with tempfile.TemporaryDirectory() as dest_path:
+            export_server = ExportServer(
+                slack_token="TOKEN_DUMMY", workers=1, output_root=dest_path
+            )
+            export_server.start()
+            # when
+            job_ids = [
+                export_server.submit({"channels": [channel], "dest_path": dest_path})
+                for channel in ["C12345678", "C72345678"]
+            ]
+            results = [export_server.wait(job_id, timeout=30) for job_id in job_ids]
+            export_server.stop()
+            # then
+            for result in results:
+                self.assertEqual(result["status"], "done")
+                for channel in result["result"]["channels"].values():
+                    self.assertTrue(Path(channel["filename_pdf"]).is_file())
+        self.assertEqual(mock_slack.WebClient.call_count, 1)
+
+    def test_should_report_failed_jobs(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        with tempfile.TemporaryDirectory() as output_root:
+            export_server = ExportServer(
+                slack_token="TOKEN_DUMMY", workers=1, output_root=output_root
+            )
+            export_server.start()
+            # when
+            job_id = export_server.submit(
+                {"channels": ["C12345678"], "dest_path": "does/not/exist"}
+            )
+            result = export_server.wait(job_id, timeout=30)
+            export_server.stop()
+        # then
+        self.assertEqual(result["status"], "failed")
+        self.assertIn("does/not/exist", result["error"])
+
+    def test_should_reject_dest_path_outside_output_root(self, mock_slack):
+        with tempfile.TemporaryDirectory() as output_root:
+            export_server = ExportServer(
+                slack_token="TOKEN_DUMMY", output_root=output_root
+            )
+            for dest_path in ["/tmp", "..", "sub/../../other"]:
+                with self.subTest(dest_path=dest_path):
+                    with self.assertRaises(ValueError):
+                        export_server.submit(
+                            {"channels": ["C12345678"], "dest_path": dest_path}
+                        )
+            self.assertEqual(export_server.status()["queued_jobs"], 0)
+
+    def test_should_reject_jobs_when_queue_is_full(self, mock_slack):
+        # given
+        export_server = ExportServer(
+            slack_token="TOKEN_DUMMY", workers=1, max_queued_jobs=1
+        )
+        export_server.submit({"channels": ["C12345678"]})
+        # when/then
+        with self.assertRaises(QueueFullError):
+            export_server.submit({"channels": ["C12345678"]})
+        self.assertEqual(export_server.status()["queued_jobs"], 1)
+
+    def test_should_require_room_for_queued_jobs(self, mock_slack):
+        for max_queued_jobs in [0, -1]:
+            with self.subTest(max_queued_jobs=max_queued_jobs):
+                with self.assertRaises(ValueError):
+                    ExportServer(
+                        slack_token="TOKEN_DUMMY", max_queued_jobs=max_queued_jobs
+                    )
+
+    def test_should_return_none_for_unknown_job(self, mock_slack):
+        export_server = ExportServer(slack_token="TOKEN_DUMMY")
+        self.assertIsNone(export_server.job_status("unknown"))
+
+
+class TestRequestHandler(NoSocketsTestCase):
+    def setUp(self) -> None:
+        self.export_server = MagicMock()
+        self.export_server.submit.return_value = "1"
+
+    def test_should_accept_job_with_token_and_json(self):
+        # when
+        status, data = _handle_request(
+            self.export_server,
+            "POST",
+            "/jobs",
+            headers={
+                "Authorization": "Bearer SECRET",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+            body=b'{"channels": ["C12345678"]}',
+        )
+        # then
+        self.assertEqual(status, 202)
+        self.assertEqual(data, {"id": "1"})
+        self.export_server.submit.assert_called_once_with({"channels": ["C12345678"]})
+
+    def test_should_reject_requests_without_valid_token(self):
+        for headers in [{}, {"Authorization": "Bearer WRONG"}, {"Authorization": ""}]:
+            with self.subTest(headers=headers):
+                status, _ = _handle_request(
+                    self.export_server,
+                    "POST",
+                    "/jobs",
+                    headers={**headers, "Content-Type": "application/json"},
+                    body=b'{"channels": ["C12345678"]}',
+                )
+                self.assertEqual(status, 401)
+        status, _ = _handle_request(self.export_server, "GET", "/status")
+        self.assertEqual(status, 401)
+        self.export_server.submit.assert_not_called()
+        self.export_server.status.assert_not_called()
+
+    def test_should_reject_jobs_which_are_not_json(self):
+        for content_type in [None, "text/plain", "application/x-www-form-urlencoded"]:
+            headers = {"Authorization": "Bearer SECRET"}
+            if content_type:
+                headers["Content-Type"] = content_type
+            with self.subTest(content_type=content_type):
+                status, _ = _handle_request(
+                    self.export_server,
+                    "POST",
+                    "/jobs",
+                    headers=headers,
+                    body=b'{"channels": ["C12345678"]}',
+                )
+                self.assertEqual(status, 415)
+        self.export_server.submit.assert_not_called()
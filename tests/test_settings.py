@@ -149,3 +149,16 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(
             Path(dict_config["handlers"]["file"]["filename"]).parent, my_path
         )
+
+
+class TestLazySettings(unittest.TestCase):
+    def test_should_load_settings_from_configuration_files(self):
+        # when
+        result = settings._load_settings()
+        # then
+        self.assertEqual(result["PAGE_FORMAT_DEFAULT"], settings.PAGE_FORMAT_DEFAULT)
+        self.assertIn("handlers", result["DEFAULT_LOGGING"])
+
+    def test_should_raise_error_for_unknown_setting(self):
+        with self.assertRaises(AttributeError):
+            settings.UNKNOWN_SETTING  # pylint: disable = pointless-statement
@@ -1,6 +1,8 @@
+import json
 from unittest.mock import patch
 
 from slackchannel2pdf.slack_service import SlackService
+from slackchannel2pdf.stats import RunStats
 
 from .helpers import NoSocketsTestCase, SlackClientStub
 
@@ -53,6 +55,45 @@ class TestSlackService(NoSocketsTestCase):
             result,
         )
 
+    def test_should_count_received_bytes_without_content_length(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        slack_service = SlackService("TEST")
+        slack_service.stats = RunStats()
+        # when
+        response = slack_service._call_api("users_info", user="U12345678")
+        # then
+        data = json.dumps(response, ensure_ascii=False, separators=(",", ":"))
+        expected = len(data.encode())
+        counters = slack_service.stats.to_dict()["counters"]
+        self.assertEqual(counters["api_calls"], 1)
+        self.assertEqual(counters["api_bytes_received"], expected)
+
+    def test_should_change_directories_version_when_changed(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        slack_service = SlackService("TEST")
+        version = slack_service.directories_version()
+        # when
+        slack_service.user_names()["U12345678"] = "Renamed User"
+        slack_service.directories_changed()
+        # then
+        self.assertNotEqual(version, slack_service.directories_version())
+        self.assertEqual(
+            slack_service.directories_version(), slack_service.directories_version()
+        )
+
+    def test_should_change_directories_version_when_refreshed(self, mock_slack):
+        # given
+        mock_slack.WebClient.return_value = SlackClientStub(team="T12345678")
+        slack_service = SlackService("TEST")
+        version = slack_service.directories_version()
+        # when
+        slack_service.refresh_directories()
+        # then
+        self.assertNotEqual(version, slack_service.directories_version())
+        self.assertIn("U12345678", slack_service.user_names())
+
     def test_should_return_all_user_names_2(self, mock_slack):
         # given
         mock_slack.WebClient.return_value = SlackClientStub(
@@ -0,0 +1,93 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from slackchannel2pdf.stats import RunStats
+
+
+class TestRunStats(TestCase):
+    @patch("slackchannel2pdf.stats.time")
+    def test_should_not_count_nested_phases_twice(self, mock_time):
+        # given
+        mock_time.perf_counter.side_effect = [0.0, 1.0, 3.0, 4.0]
+        mock_time.process_time.side_effect = [0.0, 0.5, 1.5, 2.0]
+        stats = RunStats()
+        # when
+        with stats.phase("layout"):
+            with stats.phase("transform"):
+                pass
+        # then
+        phases = stats.to_dict()["phases"]
+        self.assertEqual(phases["transform"]["wall_time"], 2.0)
+        self.assertEqual(phases["transform"]["cpu_time"], 1.0)
+        self.assertEqual(phases["layout"]["wall_time"], 2.0)
+        self.assertEqual(phases["layout"]["cpu_time"], 1.0)
+        self.assertEqual(list(phases.keys()), ["transform", "layout"])
+
+    def test_should_merge_stats(self):
+        # given
+        stats_1 = RunStats()
+        stats_1.count("api_calls", 2)
+        with stats_1.phase("history"):
+            pass
+        stats_2 = RunStats()
+        stats_2.count("api_calls")
+        with stats_2.phase("history"):
+            pass
+        # when
+        stats_1.merge(stats_2)
+        # then
+        result = stats_1.to_dict()
+        self.assertEqual(result["counters"], {"api_calls": 3})
+        self.assertEqual(result["phases"]["history"]["calls"], 2)
+
+    @patch("slackchannel2pdf.stats.current_memory")
+    def test_should_merge_peak_memory(self, mock_memory):
+        # given
+        mock_memory.side_effect = [3000, 2000, 1000]
+        stats_1 = RunStats()
+        with stats_1.phase("history"):
+            pass
+        stats_2 = RunStats()
+        with stats_2.phase("history"):
+            pass
+        with stats_2.phase("write"):
+            pass
+        # when
+        stats_1.merge(stats_2)
+        # then
+        phases = stats_1.to_dict()["phases"]
+        self.assertEqual(phases["history"]["memory"], 3000)
+        self.assertEqual(phases["write"]["memory"], 1000)
+
+    @patch("slackchannel2pdf.stats.current_memory")
+    def test_should_report_peak_memory_after_top_level_phases(self, mock_memory):
+        # given
+        mock_memory.side_effect = [1000, 3000, 2000]
+        stats = RunStats()
+        # when
+        with stats.phase("history"):
+            pass
+        with stats.phase("layout"):
+            with stats.phase("transform"):
+                pass
+        with stats.phase("write"):
+            pass
+        # then
+        result = stats.to_dict()
+        self.assertEqual(result["phases"]["history"]["memory"], 1000)
+        self.assertEqual(result["phases"]["layout"]["memory"], 3000)
+        self.assertNotIn("memory", result["phases"]["transform"])
+        self.assertEqual(result["peak_memory"], 3000)
+
+    @patch("slackchannel2pdf.stats.current_memory")
+    def test_should_report_no_memory_when_not_measurable(self, mock_memory):
+        # given
+        mock_memory.return_value = None
+        stats = RunStats()
+        # when
+        with stats.phase("history"):
+            pass
+        # then
+        result = stats.to_dict()
+        self.assertNotIn("memory", result["phases"]["history"])
+        self.assertIsNone(result["peak_memory"])
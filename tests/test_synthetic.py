@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from .benchmarks.synthetic import ChannelSpec, generate_channel
+
+
+class TestGenerateChannel(TestCase):
+    def test_should_generate_same_channel_for_same_spec(self):
+        # given
+        spec = ChannelSpec(message_count=200, seed=7)
+        # when
+        channel_1 = generate_channel(spec)
+        channel_2 = generate_channel(spec)
+        # then
+        self.assertEqual(channel_1, channel_2)
+
+    def test_should_generate_requested_number_of_messages(self):
+        # given
+        spec = ChannelSpec(message_count=500, thread_ratio=0.2)
+        # when
+        messages, threads = generate_channel(spec)
+        # then
+        replies = sum(len(thread_messages) - 1 for thread_messages in threads.values())
+        self.assertEqual(len(messages) + replies, 500)
+        self.assertTrue(threads)
+        timestamps = [float(msg["ts"]) for msg in messages]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))